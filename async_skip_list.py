@@ -0,0 +1,113 @@
+from __future__ import annotations
+from typing import Generic, Final, Iterable, AsyncIterator
+from skip_list import T, SkipList
+import asyncio
+import itertools
+
+class AsyncSkipList(Generic[T]):
+    """
+    An asyncio front end to a SkipList, keeping long scans and bulk
+    loads from blocking the event loop.
+
+    Range iteration yields to the loop every 'yield_every' values and
+    bulk loads insert 'chunk_size' values at a time between yields.
+    Writers are serialized through an asyncio lock, so a chunked load
+    is never interleaved with other writes, while readers never wait:
+    every single SkipList operation runs without yielding, and a scan
+    resuming after a yield follows the links of its last node, which
+    stay intact even if that node was removed meanwhile. Values written
+    during a scan may or may not be seen by it.
+    """
+
+    __slots__ = ("_skip_list", "_yield_every", "_write_lock")
+
+    _skip_list: SkipList[T]
+    _yield_every: Final[int]
+    _write_lock: Final[asyncio.Lock]
+
+    def __init__(self,
+                 skip_list: SkipList[T] | None = None,
+                 yield_every: int = 1024) -> None:
+        if yield_every < 1:
+            raise ValueError(
+                f"Invalid yield_every value: {yield_every}. "
+                "Parameter 'yield_every' must be greater than 0.")
+
+        self._skip_list = SkipList[T]() if skip_list is None else skip_list
+        self._yield_every = yield_every
+        self._write_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._skip_list)
+
+    def __bool__(self) -> bool:
+        return bool(self._skip_list)
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self.irange()
+
+    @property
+    def skip_list(self) -> SkipList[T]:
+        return self._skip_list
+
+    @property
+    def yield_every(self) -> int:
+        return self._yield_every
+
+    def retrieve(self, value: T) -> bool:
+        return self._skip_list.retrieve(value)
+
+    async def irange(self,
+                     lo: T | None = None,
+                     hi: T | None = None,
+                     inclusive: tuple[bool, bool] = (True, False),
+                     reverse: bool = False) -> AsyncIterator[T]:
+        """
+        Same as SkipList.irange(), yielding to the event loop
+        every 'yield_every' values.
+        """
+
+        count: int = 0
+
+        for value in self._skip_list.irange(lo, hi, inclusive, reverse):
+            yield value
+            count += 1
+
+            if count == self._yield_every:
+                count = 0
+                await asyncio.sleep(0)
+
+    async def insert(self, value: T) -> bool:
+        async with self._write_lock:
+            return self._skip_list.insert(value)
+
+    async def remove(self, value: T) -> bool:
+        async with self._write_lock:
+            return self._skip_list.remove(value)
+
+    async def load(self, values: Iterable[T], chunk_size: int = 4096) -> int:
+        """
+        Insert every value, 'chunk_size' at a time, yielding to the
+        event loop between chunks. Return how many were inserted.
+        Other writers wait for the whole load to complete.
+        """
+
+        if chunk_size < 1:
+            raise ValueError(
+                f"Invalid chunk_size value: {chunk_size}. "
+                "Parameter 'chunk_size' must be greater than 0.")
+
+        inserted: int = 0
+        iterator = iter(values)
+
+        async with self._write_lock:
+            while True:
+                chunk: list[T] = list(itertools.islice(iterator, chunk_size))
+
+                if not chunk:
+                    break
+
+                inserted += self._skip_list.insert_many(chunk)
+                await asyncio.sleep(0)
+
+        return inserted
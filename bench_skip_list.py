@@ -0,0 +1,307 @@
+from __future__ import annotations
+from typing import Callable
+from skip_list import SkipList
+from concurrent_skip_list import ConcurrentSkipList
+from compact_skip_list import CompactSkipList
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import gc
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+def measure_allocated(build: Callable[[], object]) -> tuple[object, int]:
+    """
+    Run 'build' and return its result along with the number
+    of bytes still allocated by it once it returned.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        result: object = build()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, allocated
+
+def bench_memory(size: int) -> None:
+    """
+    Compare bytes per element of the per-tower forward arrays
+    against forward arrays sized to max_level + 1 for every node.
+    """
+
+    values: list[int] = list(range(size))
+    random.shuffle(values)
+
+    def build() -> SkipList[int]:
+        skip_list: SkipList[int] = SkipList[int]()
+
+        for value in values:
+            skip_list.insert(value)
+
+        return skip_list
+
+    skip_list, after = measure_allocated(build)
+    assert isinstance(skip_list, SkipList)
+
+    def inflate() -> None:
+        # pads every tower back to max_level + 1 slots,
+        # reproducing the previous fixed-size node layout
+        node: SkipList.Node | None = skip_list._head.forward[0]
+
+        while node is not None:
+            node.forward.extend(
+                [None] * (skip_list.max_level - node.current_level))
+            node = node.forward[0]
+
+    _, padding = measure_allocated(inflate)
+    before: int = after + padding
+
+    print(f"memory ({size} int elements, "
+          f"max_level={skip_list.max_level})")
+    print(f"  max_level + 1 forward slots: {before / size:8.1f} bytes/element")
+    print(f"  per-tower forward slots:     {after / size:8.1f} bytes/element")
+    print(f"  reduction:                   {before / after:8.2f}x")
+
+def timed(run: Callable[[], object]) -> float:
+    """
+    Return the wall-clock time in seconds taken by 'run'.
+    """
+
+    gc.collect()
+    start: float = time.perf_counter()
+    run()
+
+    return time.perf_counter() - start
+
+def bench_build(size: int) -> None:
+    """
+    Compare bulk construction against inserting values one by one.
+    """
+
+    ordered: list[int] = list(range(size))
+    shuffled: list[int] = ordered.copy()
+    random.shuffle(shuffled)
+
+    def insert_all() -> None:
+        skip_list: SkipList[int] = SkipList[int]()
+
+        for value in shuffled:
+            skip_list.insert(value)
+
+    insert_time: float = timed(insert_all)
+    from_sorted_time: float = timed(lambda: SkipList[int].from_sorted(ordered))
+    from_iterable_time: float = \
+        timed(lambda: SkipList[int].from_iterable(shuffled))
+
+    print(f"build ({size} int elements)")
+    print(f"  repeated insert: {insert_time:8.3f} s")
+    print(f"  from_sorted:     {from_sorted_time:8.3f} s "
+          f"({insert_time / from_sorted_time:.2f}x)")
+    print(f"  from_iterable:   {from_iterable_time:8.3f} s "
+          f"({insert_time / from_iterable_time:.2f}x)")
+
+def bench_batch(size: int) -> None:
+    """
+    Compare batch operations against one call per value, on a
+    near-sequential batch landing among existing values.
+    """
+
+    existing: list[int] = list(range(0, 2 * size, 2))
+    batch: list[int] = list(range(1, 2 * size, 2))
+    # a few out of order values, as late arrivals would be
+    for position in range(0, size - 1, 100):
+        batch[position], batch[position + 1] = \
+            batch[position + 1], batch[position]
+
+    def insert_each() -> None:
+        for value in batch:
+            skip_list.insert(value)
+
+    def insert_many() -> None:
+        skip_list.insert_many(batch)
+
+    print(f"batch ({size} int elements into {size})")
+
+    for name, run in [("insert", insert_each), ("insert_many", insert_many)]:
+        skip_list: SkipList[int] = SkipList[int].from_sorted(existing)
+        print(f"  {name + ':':17}{size / timed(run):12.0f} ops/s")
+
+    retrieve_time: float = \
+        timed(lambda: [skip_list.retrieve(value) for value in batch])
+    contains_many_time: float = \
+        timed(lambda: skip_list.contains_many(batch))
+
+    print(f"  {'retrieve:':17}{size / retrieve_time:12.0f} ops/s")
+    print(f"  {'contains_many:':17}{size / contains_many_time:12.0f} ops/s")
+
+    remove_time: float = \
+        timed(lambda: [skip_list.remove(value) for value in batch])
+    skip_list.insert_many(batch)
+    remove_many_time: float = timed(lambda: skip_list.remove_many(batch))
+
+    print(f"  {'remove:':17}{size / remove_time:12.0f} ops/s")
+    print(f"  {'remove_many:':17}{size / remove_many_time:12.0f} ops/s")
+
+class BitLevelSkipList(SkipList[int]):
+    """
+    A SkipList drawing its levels from a single random word, as the
+    number of its trailing zero bits, valid for a promotion probability
+    of 0.5 only.
+    """
+
+    __slots__ = ()
+
+    def _random_level(self) -> int:
+        bits: int = self._rng.getrandbits(self._max_level)
+
+        if bits & 1:
+            return 0
+        elif bits == 0:
+            return self._max_level
+
+        return (bits & -bits).bit_length() - 1
+
+def bench_levels(size: int) -> None:
+    """
+    Compare level generation strategies, alone and within inserts.
+    """
+
+    values: list[int] = list(range(size))
+    random.shuffle(values)
+
+    print(f"levels ({size} int insertions)")
+
+    for name, skip_list in [
+            ("global random()", SkipList[int]()),
+            ("seeded random()", SkipList[int](seed=0)),
+            ("global getrandbits", BitLevelSkipList()),
+            ("seeded getrandbits", BitLevelSkipList(seed=0))]:
+        random_level: Callable[[], int] = skip_list._random_level
+        level_time: float = min(
+            timed(lambda: [random_level() for _ in values])
+            for _ in range(5))
+        insert_time: float = \
+            timed(lambda: [skip_list.insert(value) for value in values])
+
+        print(f"  {name + ':':20}{size / level_time:12.0f} levels/s"
+              f"{size / insert_time:12.0f} inserts/s")
+
+def bench_concurrent(size: int) -> None:
+    """
+    Compare the throughput of a mixed workload (80% lookups, 10%
+    inserts, 10% removals) shared by several threads, between a
+    ConcurrentSkipList and a SkipList guarded by a single lock.
+    """
+
+    gil_enabled: bool = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print(f"concurrent ({size} operations over {size} int elements, "
+          f"GIL {'enabled' if gil_enabled else 'disabled'})")
+
+    for threads in [1, 2, 4, 8]:
+        operations: list[list[tuple[int, int]]] = []
+        rng: random.Random = random.Random(threads)
+
+        for _ in range(threads):
+            operations.append([
+                (rng.randrange(10), rng.randrange(2 * size))
+                for _ in range(size // threads)])
+
+        lock: threading.Lock = threading.Lock()
+        locked_list: SkipList[int] = \
+            SkipList[int].from_sorted(range(0, 2 * size, 2))
+        concurrent_list: ConcurrentSkipList[int] = ConcurrentSkipList[int]()
+
+        for value in range(0, 2 * size, 2):
+            concurrent_list.insert(value)
+
+        def run_locked(batch: list[tuple[int, int]]) -> None:
+            for kind, value in batch:
+                with lock:
+                    if kind == 0:
+                        locked_list.insert(value)
+                    elif kind == 1:
+                        locked_list.remove(value)
+                    else:
+                        locked_list.retrieve(value)
+
+        def run_concurrent(batch: list[tuple[int, int]]) -> None:
+            for kind, value in batch:
+                if kind == 0:
+                    concurrent_list.insert(value)
+                elif kind == 1:
+                    concurrent_list.remove(value)
+                else:
+                    concurrent_list.retrieve(value)
+
+        for name, run in [("SkipList + lock", run_locked),
+                          ("ConcurrentSkipList", run_concurrent)]:
+            with ThreadPoolExecutor(threads) as executor:
+                elapsed: float = timed(
+                    lambda: list(executor.map(run, operations)))
+
+            print(f"  {threads} thread(s), {name + ':':20}"
+                  f"{size / elapsed:12.0f} ops/s")
+
+def bench_compact(size: int) -> None:
+    """
+    Compare memory per element and lookup throughput of the
+    array-backed CompactSkipList against the node-based SkipList,
+    on int64 keys.
+    """
+
+    lookups: list[int] = \
+        [random.randrange(2 * size) for _ in range(min(size, 200_000))]
+
+    print(f"compact ({size} int64 elements, {len(lookups)} lookups)")
+
+    for name, build in [
+            ("SkipList", lambda: SkipList[int].from_sorted(
+                range(0, 2 * size, 2))),
+            ("CompactSkipList", lambda: CompactSkipList.from_sorted(
+                range(0, 2 * size, 2)))]:
+        skip_list, allocated = measure_allocated(build)
+        assert isinstance(skip_list, (SkipList, CompactSkipList))
+        retrieve: Callable[[int], bool] = skip_list.retrieve
+        elapsed: float = timed(lambda: [retrieve(key) for key in lookups])
+
+        print(f"  {name + ':':17}{allocated / size:8.1f} bytes/element"
+              f"{len(lookups) / elapsed:12.0f} lookups/s")
+
+        del skip_list
+
+BENCHMARKS: dict[str, Callable[[int], None]] = {
+    "memory": bench_memory,
+    "build": bench_build,
+    "batch": bench_batch,
+    "levels": bench_levels,
+    "concurrent": bench_concurrent,
+    "compact": bench_compact,
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SkipList benchmarks")
+    parser.add_argument(
+        "benchmarks", nargs="*", metavar="BENCHMARK",
+        help=f"benchmarks to run among {', '.join(BENCHMARKS)} "
+             "(default: all)")
+    parser.add_argument(
+        "-n", "--size", type=int, default=1_000_000,
+        help="number of elements (default: 1000000)")
+    args = parser.parse_args()
+
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args.size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterable
+from skip_list import SkipList
+import argparse
+import bisect
+import functools
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# key streams, each a list of 'size' keys drawn from range(size)
+DISTRIBUTIONS: tuple[str, ...] = \
+    ("sequential", "reverse", "random", "zipfian", "near-sorted")
+OPERATIONS: tuple[str, ...] = ("insert", "retrieve", "iterate", "remove")
+# insort() and del on a sorted list move O(n) pointers per call
+BISECT_LIMIT: int = 200_000
+
+def make_keys(distribution: str, size: int, rng: random.Random) -> list[int]:
+    """
+    Return a stream of 'size' keys following 'distribution'.
+    """
+
+    if distribution == "sequential":
+        return list(range(size))
+    elif distribution == "reverse":
+        return list(range(size - 1, -1, -1))
+    elif distribution == "random":
+        keys: list[int] = list(range(size))
+        rng.shuffle(keys)
+
+        return keys
+    elif distribution == "zipfian":
+        # ranks drawn with weights 1 / rank^1.1, hot keys being
+        # scattered over the key space rather than the lowest ones
+        cum_weights: list[float] = list(itertools.accumulate(
+            1 / rank ** 1.1 for rank in range(1, size + 1)))
+        scattered: list[int] = list(range(size))
+        rng.shuffle(scattered)
+
+        return [scattered[rank] for rank in rng.choices(
+            range(size), cum_weights=cum_weights, k=size)]
+    elif distribution == "near-sorted":
+        # sequential with 1% of the keys swapped with a close one
+        keys = list(range(size))
+
+        for _ in range(size // 100):
+            position: int = rng.randrange(size)
+            other: int = min(size - 1, position + rng.randrange(1, 16))
+            keys[position], keys[other] = keys[other], keys[position]
+
+        return keys
+
+    raise ValueError(f"Unknown distribution: {distribution!r}")
+
+class SortedListSet:
+    """
+    The bisect baseline: a sorted Python list of unique keys.
+    """
+
+    __slots__ = ("_keys",)
+
+    _keys: list[int]
+
+    def __init__(self) -> None:
+        self._keys = []
+
+    def insert(self, key: int) -> bool:
+        index: int = bisect.bisect_left(self._keys, key)
+
+        if index < len(self._keys) and self._keys[index] == key:
+            return False
+
+        self._keys.insert(index, key)
+
+        return True
+
+    def remove(self, key: int) -> bool:
+        index: int = bisect.bisect_left(self._keys, key)
+
+        if index == len(self._keys) or self._keys[index] != key:
+            return False
+
+        del self._keys[index]
+
+        return True
+
+    def retrieve(self, key: int) -> bool:
+        index: int = bisect.bisect_left(self._keys, key)
+
+        return index < len(self._keys) and self._keys[index] == key
+
+    def ordered(self) -> Iterable[int]:
+        return self._keys
+
+class DictSet:
+    """
+    The dict baseline, sorting its keys for ordered iteration.
+    """
+
+    __slots__ = ("_keys",)
+
+    _keys: dict[int, None]
+
+    def __init__(self) -> None:
+        self._keys = {}
+
+    def insert(self, key: int) -> bool:
+        if key in self._keys:
+            return False
+
+        self._keys[key] = None
+
+        return True
+
+    def remove(self, key: int) -> bool:
+        return self._keys.pop(key, False) is None
+
+    def retrieve(self, key: int) -> bool:
+        return key in self._keys
+
+    def ordered(self) -> Iterable[int]:
+        return sorted(self._keys)
+
+class SkipListSet:
+    """
+    Adapts a SkipList to the interface of the baselines.
+    """
+
+    __slots__ = ("skip_list",)
+
+    skip_list: SkipList[int]
+
+    def __init__(self, promotion_probability: float, max_level: int) -> None:
+        self.skip_list = SkipList[int](
+            promotion_probability=promotion_probability, max_level=max_level)
+
+    def insert(self, key: int) -> bool:
+        return self.skip_list.insert(key)
+
+    def remove(self, key: int) -> bool:
+        return self.skip_list.remove(key)
+
+    def retrieve(self, key: int) -> bool:
+        return self.skip_list.retrieve(key)
+
+    def ordered(self) -> Iterable[int]:
+        return self.skip_list.irange()
+
+def percentile(ordered: list[int], fraction: float) -> int:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def time_each(operation: Callable[[int], bool],
+              keys: list[int]) -> dict[str, Any]:
+    """
+    Time every call of 'operation' on 'keys', returning the throughput
+    and latency percentiles in nanoseconds. The throughput only counts
+    the time spent in calls, not the loop around them.
+    """
+
+    clock: Callable[[], int] = time.perf_counter_ns
+    latencies: list[int] = []
+    append: Callable[[int], None] = latencies.append
+    gc.collect()
+    gc.disable()
+
+    try:
+        for key in keys:
+            start: int = clock()
+            operation(key)
+            append(clock() - start)
+    finally:
+        gc.enable()
+
+    latencies.sort()
+    total: int = max(sum(latencies), 1)
+
+    return {
+        "ops_per_sec": len(keys) * 1e9 / total,
+        "latency_ns": {
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "p999": percentile(latencies, 0.999),
+            "max": latencies[-1],
+        },
+    }
+
+def memory_kb(make: Callable[[], Any], keys: list[int]) -> dict[str, int]:
+    """
+    Build a fresh structure from 'keys' under tracemalloc, returning
+    the memory it holds once built and the peak reached while building
+    it, in KiB. Measured apart from the timed runs, which tracemalloc
+    would slow down, and per structure, unlike the resident set size
+    of the process which never shrinks.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        structure: Any = make()
+
+        for key in keys:
+            structure.insert(key)
+
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"memory_kb": current // 1024, "peak_memory_kb": peak // 1024}
+
+def run_structure(structure: Any, keys: list[int]) -> dict[str, Any]:
+    """
+    Run every operation on 'structure' with 'keys', in order:
+    insert them all, retrieve them all, iterate, then remove them all.
+    """
+
+    results: dict[str, Any] = {}
+    results["insert"] = time_each(structure.insert, keys)
+    results["retrieve"] = time_each(structure.retrieve, keys)
+
+    gc.collect()
+    start: float = time.perf_counter()
+    count: int = sum(1 for _ in structure.ordered())
+    elapsed: float = max(time.perf_counter() - start, 1e-9)
+    results["iterate"] = {"ops_per_sec": count / elapsed, "latency_ns": None}
+
+    results["remove"] = time_each(structure.remove, keys)
+
+    return results
+
+def run_suite(sizes: list[int],
+              distributions: list[str],
+              probabilities: list[float],
+              max_levels: list[int],
+              seed: int) -> dict[str, Any]:
+    records: list[dict[str, Any]] = []
+
+    for size in sizes:
+        for distribution in distributions:
+            keys: list[int] = \
+                make_keys(distribution, size, random.Random(seed))
+            configurations: list[tuple[dict[str, Any], Callable[[], Any]]] = [
+                ({"structure": "SkipList",
+                  "promotion_probability": p,
+                  "max_level": max_level},
+                 functools.partial(SkipListSet, p, max_level))
+                for p in probabilities for max_level in max_levels]
+            configurations.append(({"structure": "dict"}, DictSet))
+
+            if size <= BISECT_LIMIT:
+                configurations.append(({"structure": "bisect"}, SortedListSet))
+
+            for parameters, make in configurations:
+                results: dict[str, Any] = run_structure(make(), keys)
+                memory: dict[str, int] = memory_kb(make, keys)
+
+                for operation in OPERATIONS:
+                    records.append({
+                        **parameters,
+                        "distribution": distribution,
+                        "size": size,
+                        "operation": operation,
+                        **results[operation],
+                        **memory,
+                    })
+
+                print(f"{size:>9} {distribution:12} "
+                      f"{describe(parameters):28}"
+                      + "".join(f"{results[operation]['ops_per_sec']:12.0f}"
+                                for operation in OPERATIONS)
+                      + f"{memory['memory_kb']:10} KiB",
+                      file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": seed,
+        },
+        "results": records,
+    }
+
+def describe(parameters: dict[str, Any]) -> str:
+    if parameters["structure"] != "SkipList":
+        return str(parameters["structure"])
+
+    return (f"SkipList p={parameters['promotion_probability']} "
+            f"max_level={parameters['max_level']}")
+
+def record_key(record: dict[str, Any]) -> tuple[Any, ...]:
+    return (record["structure"], record.get("promotion_probability"),
+            record.get("max_level"), record["distribution"],
+            record["size"], record["operation"])
+
+def compare(baseline: dict[str, Any],
+            current: dict[str, Any],
+            threshold: float) -> int:
+    """
+    Print the throughputs that changed by more than 'threshold'
+    (a fraction) since 'baseline', returning how many regressed.
+    """
+
+    previous: dict[tuple[Any, ...], float] = {
+        record_key(record): record["ops_per_sec"]
+        for record in baseline["results"]}
+    regressions: int = 0
+
+    for record in current["results"]:
+        before: float | None = previous.get(record_key(record))
+
+        if before is None:
+            continue
+
+        ratio: float = record["ops_per_sec"] / before
+
+        if abs(ratio - 1) > threshold:
+            regressions += ratio < 1
+            print(f"{'slower' if ratio < 1 else 'faster':7}{ratio:7.2f}x  "
+                  f"{describe(record)}, {record['distribution']}, "
+                  f"{record['size']} {record['operation']}")
+
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="SkipList benchmark suite, against bisect and dict")
+    parser.add_argument(
+        "-n", "--size", type=int, default=100_000,
+        help="largest number of elements, sizes running from 1000 up "
+             "by powers of 10 (default: 100000, 10000000 for the full "
+             "sweep)")
+    parser.add_argument(
+        "-d", "--distributions", nargs="+", default=list(DISTRIBUTIONS),
+        metavar="DISTRIBUTION",
+        help=f"key streams among {', '.join(DISTRIBUTIONS)} (default: all)")
+    parser.add_argument(
+        "-p", "--promotion-probability", type=float, nargs="+",
+        default=[0.25, 0.5], metavar="P",
+        help="promotion probabilities to sweep (default: 0.25 0.5)")
+    parser.add_argument(
+        "-l", "--max-level", type=int, nargs="+", default=[16, 32],
+        metavar="LEVEL", help="max levels to sweep (default: 16 32)")
+    parser.add_argument(
+        "-s", "--seed", type=int, default=0,
+        help="seed of the key streams (default: 0)")
+    parser.add_argument(
+        "-o", "--output", default="bench_suite.json",
+        help="JSON results file (default: bench_suite.json)")
+    parser.add_argument(
+        "-b", "--baseline", metavar="JSON",
+        help="previous results to compare against, exiting with status 1 "
+             "on regressions")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.1,
+        help="relative throughput change reported against the baseline "
+             "(default: 0.1)")
+    args = parser.parse_args()
+
+    for distribution in args.distributions:
+        if distribution not in DISTRIBUTIONS:
+            parser.error(f"unknown distribution: {distribution}")
+
+    sizes: list[int] = [10 ** exponent for exponent in range(3, 8)
+                        if 10 ** exponent <= args.size] or [args.size]
+    results: dict[str, Any] = run_suite(
+        sizes, args.distributions, args.promotion_probability,
+        args.max_level, args.seed)
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline: dict[str, Any] = json.load(file)
+
+        if compare(baseline, results, args.threshold) > 0:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+from typing import Any, Final, Iterable, Iterator, Self
+from array import array
+import random
+
+# slot 0 of every level is the head, a link to -1 the end of the level
+_HEAD: Final[int] = 0
+_END: Final[int] = -1
+
+# the numeric array typecodes
+_TYPECODES: Final[tuple[str, ...]] = \
+    ("b", "B", "h", "H", "i", "I", "l", "L", "q", "Q", "f", "d")
+
+class CompactSkipList:
+    """
+    A SkipList of numbers storing its towers in parallel typed arrays
+    instead of Node objects, with the same insert/remove/retrieve/
+    iter_from interface.
+
+    Each level owns its arrays, indexed by slot: the values ('typecode'
+    items, int64 by default), the int32 slot of the next value on that
+    level and, above level 0, the int32 slot of the same value on the
+    level below. A value costs about 12 bytes on level 0 and 16 bytes
+    per additional level, that is about 28 bytes overall for a promotion
+    probability of 0.5, with no per-value Python object. Slots freed by
+    remove() are kept on per-level free lists and reused by insert().
+    """
+
+    __slots__ = ("_p", "_max_level", "_typecode", "_rng", "_size",
+                 "_current_level", "_values", "_next", "_down", "_free")
+
+    _p: Final[float]
+    _max_level: Final[int]
+    _typecode: Final[str]
+    # either a seeded random.Random or the random module itself
+    _rng: Final[Any]
+    _size: int
+    _current_level: int
+    _values: list[array[Any]]
+    _next: list[array[int]]
+    # _down[0] only holds the head slot, level 0 having nothing below
+    _down: list[array[int]]
+    _free: list[array[int]]
+
+    def __init__(self,
+                 promotion_probability: float = 0.5,
+                 max_level: int = 32,
+                 typecode: str = "q",
+                 seed: int | None = None) -> None:
+        if promotion_probability < 0 or promotion_probability > 1:
+            raise ValueError(
+                f"Invalid promotion probability value: {promotion_probability}. "
+                "Parameter 'promotion_probability' must be "
+                "between 0 and 1 inclusive.")
+
+        self._p = promotion_probability
+
+        if max_level < 0:
+            raise ValueError(
+                f"Invalid max_level value: {max_level}. "
+                "Parameter 'max_level' must be greater than or equal to 0.")
+
+        self._max_level = max_level
+
+        if typecode not in _TYPECODES:
+            raise ValueError(
+                f"Invalid typecode value: {typecode!r}. "
+                "Parameter 'typecode' must be a numeric array typecode.")
+
+        self._typecode = typecode
+        self._rng = random if seed is None else random.Random(seed)
+        self._size = 0
+        self._current_level = -1
+        self._values = []
+        self._next = []
+        self._down = []
+        self._free = []
+        self._add_level()
+
+    @classmethod
+    def from_sorted(cls, iterable: Iterable[Any], **kwargs: Any) -> Self:
+        """
+        Build a CompactSkipList from values given in ascending order,
+        in linear time, appending each tower to the end of its levels.
+        Consecutive equal values are only inserted once.
+
+        Keyword arguments are forwarded to the constructor.
+        """
+
+        skip_list: Self = cls(**kwargs)
+        # last slot of each level
+        last: list[int] = [_HEAD] * (skip_list._max_level + 1)
+        values: list[array[Any]] = skip_list._values
+        nexts: list[array[int]] = skip_list._next
+        downs: list[array[int]] = skip_list._down
+        level: int
+
+        for value in iterable:
+            if skip_list._size > 0:
+                previous: Any = values[0][last[0]]
+
+                if value == previous:
+                    continue
+                elif not value > previous:
+                    raise ValueError(
+                        f"Value {value!r} is lower than its predecessor "
+                        f"{previous!r}: iterable must be sorted.")
+
+            new_level: int = skip_list._random_level()
+
+            while new_level > skip_list._current_level:
+                skip_list._current_level += 1
+
+                if skip_list._current_level == len(values):
+                    skip_list._add_level()
+
+            below: int = _END
+
+            for level in range(new_level + 1):
+                slot: int = len(values[level])
+                values[level].append(value)
+                nexts[level].append(_END)
+
+                if level > 0:
+                    downs[level].append(below)
+
+                nexts[level][last[level]] = slot
+                last[level] = slot
+                below = slot
+
+            skip_list._size += 1
+
+        return skip_list
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def iter_from(self, level: int) -> Iterator[Any]:
+        if level < 0:
+            raise ValueError(
+                f"'level' {level} is too low (min 0)")
+        elif level > self._current_level:
+            raise ValueError(
+                f"'level' {level} is too high "
+                f"(max {self._current_level})")
+
+        values: array[Any] = self._values[level]
+        nexts: array[int] = self._next[level]
+        slot: int = nexts[_HEAD]
+
+        while slot != _END:
+            yield values[slot]
+            slot = nexts[slot]
+
+    @property
+    def promotion_probability(self) -> float:
+        return self._p
+
+    @property
+    def max_level(self) -> int:
+        return self._max_level
+
+    @property
+    def typecode(self) -> str:
+        return self._typecode
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def current_level(self) -> int:
+        return self._current_level
+
+    def insert(self, value: Any) -> bool:
+        update: list[int] = self._find_update(value)
+        slot: int = self._next[0][update[0]]
+
+        if slot != _END and value == self._values[0][slot]:
+            return False
+
+        new_level: int = self._random_level()
+
+        for level in range(len(update), new_level + 1):
+            update.append(_HEAD)
+
+            if level == len(self._values):
+                self._add_level()
+
+        below: int = _END
+
+        for level in range(new_level + 1):
+            values: array[Any] = self._values[level]
+            nexts: array[int] = self._next[level]
+            free: array[int] = self._free[level]
+            prev: int = update[level]
+
+            # a value the typecode cannot store fails on level 0,
+            # before any slot is taken or level raised
+            if free:
+                slot = free[-1]
+                values[slot] = value
+                free.pop()
+                nexts[slot] = nexts[prev]
+
+                if level > 0:
+                    self._down[level][slot] = below
+            else:
+                slot = len(values)
+                values.append(value)
+                nexts.append(nexts[prev])
+
+                if level > 0:
+                    self._down[level].append(below)
+
+            nexts[prev] = slot
+            below = slot
+
+        self._current_level = max(self._current_level, new_level)
+        self._size += 1
+
+        return True
+
+    def remove(self, value: Any) -> bool:
+        if self._size == 0:
+            return False
+
+        update: list[int] = self._find_update(value)
+        slot: int = self._next[0][update[0]]
+
+        if slot == _END or value != self._values[0][slot]:
+            return False
+
+        for level in range(self._current_level + 1):
+            nexts: array[int] = self._next[level]
+            prev: int = update[level]
+            slot = nexts[prev]
+
+            if slot == _END or value != self._values[level][slot]:
+                # the tower does not reach higher levels
+                break
+
+            nexts[prev] = nexts[slot]
+            self._free[level].append(slot)
+
+        while self._current_level >= 0 and \
+                self._next[self._current_level][_HEAD] == _END:
+            self._current_level -= 1
+
+        self._size -= 1
+
+        return True
+
+    def retrieve(self, value: Any) -> bool:
+        slot: int = _HEAD
+
+        for level in range(self._current_level, -1, -1):
+            values: array[Any] = self._values[level]
+            nexts: array[int] = self._next[level]
+            next_slot: int = nexts[slot]
+
+            while next_slot != _END and value > values[next_slot]:
+                slot = next_slot
+                next_slot = nexts[slot]
+
+            if next_slot != _END and value == values[next_slot]:
+                return True
+
+            if level > 0:
+                slot = self._down[level][slot]
+
+        return False
+
+    def _find_update(self, value: Any) -> list[int]:
+        """
+        Return, for each level, the slot of the last value lower than
+        'value' (the head slot if there is none).
+        """
+
+        update: list[int] = [_HEAD] * (max(self._current_level, 0) + 1)
+        slot: int = _HEAD
+
+        for level in range(self._current_level, -1, -1):
+            values: array[Any] = self._values[level]
+            nexts: array[int] = self._next[level]
+            next_slot: int = nexts[slot]
+
+            while next_slot != _END and value > values[next_slot]:
+                slot = next_slot
+                next_slot = nexts[slot]
+
+            update[level] = slot
+
+            if level > 0:
+                slot = self._down[level][slot]
+
+        return update
+
+    def _add_level(self) -> None:
+        """
+        Allocate the arrays of a new level, holding its head slot.
+        """
+
+        self._values.append(array(self._typecode, [0]))
+        self._next.append(array("i", [_END]))
+        self._down.append(array("i", [_HEAD]))
+        self._free.append(array("i"))
+
+    def _random_level(self) -> int:
+        level: int = 0
+
+        while level < self._max_level and self._rng.random() < self._p:
+            level += 1
+
+        return level
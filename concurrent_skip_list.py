@@ -0,0 +1,334 @@
+from __future__ import annotations
+from typing import Generic, Self, Final, Iterator, cast
+from skip_list import T
+import random
+import threading
+import time
+
+class ConcurrentSkipList(Generic[T]):
+    """
+    A SkipList safe to share between threads, following the lazy
+    concurrent skip list of Herlihy, Lev, Luchangco and Shavit.
+
+    Lookups and iteration never lock. Writers search without locking
+    either, then only lock the predecessors found on the levels they
+    modify, validating that those are still unmarked and linked to the
+    expected successors before changing any pointer, and retrying the
+    search otherwise. Removed nodes are first marked, then unlinked.
+
+    Correctness only relies on per-node locks, so it holds on
+    free-threaded (no-GIL) CPython builds as well.
+    """
+
+    class Node:
+        """
+        A node in the ConcurrentSkipList, holding a value, forward
+        pointers across multiple levels and its own lock.
+        """
+
+        __slots__ = ("value", "current_level", "forward",
+                     "lock", "marked", "fully_linked")
+
+        current_level: int
+        forward: list[Self | None]
+        lock: threading.Lock
+        # set, under lock, once the node is logically removed
+        marked: bool
+        # set once the node is linked on all of its levels
+        fully_linked: bool
+
+        def __init__(self, value: T | None, level: int) -> None:
+            self.value: T | None = value
+            self.current_level = level
+            self.forward = [None] * (level + 1)
+            self.lock = threading.Lock()
+            self.marked = False
+            self.fully_linked = False
+
+    __slots__ = ("_p", "_max_level", "_size", "_size_lock",
+                 "_head", "_level_lock")
+
+    _p: Final[float]
+    _max_level: Final[int]
+    _size: int
+    _size_lock: Final[threading.Lock]
+    _head: ConcurrentSkipList.Node
+    # held to raise the head's current level, which never decreases
+    _level_lock: Final[threading.Lock]
+
+    def __init__(self,
+                 promotion_probability: float = 0.5,
+                 max_level: int = 32) -> None:
+        if promotion_probability < 0 or promotion_probability > 1:
+            raise ValueError(
+                f"Invalid promotion probability value: {promotion_probability}. "
+                "Parameter 'promotion_probability' must be "
+                "between 0 and 1 inclusive.")
+
+        self._p = promotion_probability
+
+        if max_level < 0:
+            raise ValueError(
+                f"Invalid max_level value: {max_level}. "
+                "Parameter 'max_level' must be greater than or equal to 0.")
+
+        self._max_level = max_level
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._head = ConcurrentSkipList.Node(None, self._max_level)
+        self._head.current_level = -1
+        self._head.fully_linked = True
+        self._level_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def iter_from(self, level: int) -> Iterator[T]:
+        """
+        Iterate without locking over the values present on 'level',
+        skipping the ones being inserted or removed. Values inserted
+        or removed during iteration may or may not be seen.
+        """
+
+        if level < 0:
+            raise ValueError(
+                f"'level' {level} is too low (min 0)")
+        elif level > self._head.current_level:
+            raise ValueError(
+                f"'level' {level} is too high "
+                f"(max {self._head.current_level})")
+
+        current_node: ConcurrentSkipList.Node | None = \
+            self._head.forward[level]
+
+        while current_node is not None:
+            if current_node.fully_linked and not current_node.marked:
+                yield cast(T, current_node.value)
+
+            current_node = current_node.forward[level]
+
+    @property
+    def promotion_probability(self) -> float:
+        return self._p
+
+    @property
+    def max_level(self) -> int:
+        return self._max_level
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def current_level(self) -> int:
+        return self._head.current_level
+
+    def insert(self, value: T) -> bool:
+        new_level: int = self._random_level()
+        self._raise_level(new_level)
+        preds: list[ConcurrentSkipList.Node] = [self._head] * (new_level + 1)
+        succs: list[ConcurrentSkipList.Node | None] = [None] * (new_level + 1)
+
+        while True:
+            found: ConcurrentSkipList.Node | None = \
+                self._find(value, preds, succs)
+
+            if found is not None:
+                if found.marked:
+                    # being removed, search again once it is unlinked,
+                    # letting the remover run meanwhile
+                    time.sleep(0)
+                    continue
+
+                # wait for a concurrent insert of the same value
+                while not found.fully_linked:
+                    time.sleep(0)
+
+                return False
+
+            locked: list[ConcurrentSkipList.Node] = []
+
+            try:
+                if not self._lock_preds(preds, succs, new_level, locked):
+                    continue
+
+                new_node: ConcurrentSkipList.Node = \
+                    ConcurrentSkipList.Node(value, new_level)
+
+                for level in range(new_level + 1):
+                    new_node.forward[level] = succs[level]
+
+                for level in range(new_level + 1):
+                    preds[level].forward[level] = new_node
+
+                new_node.fully_linked = True
+            finally:
+                for node in locked:
+                    node.lock.release()
+
+            with self._size_lock:
+                self._size += 1
+
+            return True
+
+    def remove(self, value: T) -> bool:
+        current_level: int = self._head.current_level
+
+        if current_level < 0:
+            return False
+
+        preds: list[ConcurrentSkipList.Node] = \
+            [self._head] * (current_level + 1)
+        succs: list[ConcurrentSkipList.Node | None] = \
+            [None] * (current_level + 1)
+        victim: ConcurrentSkipList.Node | None = None
+
+        while True:
+            found: ConcurrentSkipList.Node | None = \
+                self._find(value, preds, succs)
+
+            if victim is None:
+                if found is None or found.marked or not found.fully_linked:
+                    return False
+
+                victim = found
+                victim.lock.acquire()
+
+                if victim.marked:
+                    victim.lock.release()
+                    return False
+
+                # logically removed from now on, so that no
+                # concurrent insert can link a node after it
+                victim.marked = True
+
+                if victim.current_level >= len(preds):
+                    # the head grew taller since the search started
+                    missing: int = victim.current_level + 1 - len(preds)
+                    preds.extend([self._head] * missing)
+                    succs.extend([None] * missing)
+                    continue
+
+            locked: list[ConcurrentSkipList.Node] = []
+
+            try:
+                if not self._lock_preds(
+                        preds, succs, victim.current_level, locked, victim):
+                    continue
+
+                for level in range(victim.current_level, -1, -1):
+                    preds[level].forward[level] = victim.forward[level]
+            finally:
+                for node in locked:
+                    node.lock.release()
+
+            victim.lock.release()
+
+            with self._size_lock:
+                self._size -= 1
+
+            return True
+
+    def retrieve(self, value: T) -> bool:
+        current_node: ConcurrentSkipList.Node = self._head
+        next_node: ConcurrentSkipList.Node | None
+
+        for level in range(self._head.current_level, -1, -1):
+            next_node = current_node.forward[level]
+
+            while next_node is not None and value > next_node.value:
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+            if next_node is not None and value == next_node.value:
+                return next_node.fully_linked and not next_node.marked
+
+        return False
+
+    def _find(self,
+              value: T,
+              preds: list[ConcurrentSkipList.Node],
+              succs: list[ConcurrentSkipList.Node | None]
+              ) -> ConcurrentSkipList.Node | None:
+        """
+        Fill 'preds' with the last node holding a value lower than
+        'value' and 'succs' with its successor, on every level they
+        cover, and return the node holding 'value' if any.
+
+        The search starts from the head's current level, which never
+        decreases and is raised before any taller node gets linked,
+        so that every node is met on its top level.
+        """
+
+        current_node: ConcurrentSkipList.Node = self._head
+        next_node: ConcurrentSkipList.Node | None = None
+        found: ConcurrentSkipList.Node | None = None
+        top_level: int = max(self._head.current_level, len(preds) - 1)
+
+        for level in range(top_level, -1, -1):
+            next_node = current_node.forward[level]
+
+            while next_node is not None and value > next_node.value:
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+            if found is None and next_node is not None and \
+                    value == next_node.value:
+                found = next_node
+
+            if level < len(preds):
+                preds[level] = current_node
+                succs[level] = next_node
+
+        return found
+
+    def _lock_preds(self,
+                    preds: list[ConcurrentSkipList.Node],
+                    succs: list[ConcurrentSkipList.Node | None],
+                    top_level: int,
+                    locked: list[ConcurrentSkipList.Node],
+                    victim: ConcurrentSkipList.Node | None = None) -> bool:
+        """
+        Lock the distinct predecessors of levels 0 to 'top_level', from
+        the bottom up, appending them to 'locked', and validate that each
+        is unmarked and still followed by its successor ('victim' if
+        any). Return False as soon as validation fails.
+
+        Nodes are always locked in descending value order, the victim
+        of a removal first, which rules deadlocks out.
+        """
+
+        prev: ConcurrentSkipList.Node | None = None
+
+        for level in range(top_level + 1):
+            pred: ConcurrentSkipList.Node = preds[level]
+            succ: ConcurrentSkipList.Node | None = \
+                succs[level] if victim is None else victim
+
+            if pred is not prev:
+                pred.lock.acquire()
+                locked.append(pred)
+                prev = pred
+
+            if pred.marked or pred.forward[level] is not succ or \
+                    (succ is not None and succ.marked and victim is None):
+                return False
+
+        return True
+
+    def _raise_level(self, level: int) -> None:
+        if level > self._head.current_level:
+            with self._level_lock:
+                if level > self._head.current_level:
+                    self._head.current_level = level
+
+    def _random_level(self) -> int:
+        level: int = 0
+
+        while level < self._max_level and random.random() < self._p:
+            level += 1
+
+        return level
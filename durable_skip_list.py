@@ -0,0 +1,509 @@
+from __future__ import annotations
+from typing import Any, Generic, Final, Iterator, Self, cast
+from skip_list import T, SkipList
+from snapshot import write_snapshot
+from array import array
+import os
+import pickle
+import re
+import struct
+import threading
+import zlib
+
+# length of the pickled value, crc32 of the operation and the value,
+# operation
+_RECORD: Final[struct.Struct] = struct.Struct("<IIB")
+_INSERT: Final[int] = 1
+_REMOVE: Final[int] = 2
+
+_SYNC_POLICIES: Final[tuple[str, ...]] = ("always", "interval", "group")
+_SNAPSHOT: Final[re.Pattern[str]] = re.compile(r"snapshot-(\d{8})")
+_SEGMENT: Final[re.Pattern[str]] = re.compile(r"wal-(\d{8})\.log")
+# SkipList parameters recorded in snapshots
+_SAVED: Final[tuple[str, ...]] = \
+    ("promotion_probability", "max_level", "indexed", "reverse")
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Persist the entries of a directory after files were created,
+    renamed or deleted in it, where the platform allows it.
+    """
+
+    if os.name == "posix":
+        descriptor: int = os.open(directory, os.O_RDONLY)
+
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+class DurableSkipList(Generic[T]):
+    """
+    A SkipList whose insertions and removals survive a crash, kept
+    in a directory holding a snapshot and write-ahead log segments.
+
+    Every insert() or remove() changing the SkipList appends a record
+    to the current segment: the length of the pickled value, a crc32
+    checksum, the operation then the value. When the record reaches
+    the disk depends on 'sync':
+
+    - "always": fsync before every write returns,
+    - "interval": fsync every 'sync_interval' seconds from a background
+      thread, losing at most that much on a crash,
+    - "group": fsync before every write returns, a single fsync
+      covering every write appended by other threads meanwhile.
+
+    Opening a directory loads the latest snapshot then replays the
+    segments written after it. A torn record at the end of the last
+    segment, left by a crash mid-write, is dropped.
+
+    compact() folds the log into a fresh snapshot. Writers are only
+    stopped while the values are copied and a new segment is started,
+    the snapshot being written by a background thread after which the
+    segments it covers are deleted. If it fails, the previous snapshot
+    and segments stay in place and the error is raised by the next
+    write, compaction or close().
+
+    Values are pickled: only open trusted directories.
+    """
+
+    __slots__ = ("_directory", "_sync", "_sync_interval", "_skip_list",
+                 "_lock", "_sync_condition", "_file", "_segment",
+                 "_written", "_synced", "_syncing", "_closed",
+                 "_sync_thread", "_compaction", "_compaction_error",
+                 "_options")
+
+    _directory: Final[str]
+    _sync: Final[str]
+    _sync_interval: Final[float]
+    _skip_list: SkipList[T]
+    # serializes writers, on the SkipList and the current segment
+    _lock: Final[threading.Lock]
+    # guards _synced and _syncing, the progress of fsync calls
+    _sync_condition: Final[threading.Condition]
+    _file: Any
+    _segment: int
+    # number of records appended, and known to be on disk
+    _written: int
+    _synced: int
+    _syncing: bool
+    _closed: Final[threading.Event]
+    _sync_thread: threading.Thread | None
+    _compaction: threading.Thread | None
+    # raised by the last compaction, until reported to the caller
+    _compaction_error: BaseException | None
+    # SkipList keyword arguments not recorded in snapshots
+    _options: Final[dict[str, Any]]
+
+    def __init__(self,
+                 directory: str | os.PathLike[str],
+                 sync: str = "always",
+                 sync_interval: float = 0.05,
+                 **kwargs: Any) -> None:
+        """
+        Open or create a durable SkipList in 'directory'. Keyword
+        arguments are forwarded to the SkipList constructor. Snapshots
+        record promotion_probability, max_level, indexed and reverse,
+        so those only apply when the directory is created. The other
+        ones, such as key or adaptive, are not saved and must be passed
+        again on every open.
+        """
+
+        if sync not in _SYNC_POLICIES:
+            raise ValueError(
+                f"Invalid sync value: {sync!r}. "
+                f"Parameter 'sync' must be one of {_SYNC_POLICIES}.")
+
+        if sync_interval <= 0:
+            raise ValueError(
+                f"Invalid sync_interval value: {sync_interval}. "
+                "Parameter 'sync_interval' must be greater than 0.")
+
+        self._directory = os.fspath(directory)
+        self._sync = sync
+        self._sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._sync_condition = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._closed = threading.Event()
+        self._sync_thread = None
+        self._compaction = None
+        self._compaction_error = None
+        self._options = {name: value for name, value in kwargs.items()
+                         if name not in _SAVED}
+
+        os.makedirs(self._directory, exist_ok=True)
+        self._recover(kwargs)
+
+        if sync == "interval":
+            self._sync_thread = threading.Thread(
+                target=self._sync_periodically, daemon=True)
+            self._sync_thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._skip_list)
+
+    def __bool__(self) -> bool:
+        return bool(self._skip_list)
+
+    def __iter__(self) -> Iterator[T]:
+        with self._lock:
+            values: list[T] = \
+                list(self._skip_list.iter_from(0)) if self._skip_list else []
+
+        return iter(values)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def sync_policy(self) -> str:
+        return self._sync
+
+    @property
+    def skip_list(self) -> SkipList[T]:
+        """
+        The underlying SkipList, which must not be modified directly.
+        """
+
+        return self._skip_list
+
+    def retrieve(self, value: T) -> bool:
+        with self._lock:
+            return self._skip_list.retrieve(value)
+
+    def insert(self, value: T) -> bool:
+        return self._write(_INSERT, value)
+
+    def remove(self, value: T) -> bool:
+        return self._write(_REMOVE, value)
+
+    def sync(self) -> None:
+        """
+        Flush every record appended so far to the disk.
+        """
+
+        self._sync_through(self._written)
+
+    def compact(self, wait: bool = False) -> None:
+        """
+        Fold the log into a fresh snapshot, from a background thread
+        unless 'wait'. A compaction still running is waited for first.
+        """
+
+        self.wait_compaction()
+
+        with self._lock:
+            if self._closed.is_set():
+                raise ValueError("DurableSkipList is closed")
+
+            values: list[T] = []
+            # the towers are kept as they are, like save() does
+            heights: array[int] = array("H")
+            node: SkipList.Node | None = self._skip_list._head.forward[0]
+
+            while node is not None:
+                values.append(cast(T, node.value))
+                heights.append(node.current_level)
+                node = node.forward[0]
+
+            segment: int = self._rotate()
+
+        self._compaction = threading.Thread(
+            target=self._compact_in_background,
+            args=(values, heights, segment))
+        self._compaction.start()
+
+        if wait:
+            self.wait_compaction()
+
+    def wait_compaction(self) -> None:
+        """
+        Wait for a running compaction, raising the error it failed with.
+        """
+
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+        self._raise_compaction_error()
+
+    def close(self) -> None:
+        """
+        Wait for compaction, flush the log to the disk then close it,
+        raising the error a compaction failed with afterwards.
+        """
+
+        with self._lock:
+            if self._closed.is_set():
+                return
+
+            self._closed.set()
+
+            try:
+                self.wait_compaction()
+            finally:
+                if self._sync_thread is not None:
+                    self._sync_thread.join()
+
+                self.sync()
+                self._file.close()
+
+    def _write(self, operation: int, value: T) -> bool:
+        """
+        Apply an operation to the SkipList then log it, the change being
+        undone if the record cannot be appended, so that the SkipList
+        never holds a change the log would lose.
+        """
+
+        # raises before anything changed on an unpicklable value
+        payload: bytes = pickle.dumps(value)
+        crc: int = zlib.crc32(payload, zlib.crc32(bytes((operation,))))
+        record: bytes = _RECORD.pack(len(payload), crc, operation) + payload
+        skip_list: SkipList[T] = self._skip_list
+
+        with self._lock:
+            if self._closed.is_set():
+                raise ValueError("DurableSkipList is closed")
+
+            self._raise_compaction_error()
+
+            if operation == _INSERT:
+                changed: bool = skip_list.insert(value)
+            else:
+                # the stored value, to put back on failure
+                removed: T | None = skip_list.ceiling(value)
+                changed = skip_list.remove(value)
+
+            if not changed:
+                return False
+
+            offset: int = self._file.tell()
+
+            try:
+                self._file.write(record)
+
+                if self._sync == "always":
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except BaseException:
+                if operation == _INSERT:
+                    skip_list.remove(value if skip_list._key is None
+                                     else skip_list._key(value))
+                else:
+                    skip_list.insert(cast(T, removed))
+
+                self._truncate(offset)
+                raise
+
+            # counted once in the file buffer, see _sync_through()
+            self._written += 1
+            written: int = self._written
+
+            if self._sync == "always":
+                self._synced = written
+
+        if self._sync == "group":
+            self._sync_through(written)
+
+        return True
+
+    def _truncate(self, offset: int) -> None:
+        """
+        Drop whatever part of a failed record reached the segment, if
+        the file still allows it. A torn record left at the end is
+        dropped on recovery anyway.
+        """
+
+        try:
+            self._file.truncate(offset)
+        except OSError:
+            pass
+
+    def _sync_through(self, written: int) -> None:
+        """
+        Return once the first 'written' records are on the disk. The
+        first waiting thread flushes and fsyncs every record appended
+        so far, then wakes up the threads it covered.
+        """
+
+        with self._sync_condition:
+            while self._synced < written:
+                if self._syncing:
+                    self._sync_condition.wait()
+                    continue
+
+                self._syncing = True
+                target: int = self._written
+                self._sync_condition.release()
+
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                finally:
+                    self._sync_condition.acquire()
+                    self._syncing = False
+                    self._sync_condition.notify_all()
+
+                self._synced = max(self._synced, target)
+
+    def _sync_periodically(self) -> None:
+        while not self._closed.wait(self._sync_interval):
+            self._sync_through(self._written)
+
+    def _rotate(self) -> int:
+        """
+        Flush the current segment and start the next one, returning its
+        number. Called with the write lock held.
+        """
+
+        with self._sync_condition:
+            while self._syncing:
+                self._sync_condition.wait()
+
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._synced = self._written
+            self._file.close()
+
+        self._segment += 1
+        self._file = open(self._path("wal", self._segment), "ab")
+        _fsync_directory(self._directory)
+
+        return self._segment
+
+    def _compact_in_background(self,
+                               values: list[T],
+                               heights: array[int],
+                               segment: int) -> None:
+        try:
+            self._write_snapshot(values, heights, segment)
+        except BaseException as error:
+            # the previous snapshot and segments are left in place
+            self._compaction_error = error
+
+    def _raise_compaction_error(self) -> None:
+        error: BaseException | None = self._compaction_error
+
+        if error is not None:
+            self._compaction_error = None
+
+            raise error
+
+    def _write_snapshot(self,
+                        values: list[T],
+                        heights: array[int],
+                        segment: int) -> None:
+        """
+        Save 'values' and the heights of their towers straight to the
+        snapshot preceding 'segment', then delete the previous snapshot
+        and the segments it replaces.
+        """
+
+        skip_list: SkipList[T] = self._skip_list
+        write_snapshot(
+            self._path("snapshot", segment), values, heights,
+            skip_list.promotion_probability, skip_list.max_level,
+            skip_list.indexed, skip_list.reverse, skip_list._key is not None)
+        _fsync_directory(self._directory)
+        self._delete_before(segment)
+
+    def _recover(self, kwargs: dict[str, Any]) -> None:
+        """
+        Load the latest snapshot, replay the segments following it
+        and open the last one for appending.
+        """
+
+        snapshots: list[int] = self._numbers(_SNAPSHOT)
+
+        if not snapshots:
+            # an empty snapshot records the parameters of a new directory
+            SkipList[T](**kwargs).save(self._path("snapshot", 0))
+            _fsync_directory(self._directory)
+            snapshots = [0]
+
+        self._skip_list = SkipList[T].load(
+            self._path("snapshot", snapshots[-1]), **self._options)
+        segments: list[int] = [segment for segment in self._numbers(_SEGMENT)
+                               if segment >= snapshots[-1]]
+        self._delete_before(snapshots[-1])
+
+        for index, segment in enumerate(segments):
+            self._replay(segment, last=index == len(segments) - 1)
+
+        self._segment = segments[-1] if segments else snapshots[-1]
+        self._file = open(self._path("wal", self._segment), "ab")
+
+    def _replay(self, segment: int, last: bool) -> None:
+        path: str = self._path("wal", segment)
+
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+
+        offset: int = 0
+
+        while offset < len(data):
+            if offset + _RECORD.size > len(data):
+                break
+
+            length, crc, operation = _RECORD.unpack_from(data, offset)
+            start: int = offset + _RECORD.size
+            payload: bytes = data[start:start + length]
+
+            if len(payload) < length or \
+                    zlib.crc32(payload, zlib.crc32(bytes((operation,)))) != crc:
+                break
+
+            if operation == _INSERT:
+                self._skip_list.insert(pickle.loads(payload))
+            else:
+                self._skip_list.remove(pickle.loads(payload))
+
+            offset = start + length
+
+        if offset < len(data):
+            if not last:
+                raise ValueError(
+                    f"Segment {path!r} is corrupted at offset {offset}")
+
+            # a torn write at the end of the log
+            with open(path, "r+b") as file:
+                file.truncate(offset)
+
+    def _delete_before(self, segment: int) -> None:
+        for name in os.listdir(self._directory):
+            match: re.Match[str] | None = \
+                _SNAPSHOT.fullmatch(name) or _SEGMENT.fullmatch(name)
+
+            if match is not None and int(match.group(1)) < segment:
+                os.remove(os.path.join(self._directory, name))
+
+    def _numbers(self, pattern: re.Pattern[str]) -> list[int]:
+        """
+        Return the sorted numbers of the snapshots or segments.
+        """
+
+        numbers: list[int] = []
+
+        for name in os.listdir(self._directory):
+            match: re.Match[str] | None = pattern.fullmatch(name)
+
+            if match is not None:
+                numbers.append(int(match.group(1)))
+
+        return sorted(numbers)
+
+    def _path(self, kind: str, number: int) -> str:
+        name: str = f"wal-{number:08d}.log" if kind == "wal" \
+            else f"snapshot-{number:08d}"
+
+        return os.path.join(self._directory, name)
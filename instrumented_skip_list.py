@@ -0,0 +1,233 @@
+from __future__ import annotations
+from typing import Any, NamedTuple, cast
+from skip_list import T, SkipList
+
+class SkipListStats(NamedTuple):
+    """
+    Counters of an InstrumentedSkipList since its creation or its last
+    reset_stats(), along with the current tower heights.
+    """
+
+    inserts: int
+    removes: int
+    retrieves: int
+    # insert() calls finding the value already there
+    duplicate_inserts: int
+    # searches for a value, from the head or from a finger
+    descents: int
+    # comparisons of the sought value during descents
+    comparisons: int
+    # comparisons finding the sought value greater, which is the number
+    # of links followed to the right by descents from the head (finger
+    # searches also make a few such comparisons before climbing)
+    hops: int
+    # number of towers of each height, 0 to current_level
+    level_histogram: tuple[int, ...]
+    # the same for towers following the geometric distribution
+    expected_level_histogram: tuple[float, ...]
+
+    @property
+    def comparisons_per_descent(self) -> float:
+        return self.comparisons / self.descents if self.descents else 0.0
+
+    @property
+    def hops_per_descent(self) -> float:
+        return self.hops / self.descents if self.descents else 0.0
+
+class _Probe:
+    """
+    Stands for a sought value during a descent, counting the
+    comparisons made against it on behalf of an InstrumentedSkipList.
+    Only ever compared, never stored in a node.
+    """
+
+    __slots__ = ("value", "skip_list")
+
+    value: Any
+    skip_list: InstrumentedSkipList[Any]
+
+    def __init__(self,
+                 value: Any,
+                 skip_list: InstrumentedSkipList[Any]) -> None:
+        self.value = value
+        self.skip_list = skip_list
+
+    def __gt__(self, other: Any) -> bool:
+        self.skip_list._comparisons += 1
+        greater: bool = self.value > other
+
+        # a descent moves right past every lower value
+        if greater:
+            self.skip_list._hops += 1
+
+        return greater
+
+    def __lt__(self, other: Any) -> bool:
+        self.skip_list._comparisons += 1
+
+        return cast(bool, self.value < other)
+
+    def __ge__(self, other: Any) -> bool:
+        self.skip_list._comparisons += 1
+
+        return cast(bool, self.value >= other)
+
+    def __le__(self, other: Any) -> bool:
+        self.skip_list._comparisons += 1
+
+        return cast(bool, self.value <= other)
+
+    def __eq__(self, other: Any) -> bool:
+        self.skip_list._comparisons += 1
+
+        return cast(bool, self.value == other)
+
+    def __ne__(self, other: Any) -> bool:
+        self.skip_list._comparisons += 1
+
+        return cast(bool, self.value != other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+class InstrumentedSkipList(SkipList[T]):
+    """
+    A SkipList counting its operations, and the comparisons and link
+    hops of every descent, reported by stats() along with a histogram
+    of tower heights to check against the expected distribution.
+
+    Counting lives in this subclass only, so that SkipList itself pays
+    nothing for it. Batch operations are counted as descents, but not
+    as inserts, removes or retrieves, and so are the descents of
+    positional and rank lookups (index, bisect, count_range, quantile).
+    """
+
+    __slots__ = ("_inserts", "_removes", "_retrieves",
+                 "_duplicate_inserts", "_descents", "_comparisons", "_hops")
+
+    _inserts: int
+    _removes: int
+    _retrieves: int
+    _duplicate_inserts: int
+    _descents: int
+    _comparisons: int
+    _hops: int
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.reset_stats()
+
+    def insert(self, value: T) -> bool:
+        self._inserts += 1
+        inserted: bool = super().insert(value)
+
+        if not inserted:
+            self._duplicate_inserts += 1
+
+        return inserted
+
+    def remove(self, value: T) -> bool:
+        self._removes += 1
+
+        return super().remove(value)
+
+    def retrieve(self, value: T) -> bool:
+        self._retrieves += 1
+        self._descents += 1
+
+        return super().retrieve(cast(T, _Probe(value, self)))
+
+    def stats(self) -> SkipListStats:
+        """
+        Return a snapshot of the counters, walking level 0 in O(n)
+        to build the histogram of tower heights.
+        """
+
+        histogram: list[int] = [0] * (self.current_level + 1)
+        node: SkipList.Node | None = self._head.forward[0]
+
+        while node is not None:
+            histogram[node.current_level] += 1
+            node = node.forward[0]
+
+        p: float = self._p
+        expected: list[float] = [
+            self._size * (p ** level if level == self._level_cap
+                          else (1 - p) * p ** level)
+            for level in range(self.current_level + 1)]
+
+        return SkipListStats(
+            inserts=self._inserts,
+            removes=self._removes,
+            retrieves=self._retrieves,
+            duplicate_inserts=self._duplicate_inserts,
+            descents=self._descents,
+            comparisons=self._comparisons,
+            hops=self._hops,
+            level_histogram=tuple(histogram),
+            expected_level_histogram=tuple(expected))
+
+    def reset_stats(self) -> None:
+        self._inserts = 0
+        self._removes = 0
+        self._retrieves = 0
+        self._duplicate_inserts = 0
+        self._descents = 0
+        self._comparisons = 0
+        self._hops = 0
+
+    def _last_before(self,
+                     value: T,
+                     inclusive: bool = False) -> SkipList.Node:
+        self._descents += 1
+
+        return super()._last_before(cast(T, _Probe(value, self)), inclusive)
+
+    def _find_update(
+            self,
+            value: T,
+            ranked: bool = False,
+            inclusive: bool = False
+    ) -> tuple[list[SkipList.Node], list[int] | None]:
+        self._descents += 1
+
+        return super()._find_update(
+            cast(T, _Probe(value, self)), ranked, inclusive)
+
+    def _seek(self,
+              value: T,
+              update: list[SkipList.Node],
+              ranks: list[int] | None) -> None:
+        self._descents += 1
+        super()._seek(cast(T, _Probe(value, self)), update, ranks)
+
+    def _rank_before(self,
+                     value: T,
+                     inclusive: bool = False) -> tuple[SkipList.Node, int]:
+        self._descents += 1
+
+        return super()._rank_before(cast(T, _Probe(value, self)), inclusive)
+
+    def _node_at(self, index: int) -> tuple[SkipList.Node, int]:
+        """
+        Same as SkipList._node_at(), counting its hops. Positional
+        descents follow widths, so they compare no values.
+        """
+
+        self._descents += 1
+        current_node: SkipList.Node = self._head
+        position: int = 0
+        next_node: SkipList.Node | None
+
+        for level in range(self._head.current_level, -1, -1):
+            width: list[int] = cast(list[int], current_node.width)
+            next_node = current_node.forward[level]
+
+            while next_node is not None and \
+                    position + width[level] <= index:
+                self._hops += 1
+                position += width[level]
+                current_node = next_node
+                width = cast(list[int], current_node.width)
+                next_node = current_node.forward[level]
+
+        return cast(SkipList.Node, current_node.forward[0]), position
@@ -0,0 +1,371 @@
+from __future__ import annotations
+from typing import Any, Generic, Final, Iterable, Iterator, Self, cast
+from skip_map import K, V, SkipMap
+import heapq
+import mmap
+import os
+import pickle
+import re
+import struct
+import zlib
+
+# magic, number of records, offset of the record offsets, then
+# the crc32 of everything before the footer
+_FOOTER: Final[struct.Struct] = struct.Struct("<8sQQI")
+_OFFSET: Final[struct.Struct] = struct.Struct("<Q")
+RUN_MAGIC: Final[bytes] = b"SKIPRUN1"
+_RUN: Final[re.Pattern[str]] = re.compile(r"run-(\d{8})\.run")
+
+# marks a deleted key in memtables, written as a record
+# holding the key alone in sorted runs
+_TOMBSTONE: Any = object()
+_MISSING: Any = object()
+
+class SortedRun:
+    """
+    An immutable file of records sorted by key, as written from a
+    frozen memtable: (key, value) for a mapped key, (key,) for a
+    deleted one.
+
+    Records are pickled one after another, followed by the offset of
+    each record then a footer holding their count and a checksum.
+    The file is memory-mapped, a lookup unpickling O(log n) records.
+
+    Records are unpickled: only open trusted files.
+    """
+
+    __slots__ = ("_path", "_file", "_mmap", "_size", "_offsets")
+
+    _path: Final[str]
+    _file: Any
+    _mmap: mmap.mmap
+    _size: int
+    # position of the record offsets in the file
+    _offsets: int
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = os.fspath(path)
+        self._file = open(self._path, "rb")
+
+        try:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        if len(self._mmap) < _FOOTER.size:
+            self.close()
+            raise ValueError(f"File {self._path!r} is not a sorted run")
+
+        footer_offset: int = len(self._mmap) - _FOOTER.size
+        magic, self._size, self._offsets, crc = \
+            _FOOTER.unpack_from(self._mmap, footer_offset)
+
+        with memoryview(self._mmap) as view:
+            valid: bool = zlib.crc32(view[:footer_offset]) == crc
+
+        if magic != RUN_MAGIC or not valid or \
+                self._offsets + _OFFSET.size * (self._size + 1) \
+                != footer_offset:
+            self.close()
+            raise ValueError(f"Sorted run {self._path!r} is corrupted")
+
+    @classmethod
+    def write(cls,
+              path: str | os.PathLike[str],
+              records: Iterable[tuple[Any, ...]]) -> Self:
+        """
+        Stream records, sorted by key, to a new run file and open it.
+        The file is written aside then renamed over 'path'.
+        """
+
+        temporary_path: str = os.fspath(path) + ".tmp"
+        offsets: list[int] = [0]
+        crc: int = 0
+
+        with open(temporary_path, "wb") as file:
+            for record in records:
+                data: bytes = pickle.dumps(record)
+                crc = zlib.crc32(data, crc)
+                file.write(data)
+                offsets.append(offsets[-1] + len(data))
+
+            for offset in offsets:
+                data = _OFFSET.pack(offset)
+                crc = zlib.crc32(data, crc)
+                file.write(data)
+
+            file.write(_FOOTER.pack(
+                RUN_MAGIC, len(offsets) - 1, offsets[-1], crc))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+
+        return cls(path)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        for index in range(self._size):
+            yield self._record(index)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def find(self, key: Any) -> tuple[Any, ...] | None:
+        """
+        Return the record of 'key', or None if it has none.
+        """
+
+        lo: int = 0
+        hi: int = self._size
+
+        while lo < hi:
+            middle: int = (lo + hi) // 2
+
+            if self._record(middle)[0] < key:
+                lo = middle + 1
+            else:
+                hi = middle
+
+        if lo < self._size:
+            record: tuple[Any, ...] = self._record(lo)
+
+            if record[0] == key:
+                return record
+
+        return None
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def _record(self, index: int) -> tuple[Any, ...]:
+        start: int
+        end: int
+        start, = _OFFSET.unpack_from(
+            self._mmap, self._offsets + _OFFSET.size * index)
+        end, = _OFFSET.unpack_from(
+            self._mmap, self._offsets + _OFFSET.size * (index + 1))
+
+        return cast(tuple[Any, ...], pickle.loads(self._mmap[start:end]))
+
+class Memtable(Generic[K, V]):
+    """
+    The write side of a log-structured merge tree: key to value
+    writes go to an active SkipMap, which is frozen and replaced by a
+    new one once it holds 'threshold' keys. Frozen SkipMaps are then
+    flushed to sorted run files in 'directory', up to 'max_frozen'
+    of them being kept in memory meanwhile.
+
+    Deleting a key writes a tombstone hiding its older values. Reads
+    look through the active SkipMap, then frozen ones and runs from
+    the newest to the oldest, the first entry found for a key being
+    the current one.
+
+    Keyword arguments are forwarded to the SkipMap constructor, except
+    'key' and 'reverse': sorted runs keep keys in their natural order.
+    """
+
+    __slots__ = ("_directory", "_threshold", "_max_frozen", "_kwargs",
+                 "_active", "_frozen", "_runs", "_next_run")
+
+    _directory: Final[str]
+    _threshold: Final[int]
+    _max_frozen: Final[int]
+    _kwargs: Final[dict[str, Any]]
+    _active: SkipMap[K, Any]
+    # newest first, like _runs
+    _frozen: list[SkipMap[K, Any]]
+    _runs: list[SortedRun]
+    _next_run: int
+
+    def __init__(self,
+                 directory: str | os.PathLike[str],
+                 threshold: int = 4096,
+                 max_frozen: int = 1,
+                 **kwargs: Any) -> None:
+        if threshold < 1:
+            raise ValueError(
+                f"Invalid threshold value: {threshold}. "
+                "Parameter 'threshold' must be greater than 0.")
+
+        if max_frozen < 0:
+            raise ValueError(
+                f"Invalid max_frozen value: {max_frozen}. "
+                "Parameter 'max_frozen' must be greater than or equal to 0.")
+
+        if "key" in kwargs or "reverse" in kwargs:
+            raise TypeError(
+                "Memtable keys are ordered like sorted runs, "
+                "'key' and 'reverse' are not supported.")
+
+        self._directory = os.fspath(directory)
+        self._threshold = threshold
+        self._max_frozen = max_frozen
+        self._kwargs = kwargs
+        self._active = SkipMap[K, Any](**kwargs)
+        self._frozen = []
+        os.makedirs(self._directory, exist_ok=True)
+
+        # runs left by a previous memtable remain readable
+        numbers: list[int] = sorted(
+            int(match.group(1)) for match in
+            map(_RUN.fullmatch, os.listdir(self._directory))
+            if match is not None)
+        self._runs = [SortedRun(self._run_path(number))
+                      for number in reversed(numbers)]
+        self._next_run = numbers[-1] + 1 if numbers else 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key: K) -> V:
+        value: Any = self.get(key, _MISSING)
+
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return cast(V, value)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._active[key] = value
+        self._check_threshold()
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Delete 'key' by writing a tombstone, without checking
+        whether it was there.
+        """
+
+        self._active[key] = _TOMBSTONE
+        self._check_threshold()
+
+    def __iter__(self) -> Iterator[K]:
+        for key, _ in self.items():
+            yield key
+
+    @property
+    def active(self) -> SkipMap[K, Any]:
+        return self._active
+
+    @property
+    def frozen(self) -> tuple[SkipMap[K, Any], ...]:
+        return tuple(self._frozen)
+
+    @property
+    def runs(self) -> tuple[SortedRun, ...]:
+        return tuple(self._runs)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        for skip_map in [self._active, *self._frozen]:
+            value: Any = skip_map.get(key, _MISSING)
+
+            if value is not _MISSING:
+                return default if value is _TOMBSTONE else cast(V, value)
+
+        for run in self._runs:
+            record: tuple[Any, ...] | None = run.find(key)
+
+            if record is not None:
+                return default if len(record) == 1 else cast(V, record[1])
+
+        return default
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Iterate over the current (key, value) pairs in key order,
+        merging every SkipMap and run.
+        """
+
+        sources: list[Iterator[tuple[Any, int, Any]]] = []
+
+        for age, skip_map in enumerate([self._active, *self._frozen]):
+            sources.append(
+                (key, age, value) for key, value in skip_map.items())
+
+        for age, run in enumerate(self._runs, len(sources)):
+            sources.append(
+                (record[0], age, _TOMBSTONE if len(record) == 1
+                 else record[1]) for record in run)
+
+        last: Any = _MISSING
+
+        # entries of a key come newest first, the others being stale
+        for key, _, value in heapq.merge(
+                *sources, key=lambda entry: (entry[0], entry[1])):
+            if last is not _MISSING and key == last:
+                continue
+
+            last = key
+
+            if value is not _TOMBSTONE:
+                yield key, value
+
+    def freeze(self) -> None:
+        """
+        Freeze the active SkipMap unless empty, replacing it with a new
+        one, then flush the oldest frozen ones beyond 'max_frozen'.
+        """
+
+        if self._active:
+            self._active.freeze()
+            self._frozen.insert(0, self._active)
+            self._active = SkipMap[K, Any](**self._kwargs)
+
+        while len(self._frozen) > self._max_frozen:
+            self._flush_oldest()
+
+    def flush(self) -> None:
+        """
+        Freeze the active SkipMap and flush every frozen one to runs.
+        """
+
+        self.freeze()
+
+        while self._frozen:
+            self._flush_oldest()
+
+    def close(self) -> None:
+        """
+        Close the runs. Unflushed writes are lost, flush() first
+        to keep them.
+        """
+
+        for run in self._runs:
+            run.close()
+
+        self._runs = []
+
+    def _check_threshold(self) -> None:
+        if len(self._active) >= self._threshold:
+            self.freeze()
+
+    def _flush_oldest(self) -> None:
+        skip_map: SkipMap[K, Any] = self._frozen[-1]
+        path: str = self._run_path(self._next_run)
+        self._runs.insert(0, SortedRun.write(path, _records(skip_map)))
+        self._next_run += 1
+        # readable from the run from now on
+        self._frozen.pop()
+
+    def _run_path(self, number: int) -> str:
+        return os.path.join(self._directory, f"run-{number:08d}.run")
+
+def _records(skip_map: SkipMap[Any, Any]) -> Iterator[tuple[Any, ...]]:
+    """
+    Stream the records of a frozen SkipMap in key order.
+    """
+
+    for key, value in skip_map.items():
+        yield (key,) if value is _TOMBSTONE else (key, value)
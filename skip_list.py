@@ -1,5 +1,14 @@
 from __future__ import annotations
-from typing import Protocol, Any, TypeVar, Generic, Self, Final, Iterator, cast
+from typing import Protocol, Any, TypeVar, Generic, Self, Final, Callable, \
+    ClassVar, Iterable, Iterator, Literal, cast, overload
+from snapshot import NO_ITEMS, Snapshot, write_snapshot
+from array import array
+from fractions import Fraction
+import heapq
+import importlib
+import itertools
+import math
+import os
 import random
 
 # defines a type bound, so skip list node values
@@ -14,6 +23,54 @@ class Comparable(Protocol):
 
 T = TypeVar("T", bound=Comparable)
 
+# marks a missing argument, since None is a valid one
+_MISSING: Any = object()
+
+def _import_numpy() -> Any:
+    """
+    Import NumPy, an optional dependency only needed for array lookups.
+    """
+
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as error:
+        raise ImportError(
+            "NumPy is required for array lookups: pip install numpy") from error
+
+class _Reversed:
+    """
+    Holds the key of a value in a SkipList created with 'reverse',
+    comparing the other way round.
+    """
+
+    __slots__ = ("value",)
+
+    value: Any
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: _Reversed) -> bool:
+        return cast(bool, other.value < self.value)
+
+    def __gt__(self, other: _Reversed) -> bool:
+        return cast(bool, other.value > self.value)
+
+    def __le__(self, other: _Reversed) -> bool:
+        return cast(bool, other.value <= self.value)
+
+    def __ge__(self, other: _Reversed) -> bool:
+        return cast(bool, other.value >= self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Reversed) and \
+            cast(bool, other.value == self.value)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
 class SkipList(Generic[T]):
     """
     A probabilistic ordered data structure supporting fast search,
@@ -25,30 +82,252 @@ class SkipList(Generic[T]):
 
     class Node:
         """
-        A node in the SkipList, holding a value and
-        forward pointers across multiple levels.
+        A node in the SkipList, holding a value and its key, forward
+        pointers across multiple levels and a backward pointer on level 0.
         """
 
-        __slots__ = ("value", "current_level", "forward")
+        __slots__ = ("value", "key", "current_level", "forward",
+                     "backward", "width")
 
+        # what descents compare, computed once at insertion,
+        # the value itself unless the SkipList has a key function
+        key: Any
         current_level: int
         forward: list[Self | None]
-
-        def __init__(self, value: T | None, max_level: int) -> None:
+        # the previous node on level 0, None for the first one
+        backward: Self | None
+        width: list[int] | None
+
+        def __init__(self,
+                     value: T | None,
+                     level: int,
+                     indexed: bool = False) -> None:
             self.value: T | None = value
+            self.key = value
             self.current_level = -1
-            self.forward = [None] * (max_level + 1)
+            # a node only needs one forward slot per level of its
+            # own tower, the head being the only one sized to max_level
+            self.forward = [None] * (level + 1)
+            self.backward = None
+            # in indexed mode, width[level] is the number of level 0
+            # links skipped by forward[level], the end of the list
+            # standing one position past the last node
+            self.width = [0] * (level + 1) if indexed else None
+
+    class Cursor:
+        """
+        A position in a SkipList remembering the predecessors of its
+        current node on every level, so that moving to a nearby value
+        costs O(log d) for a distance d instead of a descent from the
+        head. The current node is the first one holding a value greater
+        than or equal to the last sought value, or the end of the list.
+
+        Modifying the SkipList other than through the cursor makes it
+        search its position again from the head on next use, moving to
+        the first value greater than its previous predecessor.
+        """
+
+        __slots__ = ("_skip_list", "_update", "_ranks", "_version")
+
+        _skip_list: SkipList[Any]
+        _update: list[SkipList.Node]
+        _ranks: list[int] | None
+        _version: int
+
+        def __init__(self, skip_list: SkipList[Any]) -> None:
+            self._skip_list = skip_list
+            self._update, self._ranks = \
+                skip_list._start_finger(skip_list._indexed)
+            self._version = skip_list._version
+
+        @property
+        def value(self) -> Any:
+            """
+            The value of the current node, None at the end of the list.
+            """
+
+            self._sync()
+            node: SkipList.Node | None = self._update[0].forward[0]
+
+            return None if node is None else node.value
+
+        def seek(self, key: Any) -> bool:
+            """
+            Move to the first value whose key is greater than or equal
+            to 'key', telling whether it is equal.
+            """
+
+            self._sync()
+
+            return self._seek(self._skip_list._search_key(key))
+
+        def next(self) -> Any:
+            """
+            Move to the following value and return it, None when
+            moving to (or staying at) the end of the list.
+            """
+
+            self._sync()
+
+            return self._advance()
+
+        def prev(self) -> Any:
+            """
+            Move to the preceding value and return it, or return None
+            without moving when standing on the first value.
+            """
+
+            self._sync()
+            node: SkipList.Node = self._update[0]
+
+            if node is self._skip_list._head:
+                return None
+
+            self._skip_list._seek(node.key, self._update, self._ranks)
+
+            return node.value
+
+        def insert_here(self, value: Any) -> bool:
+            """
+            Insert 'value' from the current position, which moves to it.
+            Return False if it was already there.
+            """
+
+            key: Any = self._skip_list._key_of(value)
+            self._sync()
+
+            if self._seek(key):
+                return False
+
+            self._skip_list._link(value, self._update, self._ranks, key)
+            # the new tower may have raised the SkipList's levels
+            self._skip_list._fit_finger(self._update, self._ranks)
+            self._version = self._skip_list._version
+
+            return True
+
+        def remove_current(self) -> Any:
+            """
+            Remove and return the current value, moving to the
+            following one.
+            """
+
+            self._sync()
+            node: SkipList.Node | None = self._update[0].forward[0]
+
+            if node is None:
+                raise ValueError("Cursor is at the end of the SkipList.")
+
+            self._skip_list._unlink(node, self._update)
+            self._version = self._skip_list._version
+
+            return node.value
+
+        def _sync(self) -> None:
+            """
+            Search the current position again from the head if the
+            SkipList was modified behind the cursor's back, since the
+            remembered nodes may have been removed since.
+            """
+
+            skip_list: SkipList[Any] = self._skip_list
+
+            if self._version == skip_list._version:
+                return
+
+            prev: SkipList.Node = self._update[0]
+            self._update, self._ranks = \
+                skip_list._start_finger(skip_list._indexed)
+            self._version = skip_list._version
+
+            if prev is skip_list._head:
+                return
+
+            skip_list._seek(prev.key, self._update, self._ranks)
+            node: SkipList.Node | None = self._update[0].forward[0]
+
+            if node is not None and prev.key == node.key:
+                self._advance()
+
+        def _seek(self, key: Any) -> bool:
+            self._skip_list._seek(key, self._update, self._ranks)
+            node: SkipList.Node | None = self._update[0].forward[0]
+
+            return node is not None and key == node.key
+
+        def _advance(self) -> Any:
+            node: SkipList.Node | None = self._update[0].forward[0]
+
+            if node is None:
+                return None
+
+            # the current node becomes the predecessor on its own levels
+            for level in range(node.current_level + 1):
+                self._update[level] = node
+
+            if self._ranks is not None:
+                rank: int = self._ranks[0] + 1
+
+                for level in range(node.current_level + 1):
+                    self._ranks[level] = rank
+
+            next_node: SkipList.Node | None = node.forward[0]
+
+            return None if next_node is None else next_node.value
 
-    __slots__ = ("_p", "_max_level", "_size", "_head")
+    __slots__ = ("_p", "_max_level", "_indexed", "_adaptive", "_level_cap",
+                 "_grow_at", "_key", "_reverse", "_keyed", "_rng", "_size",
+                 "_version", "_frozen", "_head", "_tail", "_snapshot",
+                 "_snapshot_version")
 
+    # the kind of per-node items save() writes, see _node_item()
+    _ITEMS_KIND: ClassVar[int] = NO_ITEMS
     _p: Final[float]
     _max_level: Final[int]
+    _indexed: Final[bool]
+    _adaptive: Final[bool]
+    # highest level of new towers, max_level unless adaptive
+    _level_cap: int
+    # size from which an adaptive SkipList raises _level_cap
+    _grow_at: float
+    _key: Final[Callable[[Any], Any] | None]
+    _reverse: Final[bool]
+    # whether node keys differ from values, by _key or _reverse
+    _keyed: Final[bool]
+    # either a seeded random.Random or the random module itself
+    _rng: Final[Any]
     _size: int
+    # bumped on every modification, invalidating cursors
+    _version: int
+    # set by freeze(), rejecting modifications from then on
+    _frozen: bool
     _head: SkipList.Node
+    # the last node, None when empty
+    _tail: SkipList.Node | None
+    # NumPy array of the values as of _snapshot_version, see _values_array()
+    _snapshot: Any
+    _snapshot_version: int
 
     def __init__(self,
                  promotion_probability: float = 0.5,
-                 max_level: int = 32) -> None:
+                 max_level: int = 32,
+                 indexed: bool = False,
+                 seed: int | None = None,
+                 adaptive: bool = False,
+                 key: Callable[[Any], Any] | None = None,
+                 reverse: bool = False) -> None:
+        """
+        With 'adaptive', towers are capped near log(n) / log(1 / p) levels
+        for n values rather than at 'max_level', which remains the upper
+        bound, the head growing along. See rebalance().
+
+        Like sorted(), values are ordered by 'key' if given, computed once
+        per value when inserted and kept in its node, and from the
+        greatest to the lowest with 'reverse'. Values of equal keys count
+        as the same. Like bisect, lookups then take keys rather than
+        values, and 'lo' and 'hi' bounds follow the SkipList order.
+        """
+
         if promotion_probability < 0 or promotion_probability > 1:
             raise ValueError(
                 f"Invalid promotion probability value: {promotion_probability}. "
@@ -63,8 +342,177 @@ class SkipList(Generic[T]):
                 "Parameter 'max_level' must be greater than or equal to 0.")
 
         self._max_level = max_level
+        self._indexed = indexed
+        self._adaptive = adaptive
+        self._key = key
+        self._reverse = reverse
+        self._keyed = key is not None or reverse
+        self._rng = random if seed is None else random.Random(seed)
         self._size = 0
-        self._head = SkipList.Node(None, self._max_level)
+        self._version = 0
+        self._frozen = False
+
+        if adaptive:
+            self._head = SkipList.Node(None, 0, indexed)
+            self._fit_level_cap()
+        else:
+            self._head = SkipList.Node(None, max_level, indexed)
+            self._level_cap = max_level
+            self._grow_at = float("inf")
+
+        self._tail = None
+        self._snapshot = None
+        self._snapshot_version = -1
+
+    @classmethod
+    def from_sorted(cls, iterable: Iterable[T], **kwargs: Any) -> Self:
+        """
+        Build a SkipList from values given in ascending order, in linear
+        time. Towers are threaded in a single left-to-right pass, each new
+        node being linked after the last node seen on each of its levels.
+        Consecutive equal values are only inserted once.
+
+        Keyword arguments are forwarded to the constructor.
+        """
+
+        return cls._build(iterable, None, **kwargs)
+
+    @classmethod
+    def _build(cls,
+               iterable: Iterable[T],
+               heights: Iterable[int] | None,
+               **kwargs: Any) -> Self:
+        """
+        Thread the towers of from_sorted(), drawing their levels at
+        random or taking them from 'heights' if given.
+        """
+
+        skip_list: Self = cls(**kwargs)
+        head: SkipList.Node = skip_list._head
+        levels: Iterator[int] | None = \
+            None if heights is None else iter(heights)
+        indexed: bool = skip_list._indexed
+        last: list[SkipList.Node] = [head] * len(head.forward)
+        last_rank: list[int] = [0] * len(head.forward)
+        size: int = 0
+        level: int
+
+        keyed: bool = skip_list._keyed
+
+        for value in iterable:
+            key: Any = skip_list._key_of(value) if keyed else value
+
+            if size > 0:
+                previous: Any = last[0].key
+
+                if key == previous:
+                    continue
+                elif not key > previous:
+                    raise ValueError(
+                        f"Value {value!r} is lower than its predecessor "
+                        f"{last[0].value!r}: iterable must be sorted.")
+
+            if levels is None:
+                if size >= skip_list._grow_at:
+                    skip_list._size = size
+                    skip_list._fit_level_cap()
+
+                new_level: int = skip_list._random_level()
+            else:
+                new_level = next(levels)
+
+            if new_level >= len(last):
+                skip_list._grow_head(new_level)
+                last_rank += [0] * (len(head.forward) - len(last))
+                last += [head] * (len(head.forward) - len(last))
+
+            new_node: SkipList.Node = \
+                cls.Node(value, new_level, indexed)
+            new_node.key = key
+            new_node.current_level = new_level
+            size += 1
+
+            if size > 1:
+                new_node.backward = last[0]
+
+            for level in range(new_level + 1):
+                last[level].forward[level] = new_node
+
+                if indexed:
+                    cast(list[int], last[level].width)[level] = \
+                        size - last_rank[level]
+                    last_rank[level] = size
+
+                last[level] = new_node
+
+            if new_level > head.current_level:
+                head.current_level = new_level
+
+        if indexed:
+            # links of the last tower of each level reach the end
+            for level in range(head.current_level + 1):
+                cast(list[int], last[level].width)[level] = \
+                    size + 1 - last_rank[level]
+
+        skip_list._size = size
+        skip_list._tail = None if size == 0 else last[0]
+
+        if skip_list._adaptive:
+            skip_list._fit_level_cap()
+
+        return skip_list
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T], **kwargs: Any) -> Self:
+        """
+        Build a SkipList from values in any order, sorting them
+        first and dropping duplicates, in O(n log n) comparisons
+        but a single linear construction pass.
+
+        Keyword arguments are forwarded to the constructor.
+        """
+
+        return cls.from_sorted(
+            sorted(iterable, key=kwargs.get("key"),
+                   reverse=kwargs.get("reverse", False)),
+            **kwargs)
+
+    @classmethod
+    def load(cls,
+             path: str | os.PathLike[str],
+             mmap: bool = False,
+             **kwargs: Any) -> Self:
+        """
+        Rebuild a SkipList saved by save() in linear time, with the same
+        parameters and towers. With 'mmap' the file is memory-mapped
+        rather than read into memory first. To serve read-only lookups
+        straight from the file instead, open it as a snapshot.Snapshot.
+
+        Other keyword arguments are forwarded to the constructor. The
+        file records whether the SkipList was created with 'reverse',
+        but not its key function, which must be given again as 'key'.
+        """
+
+        with Snapshot(path, mmap) as snapshot:
+            if snapshot.keyed and kwargs.get("key") is None:
+                raise ValueError(
+                    f"Snapshot {os.fspath(path)!r} was saved from a "
+                    "SkipList with a key function, pass it as 'key'.")
+            elif kwargs.setdefault("reverse", snapshot.reverse) \
+                    != snapshot.reverse:
+                raise ValueError(
+                    f"Snapshot {os.fspath(path)!r} was saved with "
+                    f"reverse={snapshot.reverse}.")
+
+            skip_list: Self = cls._build(
+                snapshot, snapshot.heights,
+                promotion_probability=snapshot.promotion_probability,
+                max_level=snapshot.max_level,
+                indexed=snapshot.indexed,
+                **kwargs)
+            skip_list._restore_items(snapshot.items, snapshot.items_kind, path)
+
+            return skip_list
 
     def __len__(self) -> int:
         return self._size
@@ -87,6 +535,71 @@ class SkipList(Generic[T]):
             yield cast(T, current_node.value)
             current_node = current_node.forward[level]
 
+    def irange(self,
+               lo: T | None = None,
+               hi: T | None = None,
+               inclusive: tuple[bool, bool] = (True, False),
+               reverse: bool = False) -> Iterator[T]:
+        """
+        Iterate lazily over the values between 'lo' and 'hi', a missing
+        bound leaving that side open. 'inclusive' tells whether each
+        bound belongs to the range, [lo, hi) by default.
+
+        The first value is reached in O(log n) by a top-down descent,
+        the next ones by following level 0.
+        """
+
+        for node in self._irange_nodes(
+                None if lo is None else self._search_key(lo),
+                None if hi is None else self._search_key(hi),
+                inclusive, reverse):
+            yield cast(T, node.value)
+
+    def _irange_nodes(self,
+                      lo: T | None,
+                      hi: T | None,
+                      inclusive: tuple[bool, bool],
+                      reverse: bool) -> Iterator[SkipList.Node]:
+        """
+        Iterate over the nodes irange() yields the values of.
+        """
+
+        current_node: SkipList.Node | None
+
+        if reverse:
+            if hi is None:
+                current_node = self._tail
+            else:
+                current_node = self._last_before(hi, inclusive[1])
+
+                if current_node is self._head:
+                    return
+
+            while current_node is not None:
+                if lo is not None:
+                    if current_node.key < lo or \
+                            (current_node.key == lo and not inclusive[0]):
+                        break
+
+                yield current_node
+                current_node = current_node.backward
+
+            return
+
+        if lo is None:
+            current_node = self._head.forward[0]
+        else:
+            current_node = self._last_before(lo, not inclusive[0]).forward[0]
+
+        while current_node is not None:
+            if hi is not None:
+                if current_node.key > hi or \
+                        (current_node.key == hi and not inclusive[1]):
+                    break
+
+            yield current_node
+            current_node = current_node.forward[0]
+
     @property
     def promotion_probability(self) -> float:
         return self._p
@@ -99,164 +612,1473 @@ class SkipList(Generic[T]):
     def size(self) -> int:
         return self._size
 
+    @property
+    def adaptive(self) -> bool:
+        return self._adaptive
+
+    @property
+    def level_cap(self) -> int:
+        """
+        The highest level of new towers.
+        """
+
+        return self._level_cap
+
     @property
     def current_level(self) -> int:
         return self._head.current_level
 
+    @property
+    def indexed(self) -> bool:
+        return self._indexed
+
+    @property
+    def reverse(self) -> bool:
+        return self._reverse
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self) -> None:
+        """
+        Make the SkipList read-only, any further modification
+        raising ValueError. A frozen SkipList cannot be thawed.
+        """
+
+        self._frozen = True
+
     def insert(self, value: T) -> bool:
-        new_node: SkipList.Node
-        level: int
+        self._check_frozen()
+        key: Any = self._key_of(value) if self._keyed else value
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        update, ranks = self._find_update(key, self._indexed)
+        next_node: SkipList.Node | None = update[0].forward[0]
+
+        if next_node is not None and key == next_node.key:
+            return False
+
+        self._link(value, update, ranks, key)
+
+        return True
+
+    def remove(self, value: T) -> bool:
+        """
+        Remove the value of key 'value', telling whether it was there.
+        """
+
+        self._check_frozen()
 
-        # only to add first element
         if self._head.forward[0] is None:
-            new_node = SkipList.Node(value, self._max_level)
+            return False
+
+        key: Any = _Reversed(value) if self._reverse else value
+        update: list[SkipList.Node]
+        update, _ = self._find_update(key)
+        next_node: SkipList.Node | None = update[0].forward[0]
+
+        if next_node is None or key != next_node.key:
+            return False
+
+        self._unlink(next_node, update)
+
+        return True
 
-            for level in range(self._random_level() + 1):
-                new_node.current_level = level
-                self._head.current_level = level
-                self._head.forward[level] = new_node
+    def remove_range(self,
+                     lo: T | None = None,
+                     hi: T | None = None,
+                     inclusive: tuple[bool, bool] = (True, False)) -> int:
+        """
+        Remove the values irange() would yield, returning how many.
+
+        Both ends of the range are found by a single descent each, then
+        each level is spliced once around the whole span, in O(log n + k)
+        for k values removed, O(log n) when indexed.
+        """
+
+        self._check_frozen()
+
+        if lo is not None:
+            lo = self._search_key(lo)
+
+        if hi is not None:
+            hi = self._search_key(hi)
+
+        if self._size == 0 or (lo is not None and hi is not None and (
+                lo > hi or (lo == hi and not all(inclusive)))):
+            return 0
+
+        before: list[SkipList.Node]
+        before_ranks: list[int] | None
+        last: list[SkipList.Node]
+        last_ranks: list[int] | None
+
+        if lo is None:
+            before, before_ranks = self._start_finger(self._indexed)
         else:
-            current_level: int = self._head.current_level
-            update: list[SkipList.Node | None] = \
-                [None] * (current_level + 1)
-            current_node: SkipList.Node = self._head
+            before, before_ranks = \
+                self._find_update(lo, self._indexed, not inclusive[0])
 
-            while True:
-                while True:
-                    next_node: SkipList.Node | None = \
-                        current_node.forward[current_level]
+        if hi is None:
+            last, last_ranks = self._find_last(self._indexed)
+        else:
+            last, last_ranks = \
+                self._find_update(hi, self._indexed, inclusive[1])
 
-                    if next_node is None or next_node.value is None:
-                        break
+        return self._splice(before, before_ranks, last, last_ranks)
 
-                    if value == next_node.value:
-                        return False
-                    elif value > next_node.value:
-                        current_node = next_node
-                    else:
-                        break
+    def pop_min(self) -> T:
+        """
+        Remove and return the lowest value in O(log n) on average, as
+        unlinking the first node updates every level of the head.
+        Raises IndexError if the SkipList is empty.
+        """
 
-                update[current_level] = current_node
+        if self._size == 0:
+            raise IndexError("pop from an empty SkipList")
 
-                if current_level == 0:
-                    break
+        return self.pop_min_n(1)[0]
 
-                current_level -= 1
+    def pop_max(self) -> T:
+        """
+        Remove and return the greatest value in O(log n), raising
+        IndexError if the SkipList is empty.
+        """
 
-            new_node = SkipList.Node(value, self._max_level)
+        if self._size == 0:
+            raise IndexError("pop from an empty SkipList")
 
-            for level in range(self._random_level() + 1):
-                new_node.current_level = level
+        self._check_frozen()
+        node: SkipList.Node = cast(SkipList.Node, self._tail)
+        update: list[SkipList.Node]
+        update, _ = self._find_update(node.key)
+        self._unlink(node, update)
 
-                if level >= len(update):
-                    self._head.current_level = level
-                    self._head.forward[level] = new_node
-                else:
-                    prev: SkipList.Node | None = update[level]
+        return cast(T, node.value)
 
-                    if prev is None:
-                        continue
+    def pop_min_n(self, count: int) -> list[T]:
+        """
+        Remove and return the 'count' lowest values (fewer if there are
+        not as many) in ascending order. The whole batch is spliced off
+        the head at once, in O(count + log n).
+        """
 
-                    new_node.forward[level] = prev.forward[level]
-                    prev.forward[level] = new_node
+        if count < 0:
+            raise ValueError(
+                f"Invalid count value: {count}. "
+                "Parameter 'count' must be greater than or equal to 0.")
 
-        self._size += 1
+        self._check_frozen()
+        head: SkipList.Node = self._head
+        before: list[SkipList.Node]
+        before_ranks: list[int] | None
+        before, before_ranks = self._start_finger(self._indexed)
+        last: list[SkipList.Node] = list(before)
+        last_ranks: list[int] | None = \
+            None if before_ranks is None else list(before_ranks)
+        values: list[T] = []
+        node: SkipList.Node | None = head.forward[0]
 
-        return True
+        while node is not None and len(values) < count:
+            values.append(cast(T, node.value))
 
-    def remove(self, value: T) -> bool:
-        if self._head.forward[0] is None:
-            return False
+            # the last popped node of each level it reaches so far
+            for level in range(node.current_level + 1):
+                last[level] = node
 
-        current_level: int = self._head.current_level
-        update: list[SkipList.Node | None] = \
-            [None] * (current_level + 1)
-        current_node: SkipList.Node = self._head
-        next_node: SkipList.Node | None
-        value_found: bool = False
+                if last_ranks is not None:
+                    last_ranks[level] = len(values)
 
-        while True:
-            while True:
-                next_node = current_node.forward[current_level]
+            node = node.forward[0]
 
-                if next_node is None or next_node.value is None:
-                    break
+        self._splice(before, before_ranks, last, last_ranks, len(values))
 
-                if value == next_node.value:
-                    value_found = True
-                    break
-                elif value > next_node.value:
-                    current_node = next_node
-                else:
-                    break
+        return values
 
-            update[current_level] = current_node
+    def rebalance(self) -> None:
+        """
+        Draw every tower anew and relink the nodes in place, in O(n).
+        An adaptive SkipList only ever raises its level cap as it grows,
+        so after many removals this also lowers the cap to fit the
+        current size and shrinks the head along.
+        """
 
-            if current_level == 0:
-                break
+        self._check_frozen()
+        head: SkipList.Node = self._head
+        node: SkipList.Node | None = head.forward[0]
+        indexed: bool = self._indexed
 
-            current_level -= 1
+        if self._adaptive:
+            self._fit_level_cap()
 
-        if value_found == False:
-            return False
+        head.forward = [None] * (self._level_cap + 1)
+        head.width = [0] * (self._level_cap + 1) if indexed else None
+        head.current_level = -1
+        last: list[SkipList.Node] = [head] * (self._level_cap + 1)
+        last_rank: list[int] = [0] * (self._level_cap + 1)
+        rank: int = 0
+        level: int
 
-        for level in range(self._head.current_level + 1):
-            prev: SkipList.Node | None = update[level]
+        # level 0 keeps the same order, so backward links hold
+        while node is not None:
+            next_node: SkipList.Node | None = node.forward[0]
+            new_level: int = self._random_level()
+            node.forward = [None] * (new_level + 1)
+            node.width = [0] * (new_level + 1) if indexed else None
+            node.current_level = new_level
+            rank += 1
 
-            if prev is None:
-                continue
+            for level in range(new_level + 1):
+                last[level].forward[level] = node
 
-            next_node = prev.forward[level]
+                if indexed:
+                    cast(list[int], last[level].width)[level] = \
+                        rank - last_rank[level]
+                    last_rank[level] = rank
 
-            if next_node is None or next_node.value is None:
-                continue
+                last[level] = node
 
-            if value != next_node.value:
-                break
+            if new_level > head.current_level:
+                head.current_level = new_level
 
-            prev.forward[level] = next_node.forward[level]
+            node = next_node
 
-        for level in range(self._head.current_level, -1, -1):
-            if self._head.forward[level] is None:
-                self._head.current_level -= 1
+        if indexed:
+            for level in range(head.current_level + 1):
+                cast(list[int], last[level].width)[level] = \
+                    rank + 1 - last_rank[level]
 
-        self._size -= 1
+        self._version += 1
 
-        return True
+    def cursor(self) -> SkipList.Cursor:
+        """
+        Return a cursor standing on the first value.
+        """
 
-    def retrieve(self, value: T) -> bool:
-        if self._head.forward[0] is None:
-            return False
+        return SkipList.Cursor(self)
 
-        current_level: int = self._head.current_level
-        current_node: SkipList.Node = self._head
+    def insert_many(self, values: Iterable[T]) -> int:
+        """
+        Insert every value, returning how many were not already there.
 
-        while True:
-            while True:
-                next_node: SkipList.Node | None = \
-                    current_node.forward[current_level]
+        The search resumes from the predecessors of the previous value
+        instead of the head, so batches sorted in ascending order cost
+        amortized O(1) per value when they are dense in the list.
+        """
 
-                if next_node is None or next_node.value is None:
-                    break
+        self._check_frozen()
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        update, ranks = self._start_finger(self._indexed)
+        inserted: int = 0
 
-                if value == next_node.value:
-                    return True
-                elif value > next_node.value:
-                    current_node = next_node
-                else:
-                    break
+        keyed: bool = self._keyed
 
-            if current_level == 0:
-                break
+        for value in values:
+            key: Any = self._key_of(value) if keyed else value
+            self._seek(key, update, ranks)
+            next_node: SkipList.Node | None = update[0].forward[0]
 
-            current_level -= 1
+            if next_node is None or key != next_node.key:
+                self._link(value, update, ranks, key)
+                inserted += 1
 
-        return False
+        return inserted
 
-    def _random_level(self) -> int:
-        level: int = 0
+    def remove_many(self, values: Iterable[T]) -> int:
+        """
+        Remove the value of every key, returning how many were found,
+        resuming each search from the previous one like insert_many().
+        """
 
-        while level < self._max_level and random.random() < self._p:
-            level += 1
+        self._check_frozen()
+        update: list[SkipList.Node]
+        update, _ = self._start_finger()
+        removed: int = 0
 
-        return level
+        for value in values:
+            key: Any = _Reversed(value) if self._reverse else value
+            self._seek(key, update, None)
+            next_node: SkipList.Node | None = update[0].forward[0]
+
+            if next_node is not None and key == next_node.key:
+                self._unlink(next_node, update)
+                removed += 1
+
+        return removed
+
+    def contains_many(self, values: Iterable[T]) -> list[bool]:
+        """
+        Tell for each key whether it is in the SkipList, resuming
+        each search from the previous one like insert_many().
+        """
+
+        update: list[SkipList.Node]
+        update, _ = self._start_finger()
+        found: list[bool] = []
+
+        for value in values:
+            key: Any = _Reversed(value) if self._reverse else value
+            self._seek(key, update, None)
+            next_node: SkipList.Node | None = update[0].forward[0]
+            found.append(next_node is not None and key == next_node.key)
+
+        return found
+
+    def union(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipList of the values in either SkipList, merged
+        in a single linear pass then bulk built like from_sorted().
+        """
+
+        return self._from_sorted_like(
+            heapq.merge(self.irange(), other.irange(), key=self._merge_key()))
+
+    def intersection(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipList of the values in both SkipLists. Each
+        value of the smaller one is searched in the larger one from the
+        previous search like contains_many(), galloping over the values
+        in between, for O(m log(n / m)) comparisons overall.
+        """
+
+        small: SkipList[T]
+        large: SkipList[T]
+        small, large = (self, other) if len(self) <= len(other) \
+            else (other, self)
+        values: list[T] = list(small.irange())
+
+        return self._from_sorted_like(
+            itertools.compress(values, large.contains_many(
+                values if self._key is None else map(self._key, values))))
+
+    def difference(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipList of the values not in 'other', searched
+        there like intersection() does.
+        """
+
+        values: list[T] = list(self.irange())
+        found: list[bool] = other.contains_many(
+            values if self._key is None else map(self._key, values))
+
+        return self._from_sorted_like(
+            value for value, in_other in zip(values, found) if not in_other)
+
+    def symmetric_difference(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipList of the values in exactly one SkipList,
+        merged in a single linear pass.
+        """
+
+        merge_key: Callable[[T], Any] | None = self._merge_key()
+        groups: Iterator[list[T]] = (
+            list(group) for _, group in itertools.groupby(
+                heapq.merge(self.irange(), other.irange(), key=merge_key),
+                key=merge_key))
+
+        return self._from_sorted_like(
+            group[0] for group in groups if len(group) == 1)
+
+    def __or__(self, other: SkipList[T]) -> Self:
+        return self.union(other)
+
+    def __and__(self, other: SkipList[T]) -> Self:
+        return self.intersection(other)
+
+    def __sub__(self, other: SkipList[T]) -> Self:
+        return self.difference(other)
+
+    def __xor__(self, other: SkipList[T]) -> Self:
+        return self.symmetric_difference(other)
+
+    def _from_sorted_like(self, values: Iterable[T]) -> Self:
+        """
+        Build a SkipList of the same type and parameters from values
+        given in ascending order.
+        """
+
+        return type(self).from_sorted(
+            values,
+            promotion_probability=self._p,
+            max_level=self._max_level,
+            indexed=self._indexed,
+            adaptive=self._adaptive,
+            key=self._key,
+            reverse=self._reverse)
+
+    def split_at(self, value: T) -> tuple[Self, Self]:
+        """
+        Move the values greater than or equal to 'value' to a new
+        SkipList of the same parameters, returning this SkipList, left
+        with the lower values, and the new one.
+
+        Only the links crossing the cut are re-stitched, in O(log n)
+        when indexed. Otherwise the smaller side is also counted, in
+        O(min(k, n - k)) for k lower values.
+        """
+
+        self._check_frozen()
+        right: Self = self._empty_like()
+
+        if self._size == 0:
+            return self, right
+
+        value = self._search_key(value)
+
+        head: SkipList.Node = self._head
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        update, ranks = self._find_update(value, self._indexed)
+        # number of values moving to the right
+        moved: int = self._size - ranks[0] if ranks is not None \
+            else self._count_from(update[0].forward[0])
+        left_size: int = self._size - moved
+        right._tail = self._tail if moved > 0 else None
+        right._grow_head(head.current_level)
+
+        for level in range(head.current_level + 1):
+            prev: SkipList.Node = update[level]
+            right._head.forward[level] = prev.forward[level]
+            prev.forward[level] = None
+
+            if ranks is not None:
+                prev_width: list[int] = cast(list[int], prev.width)
+                cast(list[int], right._head.width)[level] = \
+                    ranks[level] + prev_width[level] - left_size
+                prev_width[level] = left_size + 1 - ranks[level]
+
+            if right._head.forward[level] is not None:
+                right._head.current_level = level
+
+        self._link_backward(update[0], None)
+        right._link_backward(right._head, right._head.forward[0])
+
+        while head.current_level >= 0 and \
+                head.forward[head.current_level] is None:
+            head.current_level -= 1
+
+        self._size = left_size
+        right._size = moved
+        self._version += 1
+
+        if self._adaptive:
+            self._fit_level_cap()
+            right._fit_level_cap()
+
+        return self, right
+
+    def concat(self, other: SkipList[T]) -> Self:
+        """
+        Move every value of 'other', which must all be greater than the
+        values of this SkipList, after them in O(log n), leaving 'other'
+        empty. Both SkipLists must be indexed or not alike, and 'other'
+        must not be taller than this SkipList's 'max_level'.
+        """
+
+        self._check_frozen()
+        other._check_frozen()
+
+        if other._indexed != self._indexed:
+            raise ValueError(
+                "Cannot concatenate an indexed SkipList "
+                "with a non-indexed one.")
+        elif other._head.current_level > self._max_level:
+            raise ValueError(
+                f"SkipList to concatenate is too tall: level "
+                f"{other._head.current_level} (max {self._max_level})")
+
+        if other._size == 0:
+            return self
+
+        head: SkipList.Node = self._head
+        other_head: SkipList.Node = other._head
+        level: int
+        last: list[SkipList.Node]
+        ranks: list[int] | None
+        last, ranks = self._find_last(self._indexed)
+        first: SkipList.Node = cast(SkipList.Node, other_head.forward[0])
+
+        if self._size > 0 and not first.key > last[0].key:
+            raise ValueError(
+                f"Value {first.value!r} is not greater than the last "
+                f"value {last[0].value!r}: cannot concatenate.")
+
+        size: int = self._size + other._size
+        self._grow_head(other_head.current_level)
+        self._link_backward(last[0], first)
+        self._tail = other._tail
+        other._tail = None
+
+        for level in range(max(head.current_level,
+                               other_head.current_level) + 1):
+            prev: SkipList.Node = \
+                last[level] if level <= head.current_level else head
+            rank: int = ranks[level] \
+                if ranks is not None and level <= head.current_level else 0
+
+            if level <= other_head.current_level:
+                prev.forward[level] = other_head.forward[level]
+
+                if ranks is not None:
+                    cast(list[int], prev.width)[level] = self._size + \
+                        cast(list[int], other_head.width)[level] - rank
+
+                other_head.forward[level] = None
+            elif ranks is not None:
+                cast(list[int], prev.width)[level] = size + 1 - rank
+
+        head.current_level = max(head.current_level,
+                                 other_head.current_level)
+        other_head.current_level = -1
+        self._size = size
+        other._size = 0
+        self._version += 1
+        other._version += 1
+
+        if self._adaptive:
+            self._fit_level_cap()
+
+        return self
+
+    def _empty_like(self) -> Self:
+        """
+        Return an empty SkipList of the same type and parameters.
+        """
+
+        return type(self)(
+            promotion_probability=self._p,
+            max_level=self._max_level,
+            indexed=self._indexed,
+            adaptive=self._adaptive,
+            key=self._key,
+            reverse=self._reverse)
+
+    def _key_of(self, value: T) -> Any:
+        """
+        Return the key of 'value' kept in its node.
+        """
+
+        key: Any = value if self._key is None else self._key(value)
+
+        return _Reversed(key) if self._reverse else key
+
+    def _search_key(self, key: Any) -> Any:
+        """
+        Return a sought key in the form of the keys kept in nodes.
+        """
+
+        return _Reversed(key) if self._reverse else key
+
+    def _merge_key(self) -> Callable[[T], Any] | None:
+        """
+        Return the key function merging values in the SkipList order,
+        None when values are compared directly.
+        """
+
+        return self._key_of if self._keyed else None
+
+    def _count_from(self, node: SkipList.Node | None) -> int:
+        """
+        Return the number of nodes from 'node' to the end of level 0,
+        walking from both the head and 'node' so as to only walk
+        through the shorter side.
+        """
+
+        before: SkipList.Node | None = self._head.forward[0]
+        after: SkipList.Node | None = node
+        walked: int = 0
+
+        while before is not node and after is not None:
+            before = cast(SkipList.Node, before).forward[0]
+            after = after.forward[0]
+            walked += 1
+
+        # either every node before 'node' was walked, or every node after
+        return self._size - walked if before is node else walked
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the values in order, the height of their towers and the
+        SkipList parameters to a binary snapshot file, see load(). The
+        values mapped by a SkipMap or the counts of a SkipMultiset are
+        pickled along with them.
+        """
+
+        values: list[T] = []
+        heights: array[int] = array("H")
+        items: list[Any] | None = \
+            None if self._ITEMS_KIND == NO_ITEMS else []
+        node: SkipList.Node | None = self._head.forward[0]
+
+        while node is not None:
+            values.append(cast(T, node.value))
+            heights.append(node.current_level)
+
+            if items is not None:
+                items.append(self._node_item(node))
+
+            node = node.forward[0]
+
+        write_snapshot(path, values, heights,
+                       self._p, self._max_level, self._indexed,
+                       self._reverse, self._key is not None,
+                       items, self._ITEMS_KIND)
+
+    def _node_item(self, node: SkipList.Node) -> Any:
+        """
+        Return what save() writes along with the value of 'node',
+        for subclasses whose nodes hold more than a value.
+        """
+
+        return None
+
+    def _restore_items(self,
+                       items: Iterable[Any] | None,
+                       kind: int,
+                       path: str | os.PathLike[str]) -> None:
+        """
+        Set back the items saved along with the values of a snapshot,
+        which a plain SkipList ignores.
+        """
+
+    def contains_array(self, keys: Any) -> Any:
+        """
+        Tell for each key of a NumPy array whether it is in the SkipList,
+        as a boolean array of the same shape. NumPy is required.
+        """
+
+        np: Any = _import_numpy()
+        values: Any = self._values_array(np)
+        keys = np.asarray(keys)
+
+        if len(values) == 0:
+            return np.zeros(keys.shape, dtype=bool)
+
+        indices: Any = np.searchsorted(values, keys, side="left")
+        # keys past the last value are compared against it, never equal
+        matches: Any = values[np.minimum(indices, len(values) - 1)] == keys
+
+        return np.logical_and(indices < len(values), matches)
+
+    def rank_array(self, keys: Any) -> Any:
+        """
+        Return for each key of a NumPy array the number of values lower
+        than it, like bisect_left(), without requiring an indexed
+        SkipList. NumPy is required.
+        """
+
+        np: Any = _import_numpy()
+        values: Any = self._values_array(np)
+
+        if self._reverse:
+            # the array runs from the last value to the first one
+            return len(values) - \
+                np.searchsorted(values, keys, side="right")
+
+        return np.searchsorted(values, keys, side="left")
+
+    def _values_array(self, np: Any) -> Any:
+        """
+        Return an ascending NumPy array of the keys, copied from level 0
+        (backwards with 'reverse') on first use and kept until the next
+        modification.
+        """
+
+        if self._snapshot is None or self._snapshot_version != self._version:
+            keys: list[Any] = []
+            node: SkipList.Node | None = self._head.forward[0]
+
+            while node is not None:
+                keys.append(node.key)
+                node = node.forward[0]
+
+            if self._reverse:
+                keys = [key.value for key in reversed(keys)]
+
+            self._snapshot = np.array(keys)
+            self._snapshot_version = self._version
+
+        return self._snapshot
+
+    def retrieve(self, value: T) -> bool:
+        """
+        Tell whether a value of key 'value' is in the SkipList.
+        """
+
+        if self._head.forward[0] is None:
+            return False
+
+        key: Any = _Reversed(value) if self._reverse else value
+        current_level: int = self._head.current_level
+        current_node: SkipList.Node = self._head
+
+        while True:
+            while True:
+                next_node: SkipList.Node | None = \
+                    current_node.forward[current_level]
+
+                if next_node is None or next_node.key is None:
+                    break
+
+                if key == next_node.key:
+                    return True
+                elif key > next_node.key:
+                    current_node = next_node
+                else:
+                    break
+
+            if current_level == 0:
+                break
+
+            current_level -= 1
+
+        return False
+
+    def min(self) -> T:
+        """
+        Return the lowest value in O(1), raising ValueError
+        if the SkipList is empty.
+        """
+
+        node: SkipList.Node | None = self._head.forward[0]
+
+        if node is None:
+            raise ValueError("min() of an empty SkipList")
+
+        return cast(T, node.value)
+
+    def max(self) -> T:
+        """
+        Return the greatest value in O(1), raising ValueError
+        if the SkipList is empty.
+        """
+
+        if self._tail is None:
+            raise ValueError("max() of an empty SkipList")
+
+        return cast(T, self._tail.value)
+
+    def __iter__(self) -> Iterator[T]:
+        return self.irange()
+
+    def __reversed__(self) -> Iterator[T]:
+        return self.irange(reverse=True)
+
+    def __contains__(self, value: T) -> bool:
+        return self.retrieve(value)
+
+    def floor(self, value: T) -> T | None:
+        """
+        Return the greatest value lower than or equal to 'value',
+        None if there is none.
+        """
+
+        return cast(T | None, self._last_before(
+            self._search_key(value), inclusive=True).value)
+
+    def ceiling(self, value: T) -> T | None:
+        """
+        Return the lowest value greater than or equal to 'value',
+        None if there is none.
+        """
+
+        next_node: SkipList.Node | None = \
+            self._last_before(self._search_key(value)).forward[0]
+
+        return None if next_node is None else cast(T, next_node.value)
+
+    def lower(self, value: T) -> T | None:
+        """
+        Return the greatest value strictly lower than 'value',
+        None if there is none.
+        """
+
+        return cast(T | None,
+                    self._last_before(self._search_key(value)).value)
+
+    def higher(self, value: T) -> T | None:
+        """
+        Return the lowest value strictly greater than 'value',
+        None if there is none.
+        """
+
+        next_node: SkipList.Node | None = self._last_before(
+            self._search_key(value), inclusive=True).forward[0]
+
+        return None if next_node is None else cast(T, next_node.value)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """
+        Return the value at position 'index', or the list of values
+        selected by a slice, in O(log n) to reach the first position.
+        Requires an indexed SkipList.
+        """
+
+        self._check_indexed()
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            positions: range = range(start, stop, step)
+
+            if len(positions) == 0:
+                return []
+            elif step < 0:
+                return self[positions[-1]:positions[0] + 1:-step][::-1]
+
+            return list(itertools.islice(
+                self._iter_at(start), 0, stop - start, step))
+
+        if index < 0:
+            index += self._size
+
+        if index < 0 or index >= self._size:
+            raise IndexError("SkipList index out of range")
+
+        return cast(T, self._node_at(index)[0].value)
+
+    def index(self, value: T) -> int:
+        """
+        Return the position of 'value', raising ValueError if it
+        is missing. Requires an indexed SkipList.
+        """
+
+        self._check_indexed()
+
+        current_node: SkipList.Node
+        rank: int
+        key: Any = self._search_key(value)
+        current_node, rank = self._rank_before(key)
+        next_node: SkipList.Node | None = current_node.forward[0]
+
+        if next_node is None or key != next_node.key:
+            raise ValueError(f"{value!r} is not in SkipList")
+
+        return rank
+
+    def bisect_left(self, value: T) -> int:
+        """
+        Return the number of values lower than 'value'.
+        Requires an indexed SkipList.
+        """
+
+        self._check_indexed()
+
+        return self._rank_before(self._search_key(value))[1]
+
+    def bisect_right(self, value: T) -> int:
+        """
+        Return the number of values lower than or equal to 'value'.
+        Requires an indexed SkipList.
+        """
+
+        self._check_indexed()
+
+        return self._rank_before(self._search_key(value), inclusive=True)[1]
+
+    def count_range(self,
+                    lo: T | None = None,
+                    hi: T | None = None,
+                    inclusive: tuple[bool, bool] = (True, False)) -> int:
+        """
+        Return the number of values irange(lo, hi, inclusive) would
+        yield, in O(log n). Requires an indexed SkipList.
+        """
+
+        self._check_indexed()
+
+        start: int = 0
+        stop: int = self._size
+
+        if lo is not None:
+            start = self._rank_before(
+                self._search_key(lo), not inclusive[0])[1]
+
+        if hi is not None:
+            stop = self._rank_before(
+                self._search_key(hi), inclusive[1])[1]
+
+        return max(stop - start, 0)
+
+    @overload
+    def quantile(self, q: float, interpolate: Literal[False] = ...) -> T: ...
+
+    @overload
+    def quantile(self, q: float, interpolate: Literal[True]) -> float: ...
+
+    @overload
+    def quantile(self, q: float, interpolate: bool) -> T | float: ...
+
+    def quantile(self, q: float, interpolate: bool = False) -> T | float:
+        """
+        Return the 'q' quantile of the values, 0 <= q <= 1, in O(log n).
+        By default, it is the value at the nearest rank, ceil(q * n),
+        computed exactly from q as written in decimal.
+        With 'interpolate', numbers are linearly interpolated between
+        positions like numpy.quantile() does. Raises ValueError if the
+        SkipList is empty. Requires an indexed SkipList.
+        """
+
+        self._check_indexed()
+
+        if self._size == 0:
+            raise ValueError("quantile() of an empty SkipList")
+
+        if not 0 <= q <= 1:
+            raise ValueError(
+                f"Invalid q value: {q}. "
+                "Parameter 'q' must be between 0 and 1.")
+
+        if not interpolate:
+            # q as written rather than its binary approximation, whose
+            # product with n may round up past an integer rank
+            exact: Fraction = \
+                Fraction(repr(q)) if isinstance(q, float) else Fraction(q)
+            index: int = max(math.ceil(exact * self._size) - 1, 0)
+
+            return cast(T, self._node_at(index)[0].value)
+
+        position: float = q * (self._size - 1)
+        index = math.floor(position)
+        values: list[Any] = list(itertools.islice(self._iter_at(index), 2))
+
+        if len(values) == 1 or position == index:
+            return cast(float, values[0])
+
+        return cast(float,
+                    values[0] + (values[1] - values[0]) * (position - index))
+
+    def quantiles(self,
+                  qs: Iterable[float],
+                  interpolate: bool = False) -> list[T | float]:
+        """
+        Return the quantile() of every q of 'qs', in O(log n) each.
+        """
+
+        return [self.quantile(q, interpolate) for q in qs]
+
+    @overload
+    def median(self, interpolate: Literal[False] = ...) -> T: ...
+
+    @overload
+    def median(self, interpolate: Literal[True]) -> float: ...
+
+    @overload
+    def median(self, interpolate: bool) -> T | float: ...
+
+    def median(self, interpolate: bool = False) -> T | float:
+        """
+        Return the 0.5 quantile(): the lower middle value by default,
+        the mean of both middle numbers with 'interpolate'.
+        """
+
+        return self.quantile(0.5, interpolate)
+
+    def _check_frozen(self) -> None:
+        if self._frozen:
+            raise ValueError("SkipList is frozen and cannot be modified.")
+
+    def _check_indexed(self) -> None:
+        if not self._indexed:
+            raise ValueError(
+                "Positional operations require an indexed SkipList, "
+                "created with 'indexed=True'.")
+
+    def _node_at(self, index: int) -> tuple[SkipList.Node, int]:
+        """
+        Return the node at position 'index', assumed in range, along
+        with its own position, by following the widest links not
+        reaching it.
+        """
+
+        current_node: SkipList.Node = self._head
+        position: int = 0
+        next_node: SkipList.Node | None
+
+        for level in range(self._head.current_level, -1, -1):
+            width: list[int] = cast(list[int], current_node.width)
+            next_node = current_node.forward[level]
+
+            while next_node is not None and \
+                    position + width[level] <= index:
+                position += width[level]
+                current_node = next_node
+                width = cast(list[int], current_node.width)
+                next_node = current_node.forward[level]
+
+        return cast(SkipList.Node, current_node.forward[0]), position
+
+    def _iter_at(self, index: int) -> Iterator[T]:
+        """
+        Iterate over the values from position 'index', assumed in range.
+        """
+
+        node: SkipList.Node | None = self._node_at(index)[0]
+
+        while node is not None:
+            yield cast(T, node.value)
+            node = node.forward[0]
+
+    def _rank_before(self,
+                     value: T,
+                     inclusive: bool = False) -> tuple[SkipList.Node, int]:
+        """
+        Same as _last_before(), also returning the number
+        of values up to the returned node.
+        """
+
+        current_node: SkipList.Node = self._head
+        rank: int = 0
+        next_node: SkipList.Node | None
+
+        for level in range(self._head.current_level, -1, -1):
+            next_node = current_node.forward[level]
+
+            while next_node is not None and (
+                    value > next_node.key or
+                    (inclusive and value == next_node.key)):
+                rank += cast(list[int], current_node.width)[level]
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+        return current_node, rank
+
+    def _last_before(self,
+                     value: T,
+                     inclusive: bool = False) -> SkipList.Node:
+        """
+        Return the last node holding a value lower than 'value'
+        (or equal to it when 'inclusive'), the head if there is none.
+        """
+
+        current_node: SkipList.Node = self._head
+        next_node: SkipList.Node | None
+
+        for level in range(self._head.current_level, -1, -1):
+            next_node = current_node.forward[level]
+
+            while next_node is not None and (
+                    value > next_node.key or
+                    (inclusive and value == next_node.key)):
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+        return current_node
+
+    def _find_update(
+            self,
+            value: T,
+            ranked: bool = False,
+            inclusive: bool = False
+    ) -> tuple[list[SkipList.Node], list[int] | None]:
+        """
+        Return, for each level, the last node holding a value lower
+        than 'value' (or equal to it when 'inclusive'). When 'ranked',
+        also return the position of each of those nodes, the head
+        standing at position 0.
+        """
+
+        head: SkipList.Node = self._head
+        current_level: int = head.current_level
+        update: list[SkipList.Node] = [head] * (max(current_level, 0) + 1)
+        ranks: list[int] | None = [0] * len(update) if ranked else None
+        current_node: SkipList.Node = head
+        next_node: SkipList.Node | None
+        rank: int = 0
+
+        for level in range(current_level, -1, -1):
+            next_node = current_node.forward[level]
+
+            while next_node is not None and (
+                    value > next_node.key or
+                    (inclusive and value == next_node.key)):
+                if ranks is not None:
+                    rank += cast(list[int], current_node.width)[level]
+
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+            update[level] = current_node
+
+            if ranks is not None:
+                ranks[level] = rank
+
+        return update, ranks
+
+    def _find_last(
+            self,
+            ranked: bool = False
+    ) -> tuple[list[SkipList.Node], list[int] | None]:
+        """
+        Return, for each level, its last node like _find_update()
+        would for a value greater than every value.
+        """
+
+        head: SkipList.Node = self._head
+        current_level: int = head.current_level
+        last: list[SkipList.Node] = [head] * (max(current_level, 0) + 1)
+        ranks: list[int] | None = [0] * len(last) if ranked else None
+        current_node: SkipList.Node = head
+        next_node: SkipList.Node | None
+        rank: int = 0
+
+        for level in range(current_level, -1, -1):
+            next_node = current_node.forward[level]
+
+            while next_node is not None:
+                if ranks is not None:
+                    rank += cast(list[int], current_node.width)[level]
+
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+            last[level] = current_node
+
+            if ranks is not None:
+                ranks[level] = rank
+
+        return last, ranks
+
+    def _start_finger(
+            self,
+            ranked: bool = False
+    ) -> tuple[list[SkipList.Node], list[int] | None]:
+        """
+        Return an update vector standing before the first value,
+        to be moved around with _seek().
+        """
+
+        size: int = max(self._head.current_level, 0) + 1
+
+        return [self._head] * size, [0] * size if ranked else None
+
+    def _fit_finger(self,
+                    update: list[SkipList.Node],
+                    ranks: list[int] | None) -> None:
+        """
+        Resize an update vector (and 'ranks', if any) to the current
+        levels, which may have been added or dropped since it was used.
+        Added levels start from the head.
+        """
+
+        size: int = max(self._head.current_level, 0) + 1
+
+        if len(update) > size:
+            del update[size:]
+
+            if ranks is not None:
+                del ranks[size:]
+
+        while len(update) < size:
+            update.append(self._head)
+
+            if ranks is not None:
+                ranks.append(0)
+
+    def _seek(self,
+              value: T,
+              update: list[SkipList.Node],
+              ranks: list[int] | None) -> None:
+        """
+        Move the 'update' vector (and 'ranks', if any) left by
+        _find_update() or a previous _seek() to the predecessors of
+        'value', as _find_update() would return them.
+
+        Rather than descending from the head, the search climbs from
+        level 0 up to the first level whose link from the current
+        predecessor jumps past 'value', then descends from there, which
+        costs O(log d) for a distance d from the previous position.
+        """
+
+        head: SkipList.Node = self._head
+        current_level: int = head.current_level
+        self._fit_finger(update, ranks)
+        current_node: SkipList.Node
+        next_node: SkipList.Node | None
+        level: int = 0
+
+        while level < current_level:
+            current_node = update[level]
+
+            if current_node is head or value > current_node.key:
+                next_node = current_node.forward[level]
+
+                if next_node is None or not value > next_node.key:
+                    break
+
+            level += 1
+
+        current_node = update[level]
+        rank: int = 0 if ranks is None else ranks[level]
+
+        if current_node is not head and not value > current_node.key:
+            current_node = head
+            rank = 0
+
+        for level in range(level, -1, -1):
+            # the previous predecessor on this level may lie further
+            # than where the descent got, while still being before value
+            node: SkipList.Node = update[level]
+
+            if node is not current_node and node is not head and \
+                    value > node.key and (
+                        current_node is head or
+                        node.key > current_node.key):
+                current_node = node
+                rank = 0 if ranks is None else ranks[level]
+
+            next_node = current_node.forward[level]
+
+            while next_node is not None and value > next_node.key:
+                if ranks is not None:
+                    rank += cast(list[int], current_node.width)[level]
+
+                current_node = next_node
+                next_node = current_node.forward[level]
+
+            update[level] = current_node
+
+            if ranks is not None:
+                ranks[level] = rank
+
+    def _link(self,
+              value: T,
+              update: list[SkipList.Node],
+              ranks: list[int] | None,
+              key: Any = _MISSING) -> SkipList.Node:
+        """
+        Create a node for 'value' (of 'key', the value itself by default)
+        with a random tower and link it after the 'update' nodes, which
+        must come from _find_update() (ranked when the SkipList is
+        indexed).
+        """
+
+        self._check_frozen()
+        head: SkipList.Node = self._head
+        current_level: int = head.current_level
+        new_level: int = self._random_level()
+        new_node: SkipList.Node = self.Node(value, new_level, self._indexed)
+        new_node.current_level = new_level
+
+        if key is not _MISSING:
+            new_node.key = key
+
+        level: int
+
+        for level in range(new_level + 1):
+            prev: SkipList.Node = \
+                update[level] if level <= current_level else head
+            new_node.forward[level] = prev.forward[level]
+            prev.forward[level] = new_node
+
+        self._link_backward(update[0], new_node)
+        self._link_backward(new_node, new_node.forward[0])
+
+        if ranks is not None:
+            rank: int = ranks[0] + 1
+            width: list[int] = cast(list[int], new_node.width)
+
+            for level in range(new_level + 1):
+                if level > current_level:
+                    width[level] = self._size + 2 - rank
+                    cast(list[int], head.width)[level] = rank
+                else:
+                    prev_width: list[int] = \
+                        cast(list[int], update[level].width)
+                    width[level] = \
+                        prev_width[level] + ranks[level] + 1 - rank
+                    prev_width[level] = rank - ranks[level]
+
+            for level in range(new_level + 1, current_level + 1):
+                cast(list[int], update[level].width)[level] += 1
+
+        if new_level > current_level:
+            head.current_level = new_level
+
+        self._size += 1
+        self._version += 1
+
+        if self._size >= self._grow_at:
+            self._fit_level_cap()
+
+        return new_node
+
+    def _splice(self,
+                before: list[SkipList.Node],
+                before_ranks: list[int] | None,
+                last: list[SkipList.Node],
+                last_ranks: list[int] | None,
+                count: int | None = None) -> int:
+        """
+        Unlink the span of nodes following the 'before' nodes up to the
+        'last' nodes included, each level at once, 'last' being the
+        'before' node on the levels the span does not reach. Ranks are
+        required when indexed, else the span is counted unless 'count'
+        is given. Return the number of nodes unlinked.
+        """
+
+        self._check_frozen()
+        head: SkipList.Node = self._head
+        level: int
+
+        if count is None:
+            if before_ranks is not None and last_ranks is not None:
+                count = last_ranks[0] - before_ranks[0]
+            else:
+                count = 0
+                node: SkipList.Node = before[0]
+
+                while node is not last[0]:
+                    node = cast(SkipList.Node, node.forward[0])
+                    count += 1
+
+        if count == 0:
+            return 0
+
+        for level in range(head.current_level + 1):
+            prev: SkipList.Node = before[level]
+
+            if before_ranks is not None and last_ranks is not None:
+                # the link now skips the span too
+                cast(list[int], prev.width)[level] = \
+                    last_ranks[level] + \
+                    cast(list[int], last[level].width)[level] - \
+                    count - before_ranks[level]
+
+            prev.forward[level] = last[level].forward[level]
+
+        self._link_backward(before[0], before[0].forward[0])
+
+        while head.current_level >= 0 and \
+                head.forward[head.current_level] is None:
+            head.current_level -= 1
+
+        self._size -= count
+        self._version += 1
+
+        return count
+
+    def _link_backward(self,
+                       prev: SkipList.Node,
+                       node: SkipList.Node | None) -> None:
+        """
+        Make 'prev' the node preceding 'node' on level 0, the head
+        standing for the start of the list and None for its end.
+        """
+
+        backward: SkipList.Node | None = None if prev is self._head else prev
+
+        if node is None:
+            self._tail = backward
+        else:
+            node.backward = backward
+
+    def _unlink(self,
+                node: SkipList.Node,
+                update: list[SkipList.Node]) -> None:
+        """
+        Unlink 'node' from the 'update' nodes preceding it,
+        which must come from _find_update().
+        """
+
+        self._check_frozen()
+        head: SkipList.Node = self._head
+        level: int
+
+        # the node only spans its own tower, so only
+        # the levels it actually occupies have to be unlinked
+        for level in range(node.current_level + 1):
+            update[level].forward[level] = node.forward[level]
+
+        self._link_backward(update[0], node.forward[0])
+
+        if self._indexed:
+            width: list[int] = cast(list[int], node.width)
+
+            for level in range(node.current_level + 1):
+                cast(list[int], update[level].width)[level] += \
+                    width[level] - 1
+
+            for level in range(node.current_level + 1,
+                               head.current_level + 1):
+                cast(list[int], update[level].width)[level] -= 1
+
+        while head.current_level >= 0 and \
+                head.forward[head.current_level] is None:
+            head.current_level -= 1
+
+        self._size -= 1
+        self._version += 1
+
+    def _random_level(self) -> int:
+        # a random() call per promoted level measures faster than drawing
+        # a single getrandbits() word and counting its trailing zeros,
+        # see the 'levels' benchmark
+        level: int = 0
+
+        while level < self._level_cap and self._rng.random() < self._p:
+            level += 1
+
+        return level
+
+    def _fit_level_cap(self) -> None:
+        """
+        Cap the towers of an adaptive SkipList of n values at
+        floor(log(n) / log(1 / p)) + 1 levels, within max_level, growing
+        the head to match, and note the size from which to raise the cap.
+        """
+
+        level_cap: int = 0
+        grow_at: float = 1.0
+
+        if self._p == 1:
+            level_cap = self._max_level
+        elif self._p > 0:
+            # about size * p^level towers reach each level,
+            # less than one above the cap
+            while level_cap < self._max_level and self._size >= grow_at:
+                level_cap += 1
+                grow_at /= self._p
+
+        if level_cap == self._max_level or self._p == 0:
+            grow_at = float("inf")
+
+        self._level_cap = level_cap
+        self._grow_at = grow_at
+        self._grow_head(level_cap)
+
+    def _grow_head(self, level: int) -> None:
+        """
+        Give the head forward slots up to 'level', past its own.
+        """
+
+        head: SkipList.Node = self._head
+        missing: int = level + 1 - len(head.forward)
+
+        if missing > 0:
+            head.forward += [None] * missing
+
+            if head.width is not None:
+                head.width += [0] * missing
+
+def merge_many(*skip_lists: SkipList[T], **kwargs: Any) -> SkipList[T]:
+    """
+    Return a new SkipList of the values in any of 'skip_lists', merged
+    in a single pass over all of them then bulk built like from_sorted(),
+    in O(n log k) comparisons for k SkipLists.
+
+    Keyword arguments are forwarded to the constructor.
+    """
+
+    return SkipList[T].from_sorted(
+        heapq.merge(*(skip_list.irange() for skip_list in skip_lists),
+                    key=kwargs.get("key"),
+                    reverse=kwargs.get("reverse", False)),
+        **kwargs)
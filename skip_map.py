@@ -0,0 +1,358 @@
+from __future__ import annotations
+from typing import Any, TypeVar, Generic, Self, Callable, ClassVar, \
+    Iterable, Iterator, cast
+from skip_list import Comparable, SkipList
+from snapshot import COUNTS, MAPPED_ITEMS
+import heapq
+import itertools
+import os
+
+K = TypeVar("K", bound=Comparable)
+V = TypeVar("V")
+
+# marks a missing default, since None is a valid one
+_MISSING: Any = object()
+
+def _node_key(node: SkipList.Node) -> Any:
+    return node.key
+
+class SkipMap(SkipList[K], Generic[K, V]):
+    """
+    An ordered mapping built on SkipList, each node holding a key
+    along with its value in a separate slot, so that only keys are
+    ever compared.
+
+    SkipList methods (retrieve, irange, floor, ceiling...) operate
+    on keys, inserting a key on its own mapping it to None.
+
+    With a 'key' function, keys are ordered by key(k) and two keys
+    of equal key(k) are the same entry. Mapping methods and views
+    take keys, while SkipList lookups take key(k) like they do on a
+    SkipList.
+    """
+
+    class Node(SkipList.Node):
+        """
+        A SkipList node also holding the value mapped to its key.
+        """
+
+        __slots__ = ("item",)
+
+        def __init__(self,
+                     value: Any,
+                     level: int,
+                     indexed: bool = False) -> None:
+            super().__init__(value, level, indexed)
+            self.item: Any = None
+
+    __slots__ = ()
+
+    # save() pickles the value mapped to each key
+    _ITEMS_KIND: ClassVar[int] = MAPPED_ITEMS
+
+    def __iter__(self) -> Iterator[K]:
+        return self.iter_from(0) if self._size > 0 else iter(())
+
+    def __contains__(self, key: K) -> bool:
+        return self._find_node(key) is not None
+
+    def __getitem__(self, key: K) -> V:  # type: ignore[override]
+        node: SkipList.Node | None = self._find_node(key)
+
+        if node is None:
+            raise KeyError(key)
+
+        return cast(V, cast(SkipMap.Node, node).item)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """
+        Map 'key' to 'value', updating the existing node or
+        inserting a new one after a single descent.
+        """
+
+        self._check_frozen()
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        node_key: Any = self._key_of(key)
+        update, ranks = self._find_update(node_key, self._indexed)
+        node: SkipList.Node | None = update[0].forward[0]
+
+        if node is None or node_key != node.key:
+            node = self._link(key, update, ranks, node_key)
+
+        cast(SkipMap.Node, node).item = value
+
+    def __delitem__(self, key: K) -> None:
+        self.pop(key)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        node: SkipList.Node | None = self._find_node(key)
+
+        if node is None:
+            return default
+
+        return cast(V, cast(SkipMap.Node, node).item)
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        """
+        Remove 'key' and return its value, or 'default' if it is
+        missing, raising KeyError when no default is given.
+        """
+
+        self._check_frozen()
+        update: list[SkipList.Node]
+        node_key: Any = self._key_of(key)
+        update, _ = self._find_update(node_key)
+        node: SkipList.Node | None = update[0].forward[0]
+
+        if node is None or node_key != node.key:
+            if default is _MISSING:
+                raise KeyError(key)
+
+            return default
+
+        self._unlink(node, update)
+
+        return cast(V, cast(SkipMap.Node, node).item)
+
+    def setdefault(self, key: K, default: V | None = None) -> V | None:
+        """
+        Return the value of 'key', mapping it to 'default'
+        first if it is missing, after a single descent.
+        """
+
+        self._check_frozen()
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        node_key: Any = self._key_of(key)
+        update, ranks = self._find_update(node_key, self._indexed)
+        node: SkipList.Node | None = update[0].forward[0]
+
+        if node is None or node_key != node.key:
+            node = self._link(key, update, ranks, node_key)
+            cast(SkipMap.Node, node).item = default
+
+        return cast(V | None, cast(SkipMap.Node, node).item)
+
+    def keys(self) -> SkipMapKeysView[K, V]:
+        return SkipMapKeysView(self)
+
+    def values(self) -> SkipMapValuesView[K, V]:
+        return SkipMapValuesView(self)
+
+    def items(self) -> SkipMapItemsView[K, V]:
+        return SkipMapItemsView(self)
+
+    def union(self, other: SkipList[K]) -> Self:
+        """
+        Return a new SkipMap of the entries of both SkipMaps, 'other'
+        winning on shared keys like dict's | operator.
+        """
+
+        return self._from_sorted_nodes(
+            list(group)[-1] for _, group in itertools.groupby(
+                heapq.merge(self._nodes(), other._irange_nodes(
+                    None, None, (True, False), False), key=_node_key),
+                key=_node_key))
+
+    def intersection(self, other: SkipList[K]) -> Self:
+        """
+        Return a new SkipMap of the entries of the keys in both,
+        keeping the values of this SkipMap.
+        """
+
+        nodes: list[SkipList.Node] = list(self._nodes())
+
+        return self._from_sorted_nodes(itertools.compress(
+            nodes, other.contains_many(
+                self._lookup_key(cast(K, node.value)) for node in nodes)))
+
+    def difference(self, other: SkipList[K]) -> Self:
+        """
+        Return a new SkipMap of the entries whose keys are not in 'other'.
+        """
+
+        nodes: list[SkipList.Node] = list(self._nodes())
+        found: list[bool] = other.contains_many(
+            self._lookup_key(cast(K, node.value)) for node in nodes)
+
+        return self._from_sorted_nodes(
+            node for node, in_other in zip(nodes, found) if not in_other)
+
+    def symmetric_difference(self, other: SkipList[K]) -> Self:
+        """
+        Return a new SkipMap of the entries whose keys are in exactly one
+        SkipMap, with their values there.
+        """
+
+        groups: Iterator[list[SkipList.Node]] = (
+            list(group) for _, group in itertools.groupby(
+                heapq.merge(self._nodes(), other._irange_nodes(
+                    None, None, (True, False), False), key=_node_key),
+                key=_node_key))
+
+        return self._from_sorted_nodes(
+            group[0] for group in groups if len(group) == 1)
+
+    def _nodes(self) -> Iterator[SkipList.Node]:
+        return self._irange_nodes(None, None, (True, False), False)
+
+    def _from_sorted_nodes(self, nodes: Iterable[SkipList.Node]) -> Self:
+        """
+        Build a SkipMap of the same type and parameters from the entries
+        of nodes given in order, a SkipList node mapping its value to None.
+        """
+
+        entries: list[SkipList.Node] = list(nodes)
+        skip_map: Self = self._from_sorted_like(
+            cast(K, node.value) for node in entries)
+        target: SkipList.Node | None = skip_map._head.forward[0]
+
+        for node in entries:
+            cast(SkipMap.Node, target).item = getattr(node, "item", None)
+            target = cast(SkipList.Node, target).forward[0]
+
+        return skip_map
+
+    def _node_item(self, node: SkipList.Node) -> Any:
+        return cast(SkipMap.Node, node).item
+
+    def _restore_items(self,
+                       items: Iterable[Any] | None,
+                       kind: int,
+                       path: str | os.PathLike[str]) -> None:
+        """
+        Map each key back to its saved value, keys loaded from a
+        SkipList snapshot mapping to None.
+        """
+
+        if kind == COUNTS:
+            raise ValueError(
+                f"Snapshot {os.fspath(path)!r} was saved from a "
+                "SkipMultiset, not a SkipMap.")
+        elif items is None:
+            return
+
+        node: SkipList.Node | None = self._head.forward[0]
+
+        for item in items:
+            cast(SkipMap.Node, node).item = item
+            node = cast(SkipList.Node, node).forward[0]
+
+    def _lookup_key(self, key: K) -> Any:
+        """
+        Return 'key' as SkipList lookups take it.
+        """
+
+        return key if self._key is None else self._key(key)
+
+    def _find_node(self, key: K) -> SkipList.Node | None:
+        node_key: Any = self._key_of(key)
+        node: SkipList.Node | None = \
+            self._last_before(node_key).forward[0]
+
+        if node is None or node_key != node.key:
+            return None
+
+        return node
+
+class SkipMapView(Generic[K, V]):
+    """
+    A live ordered view over the entries of a SkipMap whose keys
+    fall within a range. Slicing a view with keys, as in
+    view[lo:hi], narrows its range to [lo, hi).
+    """
+
+    __slots__ = ("_map", "_lo", "_hi", "_inclusive")
+
+    _map: SkipMap[K, V]
+    _lo: K | None
+    _hi: K | None
+    _inclusive: tuple[bool, bool]
+
+    def __init__(self,
+                 skip_map: SkipMap[K, V],
+                 lo: K | None = None,
+                 hi: K | None = None,
+                 inclusive: tuple[bool, bool] = (True, False)) -> None:
+        self._map = skip_map
+        self._lo = lo
+        self._hi = hi
+        self._inclusive = inclusive
+
+    def __len__(self) -> int:
+        if self._lo is None and self._hi is None:
+            return len(self._map)
+        elif self._map.indexed:
+            return self._map.count_range(
+                None if self._lo is None else self._map._lookup_key(self._lo),
+                None if self._hi is None else self._map._lookup_key(self._hi),
+                self._inclusive)
+
+        return sum(1 for _ in self._nodes())
+
+    def __getitem__(self, keys: slice) -> Self:
+        if not isinstance(keys, slice) or keys.step is not None:
+            raise ValueError(
+                "SkipMap views can only be sliced by a key range, "
+                "as in view[lo:hi].")
+
+        lo: K | None = self._lo
+        hi: K | None = self._hi
+        lo_inclusive, hi_inclusive = self._inclusive
+
+        # compared in the SkipMap order
+        order: Callable[[K], Any] = self._map._key_of
+
+        if keys.start is not None and \
+                (lo is None or order(keys.start) > order(lo)):
+            lo, lo_inclusive = keys.start, True
+
+        if keys.stop is not None and \
+                (hi is None or order(keys.stop) <= order(hi)):
+            hi, hi_inclusive = keys.stop, False
+
+        return type(self)(self._map, lo, hi, (lo_inclusive, hi_inclusive))
+
+    def _nodes(self, reverse: bool = False) -> Iterator[SkipMap.Node]:
+        for node in self._map._irange_nodes(
+                None if self._lo is None else self._map._key_of(self._lo),
+                None if self._hi is None else self._map._key_of(self._hi),
+                self._inclusive, reverse):
+            yield cast(SkipMap.Node, node)
+
+class SkipMapKeysView(SkipMapView[K, V]):
+    __slots__ = ()
+
+    # save() pickles the value mapped to each key
+    _ITEMS_KIND: ClassVar[int] = MAPPED_ITEMS
+
+    def __iter__(self) -> Iterator[K]:
+        for node in self._nodes():
+            yield cast(K, node.value)
+
+    def __reversed__(self) -> Iterator[K]:
+        for node in self._nodes(reverse=True):
+            yield cast(K, node.value)
+
+class SkipMapValuesView(SkipMapView[K, V]):
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[V]:
+        for node in self._nodes():
+            yield cast(V, node.item)
+
+    def __reversed__(self) -> Iterator[V]:
+        for node in self._nodes(reverse=True):
+            yield cast(V, node.item)
+
+class SkipMapItemsView(SkipMapView[K, V]):
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[tuple[K, V]]:
+        for node in self._nodes():
+            yield cast(K, node.value), cast(V, node.item)
+
+    def __reversed__(self) -> Iterator[tuple[K, V]]:
+        for node in self._nodes(reverse=True):
+            yield cast(K, node.value), cast(V, node.item)
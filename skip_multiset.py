@@ -0,0 +1,541 @@
+from __future__ import annotations
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Self, cast
+from skip_list import T, SkipList
+from snapshot import COUNTS, MAPPED_ITEMS
+import heapq
+import itertools
+import os
+
+class SkipMultiset(SkipList[T]):
+    """
+    A sorted bag built on SkipList: each node holds a distinct value
+    along with its number of occurrences, so that repeated values cost
+    memory per distinct value rather than per occurrence.
+
+    len() and iteration count every occurrence, iteration repeating
+    each value lazily. When indexed, link widths count occurrences
+    too, so that positions, bisect_left(), count_range() and indexing
+    are order statistics over all of them, in O(log n).
+
+    Lookups take keys as in SkipList. Removing a node (remove_range(),
+    Cursor.remove_current()) removes all its occurrences, while
+    cursors move over distinct values.
+    """
+
+    class Node(SkipList.Node):
+        """
+        A SkipList node also holding the number of occurrences
+        of its value.
+        """
+
+        __slots__ = ("count",)
+
+        def __init__(self,
+                     value: Any,
+                     level: int,
+                     indexed: bool = False) -> None:
+            super().__init__(value, level, indexed)
+            self.count: int = 1
+
+    __slots__ = ()
+
+    # save() writes the number of occurrences of each value
+    _ITEMS_KIND: ClassVar[int] = COUNTS
+
+    @classmethod
+    def _build(cls,
+               iterable: Iterable[T],
+               heights: Iterable[int] | None,
+               **kwargs: Any) -> Self:
+        """
+        Thread a node per run of equal values, then count them.
+        """
+
+        counts: list[int] = []
+
+        def distinct() -> Iterator[T]:
+            for _, run in itertools.groupby(iterable, kwargs.get("key")):
+                value: T = next(run)
+                counts.append(1 + sum(1 for _ in run))
+                yield value
+
+        multiset: Self = super()._build(distinct(), heights, **kwargs)
+        node: SkipList.Node | None = multiset._head.forward[0]
+
+        for count in counts:
+            cast(SkipMultiset.Node, node).count = count
+            node = cast(SkipList.Node, node).forward[0]
+
+        multiset._size = sum(counts)
+
+        if multiset._indexed:
+            multiset._count_widths()
+
+        return multiset
+
+    def __iter__(self) -> Iterator[T]:
+        return self.irange()
+
+    def __contains__(self, key: Any) -> bool:
+        return self.retrieve(key)
+
+    def irange(self,
+               lo: T | None = None,
+               hi: T | None = None,
+               inclusive: tuple[bool, bool] = (True, False),
+               reverse: bool = False) -> Iterator[T]:
+        for node in self._irange_nodes(
+                None if lo is None else self._search_key(lo),
+                None if hi is None else self._search_key(hi),
+                inclusive, reverse):
+            yield from itertools.repeat(
+                cast(T, node.value), cast(SkipMultiset.Node, node).count)
+
+    def counts(self) -> Iterator[tuple[T, int]]:
+        """
+        Iterate over the distinct values and their number of occurrences.
+        """
+
+        node: SkipList.Node | None = self._head.forward[0]
+
+        while node is not None:
+            yield cast(T, node.value), cast(SkipMultiset.Node, node).count
+            node = node.forward[0]
+
+    def add(self, value: T, n: int = 1) -> None:
+        """
+        Add 'n' occurrences of 'value', counted in the node of an equal
+        value if there is one, after a single descent.
+        """
+
+        if n < 0:
+            raise ValueError(
+                f"Invalid n value: {n}. "
+                "Parameter 'n' must be greater than or equal to 0.")
+
+        self._check_frozen()
+
+        if n == 0:
+            return
+
+        key: Any = self._key_of(value) if self._keyed else value
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        update, ranks = self._find_update(key, self._indexed)
+        node: SkipList.Node | None = update[0].forward[0]
+
+        if node is None or key != node.key:
+            node = self._link(value, update, ranks, key)
+            n -= 1
+
+        self._add_count(node, update, n)
+
+    def discard(self, key: Any, n: int = 1) -> int:
+        """
+        Remove up to 'n' occurrences of the value of 'key', returning
+        how many were removed.
+        """
+
+        if n < 0:
+            raise ValueError(
+                f"Invalid n value: {n}. "
+                "Parameter 'n' must be greater than or equal to 0.")
+
+        self._check_frozen()
+
+        if self._head.forward[0] is None or n == 0:
+            return 0
+
+        key = self._search_key(key)
+        update: list[SkipList.Node]
+        update, _ = self._find_update(key)
+        node: SkipList.Node | None = update[0].forward[0]
+
+        if node is None or key != node.key:
+            return 0
+
+        return self._discard_node(node, update, n)
+
+    def count(self, key: Any) -> int:
+        """
+        Return the number of occurrences of the value of 'key'.
+        """
+
+        key = self._search_key(key)
+        node: SkipList.Node | None = self._last_before(key).forward[0]
+
+        if node is None or key != node.key:
+            return 0
+
+        return cast(SkipMultiset.Node, node).count
+
+    def insert(self, value: T) -> bool:
+        """
+        Add an occurrence of 'value', always returning True.
+        """
+
+        self.add(value)
+
+        return True
+
+    def remove(self, value: T) -> bool:
+        """
+        Remove an occurrence of the value of key 'value',
+        telling whether there was one.
+        """
+
+        return self.discard(value) == 1
+
+    def pop_max(self) -> T:
+        """
+        Remove and return an occurrence of the greatest value in
+        O(log n), raising IndexError if the SkipMultiset is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("pop from an empty SkipList")
+
+        self._check_frozen()
+        node: SkipList.Node = cast(SkipList.Node, self._tail)
+        update: list[SkipList.Node]
+        update, _ = self._find_update(node.key)
+        self._discard_node(node, update, 1)
+
+        return cast(T, node.value)
+
+    def pop_min_n(self, count: int) -> list[T]:
+        """
+        Remove and return the 'count' lowest occurrences (fewer if there
+        are not as many) in ascending order, in O(count) for runs of
+        single occurrences.
+        """
+
+        if count < 0:
+            raise ValueError(
+                f"Invalid count value: {count}. "
+                "Parameter 'count' must be greater than or equal to 0.")
+
+        self._check_frozen()
+        # the head precedes the first node on every level
+        update: list[SkipList.Node]
+        update, _ = self._start_finger()
+        values: list[T] = []
+
+        while self._head.forward[0] is not None and len(values) < count:
+            node: SkipList.Node = self._head.forward[0]
+            self._fit_finger(update, None)
+            removed: int = \
+                self._discard_node(node, update, count - len(values))
+            values.extend(itertools.repeat(cast(T, node.value), removed))
+
+        return values
+
+    def insert_many(self, values: Iterable[T]) -> int:
+        """
+        Add an occurrence of every value, returning how many were added,
+        resuming each search from the previous one like SkipList does.
+        """
+
+        self._check_frozen()
+        update: list[SkipList.Node]
+        ranks: list[int] | None
+        update, ranks = self._start_finger(self._indexed)
+        added: int = 0
+
+        for value in values:
+            key: Any = self._key_of(value) if self._keyed else value
+            self._seek(key, update, ranks)
+            node: SkipList.Node | None = update[0].forward[0]
+
+            if node is None or key != node.key:
+                self._link(value, update, ranks, key)
+            else:
+                self._add_count(node, update, 1)
+
+            added += 1
+
+        return added
+
+    def remove_many(self, values: Iterable[T]) -> int:
+        """
+        Remove an occurrence of the value of every key, returning how
+        many were found, resuming each search from the previous one.
+        """
+
+        self._check_frozen()
+        update: list[SkipList.Node]
+        update, _ = self._start_finger()
+        removed: int = 0
+
+        for value in values:
+            key: Any = self._search_key(value)
+            self._seek(key, update, None)
+            node: SkipList.Node | None = update[0].forward[0]
+
+            if node is not None and key == node.key:
+                removed += self._discard_node(node, update, 1)
+
+        return removed
+
+    def union(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipMultiset holding each value as many times
+        as the SkipMultiset holding it the most, like Counter does.
+        """
+
+        return self._combine(other, max)
+
+    def intersection(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipMultiset holding each value as many times
+        as the SkipMultiset holding it the least.
+        """
+
+        return self._combine(other, min)
+
+    def difference(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipMultiset of the occurrences left after removing
+        those of 'other'.
+        """
+
+        return self._combine(other, lambda mine, theirs: mine - theirs)
+
+    def symmetric_difference(self, other: SkipList[T]) -> Self:
+        """
+        Return a new SkipMultiset of the occurrences left in either
+        SkipMultiset after removing those of the other one.
+        """
+
+        return self._combine(
+            other, lambda mine, theirs: abs(mine - theirs))
+
+    def rebalance(self) -> None:
+        super().rebalance()
+
+        if self._indexed:
+            self._count_widths()
+
+    def _combine(self,
+                 other: SkipList[T],
+                 combine: Callable[[int, int], int]) -> Self:
+        """
+        Merge both SkipMultisets in a single pass, keeping each value
+        'combine'(occurrences here, occurrences in 'other') times.
+        """
+
+        merge_key: Callable[[T], Any] | None = self._merge_key()
+
+        def entry_key(entry: tuple[T, int, int]) -> Any:
+            return entry[0] if merge_key is None else merge_key(entry[0])
+
+        def entries(multiset: SkipList[T],
+                    side: int) -> Iterator[tuple[T, int, int]]:
+            if isinstance(multiset, SkipMultiset):
+                for value, count in multiset.counts():
+                    yield value, count, side
+            else:
+                for value in multiset.irange():
+                    yield value, 1, side
+
+        def combined() -> Iterator[T]:
+            for _, group in itertools.groupby(
+                    heapq.merge(entries(self, 0), entries(other, 1),
+                                key=entry_key),
+                    entry_key):
+                values: list[T] = []
+                counts: list[int] = [0, 0]
+
+                # values of equal keys may differ, this side's coming first
+                for value, count, side in group:
+                    values.append(value)
+                    counts[side] = count
+
+                yield from itertools.repeat(
+                    values[0], max(combine(counts[0], counts[1]), 0))
+
+        return self._from_sorted_like(combined())
+
+    def _add_count(self,
+                   node: SkipList.Node,
+                   update: list[SkipList.Node],
+                   n: int) -> None:
+        """
+        Add 'n' (possibly negative) occurrences to 'node', preceded by
+        the 'update' nodes, widening every link reaching or crossing it.
+        """
+
+        self._check_frozen()
+
+        if n == 0:
+            return
+
+        cast(SkipMultiset.Node, node).count += n
+        self._size += n
+        self._version += 1
+
+        if self._indexed:
+            for level in range(self._head.current_level + 1):
+                prev: SkipList.Node = \
+                    update[level] if level < len(update) else self._head
+                cast(list[int], prev.width)[level] += n
+
+    def _discard_node(self,
+                      node: SkipList.Node,
+                      update: list[SkipList.Node],
+                      n: int) -> int:
+        """
+        Remove up to 'n' occurrences from 'node', unlinking it once none
+        is left, and return how many were removed.
+        """
+
+        count: int = cast(SkipMultiset.Node, node).count
+
+        if n >= count:
+            self._unlink(node, update)
+
+            return count
+
+        self._add_count(node, update, -n)
+
+        return n
+
+    def _unlink(self,
+                node: SkipList.Node,
+                update: list[SkipList.Node]) -> None:
+        # down to a single occurrence, which SkipList unlinks
+        self._add_count(node, update, 1 - cast(SkipMultiset.Node, node).count)
+        super()._unlink(node, update)
+
+    def _splice(self,
+                before: list[SkipList.Node],
+                before_ranks: list[int] | None,
+                last: list[SkipList.Node],
+                last_ranks: list[int] | None,
+                count: int | None = None) -> int:
+        if count is None and (before_ranks is None or last_ranks is None):
+            # ranks count occurrences already, but nodes do not
+            count = 0
+            node: SkipList.Node = before[0]
+
+            while node is not last[0]:
+                node = cast(SkipList.Node, node.forward[0])
+                count += cast(SkipMultiset.Node, node).count
+
+        return super()._splice(before, before_ranks, last, last_ranks, count)
+
+    def _count_from(self, node: SkipList.Node | None) -> int:
+        """
+        Return the number of occurrences from 'node' to the end, walking
+        from both the head and 'node' like SkipList does.
+        """
+
+        before: SkipList.Node | None = self._head.forward[0]
+        after: SkipList.Node | None = node
+        walked_before: int = 0
+        walked_after: int = 0
+
+        while before is not node and after is not None:
+            walked_before += cast(SkipMultiset.Node, before).count
+            walked_after += cast(SkipMultiset.Node, after).count
+            before = cast(SkipList.Node, before).forward[0]
+            after = after.forward[0]
+
+        if before is node:
+            return self._size - walked_before
+
+        return walked_after
+
+    def _iter_at(self, index: int) -> Iterator[T]:
+        node: SkipList.Node | None
+        position: int
+        node, position = self._node_at(index)
+        # occurrences of the first node before 'index' are skipped
+        skipped: int = index - position
+
+        while node is not None:
+            yield from itertools.repeat(
+                cast(T, node.value),
+                cast(SkipMultiset.Node, node).count - skipped)
+            skipped = 0
+            node = node.forward[0]
+
+    def _values_array(self, np: Any) -> Any:
+        """
+        Return an ascending NumPy array of the keys, each repeated
+        as many times as it occurs.
+        """
+
+        if self._snapshot is not None and \
+                self._snapshot_version == self._version:
+            return self._snapshot
+
+        keys: Any = super()._values_array(np)
+        counts: list[int] = [count for _, count in self.counts()]
+
+        if self._reverse:
+            counts.reverse()
+
+        self._snapshot = np.repeat(keys, counts)
+
+        return self._snapshot
+
+    def _node_item(self, node: SkipList.Node) -> Any:
+        return cast(SkipMultiset.Node, node).count
+
+    def _restore_items(self,
+                       items: Iterable[Any] | None,
+                       kind: int,
+                       path: str | os.PathLike[str]) -> None:
+        """
+        Set back the saved counts, values loaded from a SkipList
+        snapshot occurring once.
+        """
+
+        if kind == MAPPED_ITEMS:
+            raise ValueError(
+                f"Snapshot {os.fspath(path)!r} was saved from a "
+                "SkipMap, not a SkipMultiset.")
+        elif items is None:
+            return
+
+        node: SkipList.Node | None = self._head.forward[0]
+        size: int = 0
+
+        for count in items:
+            cast(SkipMultiset.Node, node).count = count
+            size += count
+            node = cast(SkipList.Node, node).forward[0]
+
+        self._size = size
+
+        if self._indexed:
+            self._count_widths()
+
+    def _count_widths(self) -> None:
+        """
+        Set every link width to the number of occurrences it skips,
+        in a single pass over level 0.
+        """
+
+        head: SkipList.Node = self._head
+        last: list[SkipList.Node] = [head] * (head.current_level + 1)
+        last_rank: list[int] = [0] * (head.current_level + 1)
+        rank: int = 0
+        node: SkipList.Node | None = head.forward[0]
+        level: int
+
+        while node is not None:
+            rank += cast(SkipMultiset.Node, node).count
+
+            for level in range(node.current_level + 1):
+                cast(list[int], last[level].width)[level] = \
+                    rank - last_rank[level]
+                last_rank[level] = rank
+                last[level] = node
+
+            node = node.forward[0]
+
+        for level in range(head.current_level + 1):
+            cast(list[int], last[level].width)[level] = \
+                rank + 1 - last_rank[level]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import Generic, Final, Callable, Iterable, Iterator
+from collections import deque
+from skip_list import T
+from skip_multiset import SkipMultiset
+import time
+
+class SlidingWindow(Generic[T]):
+    """
+    The samples of the last 'horizon' seconds, kept sorted in an indexed
+    SkipMultiset to answer exact quantiles in O(log n), such as rolling
+    latency percentiles. Samples also queue in arrival order, so that
+    expired ones are evicted in bulk, on every add and query.
+    """
+
+    __slots__ = ("_horizon", "_clock", "_samples", "_arrivals")
+
+    _horizon: Final[float]
+    _clock: Final[Callable[[], float]]
+    _samples: SkipMultiset[T]
+    # (timestamp, value) pairs, oldest first
+    _arrivals: deque[tuple[float, T]]
+
+    def __init__(self,
+                 horizon: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 promotion_probability: float = 0.5,
+                 max_level: int = 32,
+                 seed: int | None = None) -> None:
+        """
+        Timestamps of samples default to 'clock()', and must be
+        comparable with it when given.
+        """
+
+        if horizon <= 0:
+            raise ValueError(
+                f"Invalid horizon value: {horizon}. "
+                "Parameter 'horizon' must be greater than 0.")
+
+        self._horizon = horizon
+        self._clock = clock
+        self._samples = SkipMultiset[T](
+            promotion_probability=promotion_probability,
+            max_level=max_level,
+            indexed=True,
+            seed=seed,
+            adaptive=True)
+        self._arrivals = deque()
+
+    def __len__(self) -> int:
+        self.evict()
+
+        return len(self._samples)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the samples in the window, in ascending order.
+        """
+
+        self.evict()
+
+        return iter(self._samples)
+
+    @property
+    def horizon(self) -> float:
+        return self._horizon
+
+    def add(self, value: T, timestamp: float | None = None) -> None:
+        """
+        Add a sample taken at 'timestamp', no earlier than the last one,
+        after evicting those older than the horizon from it.
+        """
+
+        if timestamp is None:
+            timestamp = self._clock()
+        elif self._arrivals and timestamp < self._arrivals[-1][0]:
+            raise ValueError(
+                f"Invalid timestamp value: {timestamp}. "
+                "Parameter 'timestamp' must be greater than or equal "
+                "to the one of the last sample.")
+
+        self.evict(timestamp)
+        self._arrivals.append((timestamp, value))
+        self._samples.add(value)
+
+    def add_many(self,
+                 values: Iterable[T],
+                 timestamp: float | None = None) -> None:
+        """
+        Add samples all taken at 'timestamp'.
+        """
+
+        if timestamp is None:
+            timestamp = self._clock()
+
+        for value in values:
+            self.add(value, timestamp)
+
+    def evict(self, now: float | None = None) -> int:
+        """
+        Remove the samples older than the horizon at 'now', returning
+        how many. They are removed in ascending order, each search
+        resuming from the previous one.
+        """
+
+        if now is None:
+            now = self._clock()
+
+        cutoff: float = now - self._horizon
+        arrivals: deque[tuple[float, T]] = self._arrivals
+        expired: list[T] = []
+
+        while arrivals and arrivals[0][0] <= cutoff:
+            expired.append(arrivals.popleft()[1])
+
+        if expired:
+            expired.sort()
+            self._samples.remove_many(expired)
+
+        return len(expired)
+
+    def quantile(self, q: float, interpolate: bool = False) -> T | float:
+        """
+        Return the 'q' quantile of the samples in the window, as
+        SkipList.quantile() does.
+        """
+
+        self.evict()
+
+        return self._samples.quantile(q, interpolate)
+
+    def quantiles(self,
+                  qs: Iterable[float],
+                  interpolate: bool = False) -> list[T | float]:
+        self.evict()
+
+        return self._samples.quantiles(qs, interpolate)
+
+    def median(self, interpolate: bool = False) -> T | float:
+        self.evict()
+
+        return self._samples.median(interpolate)
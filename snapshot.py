@@ -0,0 +1,421 @@
+from __future__ import annotations
+from typing import Any, Final, Iterable, Iterator, Self
+from array import array
+import bisect
+import mmap
+import os
+import pickle
+import struct
+import sys
+import zlib
+
+MAGIC: Final[bytes] = b"SKIPLIST"
+VERSION: Final[int] = 1
+
+# magic, format version, byte order of the sections, value encoding,
+# indexed, reverse and keyed flags, kind of items, promotion
+# probability, max level, size, then the crc32 of the header up to it
+# followed by every section
+_HEADER: Final[struct.Struct] = struct.Struct("<8sHBBBBBBdI4xQI4x")
+_CRC_OFFSET: Final[int] = _HEADER.size - 8
+_BYTE_ORDERS: Final[tuple[str, str]] = ("little", "big")
+
+# values are stored as int64, float64 or length-delimited pickles
+_INT: Final[int] = ord("q")
+_FLOAT: Final[int] = ord("d")
+_PICKLE: Final[int] = ord("o")
+
+# what the optional items section holds, one pickled item per value
+NO_ITEMS: Final[int] = 0
+MAPPED_ITEMS: Final[int] = 1
+COUNTS: Final[int] = 2
+
+def _padding(length: int) -> int:
+    """
+    Return how many bytes align a section of 'length' bytes to 8.
+    """
+
+    return -length % 8
+
+def _mmap_file(file: Any) -> mmap.mmap:
+    """
+    Map a whole file opened for reading, read-only.
+    """
+
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _encoding(values: list[Any]) -> int:
+    if all(type(value) is int and -2 ** 63 <= value < 2 ** 63
+           for value in values):
+        return _INT
+    elif all(type(value) is float for value in values):
+        return _FLOAT
+
+    return _PICKLE
+
+def _pickled_sections(objects: Iterable[Any]) -> list[bytes | array[Any]]:
+    """
+    Return the sections of pickled objects: their offsets into the
+    blob of their pickles, then the blob.
+    """
+
+    blobs: list[bytes] = [pickle.dumps(item) for item in objects]
+    offsets: array[int] = array("Q", [0])
+
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    return [offsets, b"".join(blobs)]
+
+def write_snapshot(path: str | os.PathLike[str],
+                   values: list[Any],
+                   heights: Iterable[int],
+                   promotion_probability: float,
+                   max_level: int,
+                   indexed: bool,
+                   reverse: bool = False,
+                   keyed: bool = False,
+                   items: list[Any] | None = None,
+                   items_kind: int = NO_ITEMS) -> None:
+    """
+    Write sorted values and the height of their towers to a snapshot
+    file, in descending order when 'reverse', and ordered by a key
+    function the file cannot hold when 'keyed'. 'items' are pickled
+    after the towers, one per value, 'items_kind' telling what they
+    are. The file is written aside then renamed over 'path', so that
+    a crash never leaves a partial snapshot behind.
+    """
+
+    encoding: int = _encoding(values)
+    sections: list[bytes | array[Any]] = []
+
+    if encoding == _PICKLE:
+        sections += _pickled_sections(values)
+    else:
+        sections.append(array(chr(encoding), values))
+
+    sections.append(array("H", heights))
+
+    if items is not None:
+        sections += _pickled_sections(items)
+    else:
+        items_kind = NO_ITEMS
+    header: bytes = _HEADER.pack(
+        MAGIC, VERSION, _BYTE_ORDERS.index(sys.byteorder), encoding,
+        indexed, reverse, keyed, items_kind, promotion_probability,
+        max_level, len(values), 0)
+    crc: int = zlib.crc32(header[:_CRC_OFFSET])
+    temporary_path: str = os.fspath(path) + ".tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(header)
+
+        for section in sections:
+            padding: bytes = bytes(_padding(memoryview(section).nbytes))
+            crc = zlib.crc32(padding, zlib.crc32(section, crc))
+            file.write(section)
+            file.write(padding)
+
+        file.seek(0)
+        file.write(_HEADER.pack(
+            MAGIC, VERSION, _BYTE_ORDERS.index(sys.byteorder), encoding,
+            indexed, reverse, keyed, items_kind, promotion_probability,
+            max_level, len(values), crc))
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary_path, path)
+
+class _PickledValues:
+    """
+    A read-only sequence of pickled values, unpickling each
+    value from its slice of the blob section on access.
+    """
+
+    __slots__ = ("_offsets", "_blob")
+
+    _offsets: memoryview
+    _blob: memoryview
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+
+        if index < 0 or index >= len(self):
+            raise IndexError(f"Index {index} is out of range")
+
+        return pickle.loads(
+            self._blob[self._offsets[index]:self._offsets[index + 1]])
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def release(self) -> None:
+        self._offsets.release()
+        self._blob.release()
+
+class Snapshot:
+    """
+    A snapshot file written by SkipList.save(), opened read-only.
+
+    The file starts with a fixed header holding a magic string, the
+    format version, the SkipList parameters and a crc32 checksum,
+    followed by 8-byte aligned sections: the values in the SkipList
+    order (int64, float64, or offsets into a blob of pickles for any
+    other type) then the height of the tower of each value, and the
+    pickled items of a SkipMap or counts of a SkipMultiset, if any.
+
+    With 'mmap' the file is memory-mapped rather than read, and both
+    sections are viewed in place without copying, so that lookups
+    only touch the pages they need once the checksum was verified.
+    Lookups are binary searches over level 0, the towers only being
+    used by SkipList.load() to rebuild the exact same SkipList. They
+    follow the order of a SkipList created with 'reverse', and raise
+    ValueError on the snapshot of one created with a key function.
+
+    Pickled values are unpickled on load: only open trusted files.
+    """
+
+    __slots__ = ("_file", "_mmap", "_buffer", "_values", "_heights",
+                 "_items", "_items_kind", "_p", "_max_level", "_indexed",
+                 "_reverse", "_keyed", "_size")
+
+    _file: Any
+    _mmap: mmap.mmap | None
+    _buffer: memoryview
+    # a memoryview of numbers or the pickled values
+    _values: Any
+    _heights: memoryview
+    _items: _PickledValues | None
+    _items_kind: int
+    _p: float
+    _max_level: int
+    _indexed: bool
+    _reverse: bool
+    _keyed: bool
+    _size: int
+
+    def __init__(self,
+                 path: str | os.PathLike[str],
+                 mmap: bool = True) -> None:
+        self._file = open(path, "rb")
+        self._mmap = None
+
+        try:
+            if mmap:
+                self._mmap = _mmap_file(self._file)
+                self._buffer = memoryview(self._mmap)
+            else:
+                self._buffer = memoryview(self._file.read())
+
+            self._parse(os.fspath(path))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._values[index]
+
+    @property
+    def promotion_probability(self) -> float:
+        return self._p
+
+    @property
+    def max_level(self) -> int:
+        return self._max_level
+
+    @property
+    def indexed(self) -> bool:
+        return self._indexed
+
+    @property
+    def reverse(self) -> bool:
+        return self._reverse
+
+    @property
+    def keyed(self) -> bool:
+        return self._keyed
+
+    @property
+    def items(self) -> _PickledValues | None:
+        """
+        The item of each value, None if the snapshot holds none.
+        """
+
+        return self._items
+
+    @property
+    def items_kind(self) -> int:
+        return self._items_kind
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def heights(self) -> memoryview:
+        return self._heights
+
+    def retrieve(self, value: Any) -> bool:
+        index: int = self.bisect_left(value)
+
+        return index < self._size and self._values[index] == value
+
+    def bisect_left(self, value: Any) -> int:
+        """
+        Return the number of values before 'value' in the SkipList order.
+        """
+
+        return self._bisect(value, False)
+
+    def bisect_right(self, value: Any) -> int:
+        """
+        Return the number of values before or equal to 'value' in the
+        SkipList order.
+        """
+
+        return self._bisect(value, True)
+
+    def close(self) -> None:
+        """
+        Release the views over the file then the file itself.
+        """
+
+        for name in ("_values", "_heights", "_items", "_buffer"):
+            view: Any = getattr(self, name, None)
+
+            if view is not None:
+                view.release()
+
+        if self._mmap is not None:
+            self._mmap.close()
+
+        self._file.close()
+
+    def _bisect(self, value: Any, right: bool) -> int:
+        if self._keyed:
+            raise ValueError(
+                "Snapshot lookups cannot follow the key function "
+                "of the saved SkipList.")
+        elif not self._reverse:
+            return bisect.bisect_right(self._values, value) if right \
+                else bisect.bisect_left(self._values, value)
+
+        # over descending values
+        values: Any = self._values
+        lo: int = 0
+        hi: int = self._size
+
+        while lo < hi:
+            middle: int = (lo + hi) // 2
+
+            if values[middle] > value or (right and values[middle] == value):
+                lo = middle + 1
+            else:
+                hi = middle
+
+        return lo
+
+    def _parse(self, path: str) -> None:
+        buffer: memoryview = self._buffer
+
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"File {path!r} is too short to be a snapshot")
+
+        magic, version, byte_order, encoding, indexed, reverse, keyed, \
+            self._items_kind, self._p, self._max_level, self._size, crc = \
+            _HEADER.unpack_from(buffer)
+
+        if magic != MAGIC:
+            raise ValueError(f"File {path!r} is not a snapshot")
+        elif version != VERSION:
+            raise ValueError(
+                f"Snapshot {path!r} has format version {version} "
+                f"(supported {VERSION})")
+        elif byte_order >= len(_BYTE_ORDERS) or \
+                _BYTE_ORDERS[byte_order] != sys.byteorder:
+            raise ValueError(
+                f"Snapshot {path!r} was written on a machine "
+                "of another byte order")
+        elif encoding not in (_INT, _FLOAT, _PICKLE):
+            raise ValueError(
+                f"Snapshot {path!r} has an unknown value encoding")
+        elif self._items_kind not in (NO_ITEMS, MAPPED_ITEMS, COUNTS):
+            raise ValueError(f"Snapshot {path!r} has an unknown kind of items")
+        elif zlib.crc32(buffer[_HEADER.size:],
+                        zlib.crc32(buffer[:_CRC_OFFSET])) != crc:
+            raise ValueError(f"Snapshot {path!r} is corrupted")
+
+        self._indexed = bool(indexed)
+        self._reverse = bool(reverse)
+        self._keyed = bool(keyed)
+        self._items = None
+        offset: int = _HEADER.size
+
+        # views are only held by the Snapshot, so that close() can
+        # release them all even after a failure midway
+        if encoding == _PICKLE:
+            self._values, offset = self._pickled(offset, path)
+        else:
+            self._values = self._section(offset, 8 * self._size).cast(
+                "q" if encoding == _INT else "d")
+            offset += 8 * self._size
+
+        self._heights = self._section(offset, 2 * self._size).cast("H")
+        offset += 2 * self._size + _padding(2 * self._size)
+
+        if self._items_kind != NO_ITEMS:
+            self._items, offset = self._pickled(offset, path)
+
+        if offset != len(buffer):
+            raise ValueError(f"Snapshot {path!r} is corrupted")
+
+    def _pickled(self,
+                 offset: int,
+                 path: str) -> tuple[_PickledValues, int]:
+        """
+        View the sections of pickled objects starting at 'offset',
+        returning them and the offset following them.
+        """
+
+        blob_offset: int = offset + 8 * (self._size + 1)
+
+        if blob_offset > len(self._buffer):
+            raise ValueError(f"Snapshot {path!r} is truncated")
+
+        blob_length: int = \
+            struct.unpack_from("=Q", self._buffer, blob_offset - 8)[0]
+        pickled: _PickledValues = _PickledValues(
+            self._section(offset, blob_offset - offset).cast("Q"),
+            self._section(blob_offset, blob_length))
+
+        return pickled, blob_offset + blob_length + _padding(blob_length)
+
+    def _section(self, offset: int, length: int) -> memoryview:
+        if offset + length > len(self._buffer):
+            raise ValueError("Snapshot is truncated")
+
+        return self._buffer[offset:offset + length]
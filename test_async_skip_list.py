@@ -0,0 +1,94 @@
+from async_skip_list import AsyncSkipList
+from skip_list import SkipList
+import asyncio
+import pytest
+
+def test_case_1() -> None:
+    async def run() -> None:
+        skip_list: AsyncSkipList[int] = AsyncSkipList[int](yield_every=2)
+
+        assert len(skip_list) == 0
+        assert bool(skip_list) == False
+        assert skip_list.yield_every == 2
+        assert await skip_list.insert(3) == True
+        assert await skip_list.insert(1) == True
+        assert await skip_list.insert(3) == False
+        assert await skip_list.load([5, 2, 4, 1], chunk_size=3) == 3
+        assert len(skip_list) == 5
+        assert bool(skip_list) == True
+        assert skip_list.retrieve(4) == True
+        assert [value async for value in skip_list] == [1, 2, 3, 4, 5]
+        assert [value async for value in skip_list.irange(2, 4)] == [2, 3]
+        assert [value async for value in skip_list.irange(
+            reverse=True)] == [5, 4, 3, 2, 1]
+        assert await skip_list.remove(3) == True
+        assert await skip_list.remove(3) == False
+        assert list(skip_list.skip_list.iter_from(0)) == [1, 2, 4, 5]
+
+        with pytest.raises(ValueError):
+            await skip_list.load([1], chunk_size=0)
+
+    asyncio.run(run())
+
+    with pytest.raises(ValueError):
+        AsyncSkipList[int](yield_every=0)
+
+def test_case_2() -> None:
+    async def run() -> None:
+        skip_list: AsyncSkipList[int] = AsyncSkipList[int](
+            SkipList[int].from_sorted(range(0, 1000, 2)), yield_every=100)
+        ticks: list[int] = []
+
+        async def ticker() -> None:
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        task: asyncio.Task[None] = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+
+        # a long scan lets other coroutines run while in progress
+        scanned: list[int] = []
+
+        async for value in skip_list:
+            scanned.append(value)
+
+        assert scanned == list(range(0, 1000, 2))
+        assert len(ticks) >= 5
+
+        # writers wait for a chunked load, readers do not
+        order: list[str] = []
+
+        async def load() -> None:
+            await skip_list.load(range(1, 1000, 2), chunk_size=100)
+            order.append("load")
+
+        async def write() -> None:
+            await skip_list.insert(-1)
+            order.append("insert")
+
+        async def read() -> None:
+            assert skip_list.retrieve(0) == True
+            order.append("read")
+
+        await asyncio.gather(load(), write(), read())
+
+        assert order == ["read", "load", "insert"]
+        assert list(skip_list.skip_list.iter_from(0)) == list(range(-1, 1000))
+
+        # a scan survives removals of the values it stands on
+        values: list[int] = []
+
+        async for value in skip_list.irange(0, 500):
+            values.append(value)
+
+            if value % 100 == 99:
+                assert await skip_list.remove(value) == True
+                assert await skip_list.remove(value + 5) == True
+
+        assert values == \
+            [value for value in range(0, 500) if value % 100 != 4 or value < 100]
+
+        task.cancel()
+
+    asyncio.run(run())
@@ -0,0 +1,143 @@
+from compact_skip_list import CompactSkipList
+import pytest
+import random
+
+def test_case_1() -> None:
+    skip_list: CompactSkipList = CompactSkipList(
+        promotion_probability=0.5,
+        max_level=8,
+        seed=1)
+
+    assert len(skip_list) == 0
+    assert bool(skip_list) == False
+    assert skip_list.promotion_probability == 0.5
+    assert skip_list.max_level == 8
+    assert skip_list.typecode == "q"
+    assert skip_list.size == 0
+    assert skip_list.current_level == -1
+    assert skip_list.retrieve(1) == False
+    assert skip_list.remove(1) == False
+
+    for value in [50, 10, 40, 20, 30]:
+        assert skip_list.insert(value) == True
+
+    assert skip_list.insert(30) == False
+    assert len(skip_list) == 5
+    assert list(skip_list.iter_from(0)) == [10, 20, 30, 40, 50]
+
+    for level in range(1, skip_list.current_level + 1):
+        values: list[int] = list(skip_list.iter_from(level))
+        assert values == sorted(values)
+
+    assert skip_list.retrieve(40) == True
+    assert skip_list.retrieve(45) == False
+    assert skip_list.remove(40) == True
+    assert skip_list.remove(40) == False
+    assert list(skip_list.iter_from(0)) == [10, 20, 30, 50]
+
+    # freed slots are reused
+    slots: int = len(skip_list._values[0])
+
+    assert skip_list.insert(45) == True
+    assert len(skip_list._values[0]) == slots
+    assert list(skip_list.iter_from(0)) == [10, 20, 30, 45, 50]
+
+    for value in [10, 20, 30, 45, 50]:
+        assert skip_list.remove(value) == True
+
+    assert len(skip_list) == 0
+    assert skip_list.current_level == -1
+
+    with pytest.raises(ValueError):
+        CompactSkipList(promotion_probability=-0.5)
+
+    with pytest.raises(ValueError):
+        CompactSkipList(max_level=-1)
+
+    with pytest.raises(ValueError):
+        CompactSkipList(typecode="u")
+
+    with pytest.raises(ValueError):
+        next(skip_list.iter_from(level=0))
+
+def test_case_2() -> None:
+    rng: random.Random = random.Random(2)
+    skip_list: CompactSkipList = CompactSkipList.from_sorted(
+        range(0, 2000, 4), promotion_probability=0.25, seed=2)
+    expected: set[int] = set(range(0, 2000, 4))
+
+    assert list(skip_list.iter_from(0)) == sorted(expected)
+
+    for _ in range(3000):
+        value: int = rng.randrange(2000)
+
+        if rng.random() < 0.5:
+            assert skip_list.insert(value) == (value not in expected)
+            expected.add(value)
+        else:
+            assert skip_list.remove(value) == (value in expected)
+            expected.discard(value)
+
+    assert len(skip_list) == len(expected)
+    assert list(skip_list.iter_from(0)) == sorted(expected)
+
+    for level in range(1, skip_list.current_level + 1):
+        values: list[int] = list(skip_list.iter_from(level))
+        assert values == sorted(values)
+        assert set(values) <= expected
+
+    for value in range(2000):
+        assert skip_list.retrieve(value) == (value in expected)
+
+    with pytest.raises(ValueError):
+        CompactSkipList.from_sorted([1, 3, 2])
+
+def test_case_3() -> None:
+    skip_list: CompactSkipList = CompactSkipList.from_sorted(
+        [0.5, 1.5, 1.5, 2.25], typecode="d")
+
+    assert len(skip_list) == 3
+    assert list(skip_list.iter_from(0)) == [0.5, 1.5, 2.25]
+    assert skip_list.insert(1.0) == True
+    assert skip_list.retrieve(1.0) == True
+    assert skip_list.retrieve(1.25) == False
+    assert list(skip_list.iter_from(0)) == [0.5, 1.0, 1.5, 2.25]
+
+def test_case_4() -> None:
+    for typecode in ("", "bB", "u", "x"):
+        with pytest.raises(ValueError):
+            CompactSkipList(typecode=typecode)
+
+    skip_list: CompactSkipList = CompactSkipList(seed=1)
+
+    for value in range(100):
+        skip_list.insert(value)
+
+    for value in range(0, 100, 2):
+        skip_list.remove(value)
+
+    level: int = skip_list.current_level
+    free: list[int] = [len(slots) for slots in skip_list._free]
+
+    # values the typecode cannot store leave the free slots as they were
+    for unstorable in (1.5, 2**63):
+        with pytest.raises((TypeError, OverflowError)):
+            skip_list.insert(unstorable)
+
+    assert [len(slots) for slots in skip_list._free] == free
+    assert skip_list.current_level == level
+    assert list(skip_list.iter_from(0)) == list(range(1, 100, 2))
+
+    for value in range(0, 100, 2):
+        skip_list.insert(value)
+
+    assert len(skip_list._free[0]) == 0
+    assert list(skip_list.iter_from(0)) == list(range(100))
+
+    empty: CompactSkipList = CompactSkipList()
+
+    with pytest.raises(TypeError):
+        empty.insert(0.5)
+
+    assert empty.current_level == -1
+    assert len(empty) == 0
@@ -0,0 +1,100 @@
+from concurrent_skip_list import ConcurrentSkipList
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import random
+import sys
+
+def test_case_1() -> None:
+    skip_list: ConcurrentSkipList[int] = ConcurrentSkipList[int](
+        promotion_probability=0.5,
+        max_level=8)
+
+    assert len(skip_list) == 0
+    assert bool(skip_list) == False
+    assert skip_list.promotion_probability == 0.5
+    assert skip_list.max_level == 8
+    assert skip_list.size == 0
+    assert skip_list.current_level == -1
+    assert skip_list.retrieve(1) == False
+    assert skip_list.remove(1) == False
+
+    for value in [5, 1, 9, 3, 7]:
+        assert skip_list.insert(value) == True
+
+    assert skip_list.insert(5) == False
+    assert len(skip_list) == 5
+    assert bool(skip_list) == True
+    assert list(skip_list.iter_from(0)) == [1, 3, 5, 7, 9]
+
+    for level in range(1, skip_list.current_level + 1):
+        values: list[int] = list(skip_list.iter_from(level))
+        assert values == sorted(values)
+
+    assert skip_list.retrieve(7) == True
+    assert skip_list.retrieve(4) == False
+    assert skip_list.remove(7) == True
+    assert skip_list.remove(7) == False
+    assert skip_list.retrieve(7) == False
+    assert list(skip_list.iter_from(0)) == [1, 3, 5, 9]
+
+    for value in [1, 3, 5, 9]:
+        assert skip_list.remove(value) == True
+
+    assert len(skip_list) == 0
+    assert list(skip_list.iter_from(0)) == []
+
+    with pytest.raises(ValueError):
+        ConcurrentSkipList[int](promotion_probability=2.0)
+
+    with pytest.raises(ValueError):
+        ConcurrentSkipList[int](max_level=-1)
+
+    with pytest.raises(ValueError):
+        next(skip_list.iter_from(level=-1))
+
+def test_case_2() -> None:
+    # switch threads as often as possible to shake out races
+    switch_interval: float = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    try:
+        skip_list: ConcurrentSkipList[int] = ConcurrentSkipList[int]()
+        threads: int = 8
+
+        def insert_then_remove(seed: int) -> tuple[int, int]:
+            rng: random.Random = random.Random(seed)
+            values: list[int] = rng.sample(range(2000), 1000)
+            inserted: int = sum(skip_list.insert(value) for value in values)
+            removed: int = sum(
+                skip_list.remove(value) for value in values if value % 3 == 0)
+
+            return inserted, removed
+
+        with ThreadPoolExecutor(threads) as executor:
+            results: list[tuple[int, int]] = \
+                list(executor.map(insert_then_remove, range(threads)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    inserted_values: set[int] = set()
+
+    for seed in range(threads):
+        inserted_values |= set(random.Random(seed).sample(range(2000), 1000))
+
+    expected: list[int] = \
+        sorted(value for value in inserted_values if value % 3 != 0)
+
+    # values may be removed then inserted again by other threads,
+    # yet every successful insert is matched by at most one removal
+    assert sum(inserted for inserted, _ in results) - \
+        sum(removed for _, removed in results) == len(expected)
+    assert len(skip_list) == len(expected)
+    assert list(skip_list.iter_from(0)) == expected
+
+    for level in range(1, skip_list.current_level + 1):
+        values: list[int] = list(skip_list.iter_from(level))
+        assert values == sorted(values)
+        assert set(values) <= set(expected)
+
+    for value in range(2000):
+        assert skip_list.retrieve(value) == (value in expected)
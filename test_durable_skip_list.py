@@ -0,0 +1,204 @@
+from durable_skip_list import DurableSkipList
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+import os
+import pickle
+import pytest
+import time
+
+def test_case_1(tmp_path: Path) -> None:
+    with DurableSkipList[int](tmp_path, max_level=8) as skip_list:
+        assert len(skip_list) == 0
+        assert bool(skip_list) == False
+        assert skip_list.sync_policy == "always"
+
+        for value in [5, 1, 9, 3, 7]:
+            assert skip_list.insert(value) == True
+
+        assert skip_list.insert(5) == False
+        assert skip_list.remove(9) == True
+        assert skip_list.remove(9) == False
+        assert skip_list.retrieve(3) == True
+        assert list(skip_list) == [1, 3, 5, 7]
+
+    # only effective writes were logged
+    assert sorted(os.listdir(tmp_path)) == \
+        ["snapshot-00000000", "wal-00000000.log"]
+
+    with DurableSkipList[int](tmp_path) as skip_list:
+        assert list(skip_list) == [1, 3, 5, 7]
+        assert skip_list.skip_list.max_level == 8
+
+        skip_list.compact(wait=True)
+
+        assert sorted(os.listdir(tmp_path)) == \
+            ["snapshot-00000001", "wal-00000001.log"]
+        assert skip_list.insert(4) == True
+        assert skip_list.remove(1) == True
+
+    with DurableSkipList[int](tmp_path) as skip_list:
+        assert list(skip_list) == [3, 4, 5, 7]
+        assert skip_list.skip_list.max_level == 8
+
+        with pytest.raises(ValueError):
+            DurableSkipList[int](tmp_path, sync="never")
+
+        with pytest.raises(ValueError):
+            DurableSkipList[int](tmp_path, sync_interval=0)
+
+    with pytest.raises(ValueError):
+        skip_list.insert(1)
+
+def test_case_2(tmp_path: Path) -> None:
+    with DurableSkipList[str](tmp_path) as skip_list:
+        for value in ["a", "b", "c"]:
+            skip_list.insert(value)
+
+    segment: Path = tmp_path / "wal-00000000.log"
+    data: bytes = segment.read_bytes()
+
+    # a torn last record is dropped on recovery, and truncated
+    segment.write_bytes(data[:-3])
+
+    with DurableSkipList[str](tmp_path) as skip_list:
+        assert list(skip_list) == ["a", "b"]
+        assert skip_list.insert("d") == True
+
+    with DurableSkipList[str](tmp_path) as skip_list:
+        assert list(skip_list) == ["a", "b", "d"]
+
+    # only the last segment may end with a torn record
+    data = (tmp_path / "wal-00000000.log").read_bytes()
+    segment = tmp_path / "wal-00000001.log"
+    segment.write_bytes(data)
+    (tmp_path / "wal-00000000.log").write_bytes(data[:-3])
+
+    with pytest.raises(ValueError):
+        DurableSkipList[str](tmp_path)
+
+def test_case_3(tmp_path: Path) -> None:
+    for sync in ("group", "interval"):
+        directory: Path = tmp_path / sync
+
+        with DurableSkipList[int](
+                directory, sync=sync, sync_interval=0.01) as skip_list:
+            def write(start: int) -> None:
+                for value in range(start, 2000, 4):
+                    assert skip_list.insert(value) == True
+
+                    if value % 3 == 0:
+                        assert skip_list.remove(value) == True
+
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(write, range(4)))
+                # compacting while writers keep writing
+                skip_list.compact()
+
+            if sync == "interval":
+                time.sleep(0.05)
+
+        with DurableSkipList[int](directory) as skip_list:
+            assert list(skip_list) == \
+                [value for value in range(2000) if value % 3 != 0]
+
+def test_case_4(tmp_path: Path) -> None:
+    # options not recorded in snapshots apply on every open
+    with DurableSkipList[int](
+            tmp_path, indexed=True, reverse=True, adaptive=True) as skip_list:
+        for value in [3, 1, 2]:
+            assert skip_list.insert(value) == True
+
+        assert list(skip_list) == [3, 2, 1]
+        assert skip_list.skip_list.adaptive
+
+    # reverse is recorded in snapshots, adaptive is not
+    with DurableSkipList[int](tmp_path) as skip_list:
+        assert list(skip_list) == [3, 2, 1]
+        assert not skip_list.skip_list.adaptive
+        assert skip_list.skip_list.indexed
+        assert skip_list.insert(5) == True
+        skip_list.compact(wait=True)
+
+    with DurableSkipList[int](
+            tmp_path, indexed=False, reverse=True) as skip_list:
+        assert list(skip_list) == [5, 3, 2, 1]
+        # recorded when the directory was created
+        assert skip_list.skip_list.indexed
+
+def test_case_5(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args: object) -> None:
+        raise OSError("disk full")
+
+    skip_list: DurableSkipList[int] = DurableSkipList[int](tmp_path)
+    skip_list.insert(1)
+    monkeypatch.setattr(DurableSkipList, "_write_snapshot", fail)
+    skip_list.compact()
+
+    # the failure of the background compaction is raised once
+    with pytest.raises(OSError):
+        skip_list.insert(2)
+
+    assert skip_list.insert(3) == True
+    skip_list.compact()
+
+    with pytest.raises(OSError):
+        skip_list.close()
+
+    with pytest.raises(ValueError):
+        skip_list.insert(4)
+
+    monkeypatch.undo()
+
+    # nothing was lost, the log still covering every write
+    with DurableSkipList[int](tmp_path) as skip_list:
+        assert list(skip_list) == [1, 3]
+
+class FailingFile:
+    """
+    Wraps a segment file, failing every write.
+    """
+
+    def __init__(self, file: Any) -> None:
+        self.file = file
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.file, name)
+
+    def write(self, data: bytes) -> int:
+        raise OSError("disk full")
+
+def test_case_6(tmp_path: Path) -> None:
+    class Local(int):
+        """
+        A comparable value pickle cannot find by name.
+        """
+
+    with DurableSkipList[int](tmp_path) as skip_list:
+        skip_list.insert(1)
+        skip_list.insert(2)
+
+        # nothing changes when the value cannot be logged
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            skip_list.insert(Local(3))
+
+        assert len(skip_list) == 2
+        assert skip_list.retrieve(3) == False
+
+        # nor when the record cannot be written
+        file: Any = skip_list._file
+        skip_list._file = FailingFile(file)
+
+        with pytest.raises(OSError):
+            skip_list.insert(4)
+
+        with pytest.raises(OSError):
+            skip_list.remove(1)
+
+        skip_list._file = file
+
+        assert list(skip_list) == [1, 2]
+        assert skip_list.insert(5) == True
+
+    with DurableSkipList[int](tmp_path) as skip_list:
+        assert list(skip_list) == [1, 2, 5]
@@ -0,0 +1,110 @@
+from instrumented_skip_list import InstrumentedSkipList, SkipListStats
+from skip_list import SkipList
+import pytest
+import random
+
+def test_case_1() -> None:
+    skip_list: InstrumentedSkipList[int] = InstrumentedSkipList[int](
+        promotion_probability=0.5, max_level=8, seed=1)
+    stats: SkipListStats = skip_list.stats()
+
+    assert stats.inserts == 0
+    assert stats.descents == 0
+    assert stats.comparisons_per_descent == 0.0
+    assert stats.hops_per_descent == 0.0
+    assert stats.level_histogram == ()
+
+    for value in [5, 1, 9, 3, 7]:
+        assert skip_list.insert(value) == True
+
+    assert skip_list.insert(5) == False
+    assert skip_list.remove(9) == True
+    assert skip_list.remove(4) == False
+    assert skip_list.retrieve(3) == True
+    assert skip_list.retrieve(4) == False
+    assert list(skip_list.iter_from(0)) == [1, 3, 5, 7]
+
+    stats = skip_list.stats()
+
+    assert stats.inserts == 6
+    assert stats.duplicate_inserts == 1
+    assert stats.removes == 2
+    assert stats.retrieves == 2
+    assert stats.descents == 10
+    assert stats.comparisons > 0
+    assert 0 < stats.hops < stats.comparisons
+    assert sum(stats.level_histogram) == 4
+    assert len(stats.expected_level_histogram) == \
+        len(stats.level_histogram) == skip_list.current_level + 1
+    assert stats.expected_level_histogram[0] == 2.0
+
+    # values are never replaced by the probes counting comparisons
+    assert all(type(value) is int for value in skip_list.iter_from(0))
+    assert skip_list.floor(4) == 3
+    assert skip_list.stats().descents == 11
+
+    skip_list.reset_stats()
+
+    assert skip_list.stats().inserts == 0
+    assert skip_list.stats().comparisons == 0
+    assert sum(skip_list.stats().level_histogram) == 4
+
+def test_case_2() -> None:
+    rng: random.Random = random.Random(2)
+    values: list[int] = rng.sample(range(100000), 20000)
+    skip_list: InstrumentedSkipList[int] = \
+        InstrumentedSkipList[int](promotion_probability=0.25, seed=2)
+
+    for value in values:
+        skip_list.insert(value)
+
+    stats: SkipListStats = skip_list.stats()
+
+    # heights follow the geometric distribution
+    for level in range(3):
+        assert stats.level_histogram[level] == \
+            pytest.approx(stats.expected_level_histogram[level], rel=0.1)
+
+    # a descent costs O(log n) comparisons
+    assert stats.comparisons_per_descent < 60
+
+    skip_list.reset_stats()
+    probes: list[int] = sorted(rng.sample(range(100000), 1000))
+    skip_list.contains_many(probes)
+
+    # finger searches between close values are cheaper than descents
+    assert skip_list.stats().descents == 1000
+    assert skip_list.stats().comparisons_per_descent < \
+        stats.comparisons_per_descent
+
+    # a plain SkipList carries no counters at all
+    assert not hasattr(SkipList[int](), "_comparisons")
+
+def test_case_3() -> None:
+    skip_list: InstrumentedSkipList[int] = InstrumentedSkipList[int](
+        indexed=True, seed=3)
+    skip_list.insert_many(range(1000))
+    skip_list.reset_stats()
+
+    assert skip_list.index(500) == 500
+    assert skip_list.bisect_right(10) == 11
+    assert skip_list.count_range(100, 200) == 100
+
+    stats: SkipListStats = skip_list.stats()
+
+    # one descent per bound of count_range()
+    assert stats.descents == 4
+    assert stats.comparisons > 0
+    assert stats.hops > 0
+
+    skip_list.reset_stats()
+
+    assert skip_list[750] == 750
+    assert skip_list.quantile(0.5) == 499
+
+    stats = skip_list.stats()
+
+    # positional descents compare no values
+    assert stats.descents == 2
+    assert stats.comparisons == 0
+    assert 0 < stats.hops_per_descent < 60
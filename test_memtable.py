@@ -0,0 +1,89 @@
+from memtable import Memtable, SortedRun
+from pathlib import Path
+import pytest
+import random
+
+def test_case_1(tmp_path: Path) -> None:
+    with Memtable[int, str](tmp_path, threshold=3, max_frozen=1) as memtable:
+        memtable[1] = "a"
+        memtable[2] = "b"
+
+        assert len(memtable.frozen) == 0
+        assert memtable.get(1) == "a"
+
+        memtable[3] = "c"
+
+        # frozen once the threshold is hit
+        assert len(memtable.active) == 0
+        assert len(memtable.frozen) == 1
+        assert memtable.frozen[0].frozen == True
+
+        memtable[1] = "A"
+        del memtable[2]
+        memtable[4] = "d"
+
+        # the oldest frozen SkipMap was flushed to a run
+        assert len(memtable.frozen) == 1
+        assert len(memtable.runs) == 1
+        assert list(memtable.runs[0]) == [(1, "a"), (2, "b"), (3, "c")]
+
+        assert memtable[1] == "A"
+        assert 2 not in memtable
+        assert memtable.get(2, "-") == "-"
+        assert memtable[3] == "c"
+        assert list(memtable.items()) == [(1, "A"), (3, "c"), (4, "d")]
+
+        with pytest.raises(KeyError):
+            memtable[2]
+
+        memtable[2] = "B"
+        del memtable[3]
+        memtable.flush()
+
+        assert len(memtable.frozen) == 0
+        assert len(memtable.runs) == 3
+        assert list(memtable) == [1, 2, 4]
+        assert list(memtable.runs[0]) == [(2, "B"), (3,)]
+
+    # runs survive the memtable
+    with Memtable[int, str](tmp_path) as memtable:
+        assert list(memtable.items()) == [(1, "A"), (2, "B"), (4, "d")]
+        memtable[5] = "e"
+        memtable.flush()
+
+        assert len(memtable.runs) == 4
+
+    path: Path = tmp_path / "run-00000000.run"
+    data: bytes = path.read_bytes()
+    path.write_bytes(data[:10] + b"?" + data[11:])
+
+    with pytest.raises(ValueError):
+        SortedRun(path)
+
+    with pytest.raises(ValueError):
+        Memtable[int, str](tmp_path, threshold=0)
+
+def test_case_2(tmp_path: Path) -> None:
+    rng: random.Random = random.Random(3)
+    expected: dict[int, int] = {}
+
+    with Memtable[int, int](tmp_path, threshold=50, max_frozen=2) as memtable:
+        for step in range(2000):
+            key: int = rng.randrange(300)
+
+            if rng.random() < 0.3:
+                del memtable[key]
+                expected.pop(key, None)
+            else:
+                memtable[key] = step
+                expected[key] = step
+
+        assert len(memtable.runs) > 5
+        assert list(memtable.items()) == sorted(expected.items())
+
+        for key in range(300):
+            assert memtable.get(key) == expected.get(key)
+
+    # sorted runs only hold keys in their natural order
+    with pytest.raises(TypeError):
+        Memtable[int, int](tmp_path, reverse=True)
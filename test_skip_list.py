@@ -1,5 +1,9 @@
-from skip_list import SkipList
+from skip_list import SkipList, merge_many
+from typing import Iterator, cast
+from fractions import Fraction
+import math
 import pytest
+import random
 
 def patch_random(
         monkeypatch: pytest.MonkeyPatch, values: list[float]) -> None:
@@ -11,6 +15,48 @@ def patch_random(
     it = iter(values)
     monkeypatch.setattr("skip_list.random.random", lambda: next(it))
 
+def check_widths(skip_list: SkipList[int]) -> None:
+    """
+    Check every link width of an indexed skip list against
+    the positions of the nodes it joins.
+    """
+
+    positions: dict[int, int] = {
+        id(skip_list._head): 0,
+        id(None): len(skip_list) + 1,
+    }
+    node: SkipList.Node | None = skip_list._head.forward[0]
+    position: int = 1
+
+    while node is not None:
+        positions[id(node)] = position
+        position += 1
+        node = node.forward[0]
+
+    for level in range(skip_list.current_level + 1):
+        node = skip_list._head
+
+        while node is not None:
+            assert cast(list[int], node.width)[level] == \
+                positions[id(node.forward[level])] - positions[id(node)]
+            node = node.forward[level]
+
+def check_backward(skip_list: SkipList[int]) -> None:
+    """
+    Check the backward pointers and the tail of a skip list
+    against its level 0 forward pointers.
+    """
+
+    prev: SkipList.Node | None = None
+    node: SkipList.Node | None = skip_list._head.forward[0]
+
+    while node is not None:
+        assert node.backward is prev
+        prev = node
+        node = node.forward[0]
+
+    assert skip_list._tail is prev
+
 def test_case_1(monkeypatch: pytest.MonkeyPatch) -> None:
     skip_list: SkipList[int] = SkipList[int]()
 
@@ -815,3 +861,1069 @@ def test_case_6() -> None:
 
     with pytest.raises(ValueError):
         next(SkipList[int]().iter_from(level=1))
+
+def test_case_7(monkeypatch: pytest.MonkeyPatch) -> None:
+    skip_list: SkipList[int] = SkipList[int](
+        promotion_probability=0.5,
+        max_level=32)
+
+    patch_random(monkeypatch, [0.1, 0.2, 0.9, 0.7, 0.3, 0.6, 0.4, 0.4, 0.4, 1])
+
+    assert skip_list.insert(10) == True
+    assert skip_list.insert(20) == True
+    assert skip_list.insert(30) == True
+    assert skip_list.insert(40) == True
+
+    #           Skip list status
+    #
+    # Level 3:  [Head] ------------------------> [40] -> [None]
+    #              |                              |
+    # Level 2:  [Head] -> [10] ----------------> [40] -> [None]
+    #              |        |                     |
+    # Level 1:  [Head] -> [10] ---------> [30] -> [40] -> [None]
+    #              |        |               |     |
+    # Level 0:  [Head] -> [10] -> [20] -> [30] -> [40] -> [None]
+
+    assert skip_list.current_level == 3
+    assert len(skip_list._head.forward) == skip_list.max_level + 1
+
+    # nodes only allocate forward slots for their own tower
+    node: SkipList.Node | None = skip_list._head.forward[0]
+    heights: list[int] = []
+
+    while node is not None:
+        assert len(node.forward) == node.current_level + 1
+        heights.append(node.current_level)
+        node = node.forward[0]
+
+    assert heights == [2, 0, 1, 3]
+    assert list(skip_list.iter_from(0)) == [10, 20, 30, 40]
+    assert list(skip_list.iter_from(1)) == [10, 30, 40]
+    assert list(skip_list.iter_from(2)) == [10, 40]
+    assert list(skip_list.iter_from(3)) == [40]
+
+    assert skip_list.remove(40) == True
+    assert skip_list.current_level == 2
+    assert list(skip_list.iter_from(2)) == [10]
+    assert skip_list.remove(10) == True
+    assert skip_list.current_level == 1
+    assert list(skip_list.iter_from(0)) == [20, 30]
+    assert list(skip_list.iter_from(1)) == [30]
+    assert skip_list.retrieve(30) == True
+    assert skip_list.retrieve(10) == False
+
+def test_case_8(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_random(monkeypatch, [0.1, 0.2, 0.9, 0.7, 0.3, 0.6, 0.4, 0.4, 0.4, 1])
+
+    skip_list: SkipList[int] = SkipList[int].from_sorted(
+        [10, 20, 20, 30, 40, 40, 40], promotion_probability=0.5, max_level=5)
+
+    #           Skip list status
+    #
+    # Level 3:  [Head] ------------------------> [40] -> [None]
+    #              |                              |
+    # Level 2:  [Head] -> [10] ----------------> [40] -> [None]
+    #              |        |                     |
+    # Level 1:  [Head] -> [10] ---------> [30] -> [40] -> [None]
+    #              |        |               |     |
+    # Level 0:  [Head] -> [10] -> [20] -> [30] -> [40] -> [None]
+
+    assert len(skip_list) == 4
+    assert skip_list.promotion_probability == 0.5
+    assert skip_list.max_level == 5
+    assert skip_list.current_level == 3
+    assert len(skip_list._head.forward) == skip_list.max_level + 1
+    assert list(skip_list.iter_from(0)) == [10, 20, 30, 40]
+    assert list(skip_list.iter_from(1)) == [10, 30, 40]
+    assert list(skip_list.iter_from(2)) == [10, 40]
+    assert list(skip_list.iter_from(3)) == [40]
+    assert skip_list.retrieve(30) == True
+    assert skip_list.retrieve(35) == False
+
+    patch_random(monkeypatch, [0.9])
+
+    assert skip_list.insert(35) == True
+    assert list(skip_list.iter_from(0)) == [10, 20, 30, 35, 40]
+    assert skip_list.remove(40) == True
+    assert skip_list.current_level == 2
+
+    skip_list = SkipList[int].from_sorted([])
+
+    assert len(skip_list) == 0
+    assert skip_list.current_level == -1
+    assert skip_list._head.forward[0] is None
+
+    patch_random(monkeypatch, [0.9, 0.9])
+
+    with pytest.raises(ValueError):
+        SkipList[int].from_sorted([1, 3, 2])
+
+    with pytest.raises(ValueError):
+        SkipList[int].from_sorted([1], max_level=-1)
+
+def test_case_9() -> None:
+    values: list[int] = [5, 3, 9, 3, 1, 9, 7, 5]
+    skip_list: SkipList[int] = SkipList[int].from_iterable(
+        values, promotion_probability=0.25)
+
+    assert len(skip_list) == 5
+    assert skip_list.promotion_probability == 0.25
+    assert list(skip_list.iter_from(0)) == [1, 3, 5, 7, 9]
+
+    for level in range(1, skip_list.current_level + 1):
+        assert list(skip_list.iter_from(level)) == \
+            sorted(skip_list.iter_from(level))
+
+    for value in values:
+        assert skip_list.retrieve(value) == True
+
+    assert skip_list.retrieve(4) == False
+
+def test_case_10() -> None:
+    skip_list: SkipList[int] = SkipList[int].from_sorted(
+        [10, 20, 30, 40, 50])
+
+    assert list(skip_list.irange()) == [10, 20, 30, 40, 50]
+    assert list(skip_list.irange(20, 40)) == [20, 30]
+    assert list(skip_list.irange(20, 40, inclusive=(False, True))) == [30, 40]
+    assert list(skip_list.irange(20, 40, inclusive=(True, True))) == \
+        [20, 30, 40]
+    assert list(skip_list.irange(20, 40, inclusive=(False, False))) == [30]
+    assert list(skip_list.irange(15, 45)) == [20, 30, 40]
+    assert list(skip_list.irange(lo=35)) == [40, 50]
+    assert list(skip_list.irange(hi=35)) == [10, 20, 30]
+    assert list(skip_list.irange(60, 70)) == []
+    assert list(skip_list.irange(40, 20)) == []
+    assert list(skip_list.irange(20, 40, reverse=True)) == [30, 20]
+    assert list(skip_list.irange(reverse=True)) == [50, 40, 30, 20, 10]
+
+    assert skip_list.floor(30) == 30
+    assert skip_list.floor(35) == 30
+    assert skip_list.floor(5) is None
+    assert skip_list.floor(99) == 50
+    assert skip_list.ceiling(30) == 30
+    assert skip_list.ceiling(35) == 40
+    assert skip_list.ceiling(5) == 10
+    assert skip_list.ceiling(51) is None
+    assert skip_list.lower(30) == 20
+    assert skip_list.lower(10) is None
+    assert skip_list.lower(11) == 10
+    assert skip_list.higher(30) == 40
+    assert skip_list.higher(50) is None
+    assert skip_list.higher(49) == 50
+
+    skip_list = SkipList[int]()
+
+    assert list(skip_list.irange(1, 2)) == []
+    assert skip_list.floor(1) is None
+    assert skip_list.ceiling(1) is None
+    assert skip_list.lower(1) is None
+    assert skip_list.higher(1) is None
+
+def test_case_11(monkeypatch: pytest.MonkeyPatch) -> None:
+    skip_list: SkipList[int] = SkipList[int](indexed=True)
+
+    assert skip_list.indexed == True
+
+    patch_random(monkeypatch, [0.1, 0.2, 0.9, 0.7, 0.3, 0.6, 0.4, 0.4, 0.4, 1])
+
+    assert skip_list.insert(10) == True
+    assert skip_list.insert(20) == True
+    assert skip_list.insert(30) == True
+    assert skip_list.insert(40) == True
+    assert skip_list.insert(40) == False
+
+    #           Skip list status (link widths)
+    #
+    # Level 3:  [Head] ---------------4--------> [40] -1-> [None]
+    #              |                              |
+    # Level 2:  [Head] -1-> [10] ----------3---> [40] -1-> [None]
+    #              |        |                     |
+    # Level 1:  [Head] -1-> [10] -----2---> [30] -1-> [40] -1-> [None]
+    #              |        |               |     |
+    # Level 0:  [Head] -1-> [10] -1-> [20] -1-> [30] -1-> [40] -1-> [None]
+
+    assert skip_list._head.width == [1, 1, 1, 4] + [0] * 29
+    check_widths(skip_list)
+
+    assert skip_list[0] == 10
+    assert skip_list[3] == 40
+    assert skip_list[-1] == 40
+    assert skip_list[-4] == 10
+    assert skip_list[1:3] == [20, 30]
+    assert skip_list[::2] == [10, 30]
+    assert skip_list[::-1] == [40, 30, 20, 10]
+    assert skip_list[-1:0:-2] == [40, 20]
+    assert skip_list[5:] == []
+    assert skip_list.index(10) == 0
+    assert skip_list.index(30) == 2
+    assert skip_list.bisect_left(30) == 2
+    assert skip_list.bisect_right(30) == 3
+    assert skip_list.bisect_left(35) == 3
+    assert skip_list.bisect_right(5) == 0
+    assert skip_list.bisect_left(99) == 4
+    assert skip_list.count_range() == 4
+    assert skip_list.count_range(20, 40) == 2
+    assert skip_list.count_range(20, 40, inclusive=(False, True)) == 2
+    assert skip_list.count_range(20, 40, inclusive=(True, True)) == 3
+    assert skip_list.count_range(lo=15) == 3
+    assert skip_list.count_range(40, 20) == 0
+
+    with pytest.raises(IndexError):
+        skip_list[4]
+
+    with pytest.raises(IndexError):
+        skip_list[-5]
+
+    with pytest.raises(ValueError):
+        skip_list.index(25)
+
+    assert skip_list.remove(40) == True
+    assert skip_list.current_level == 2
+    check_widths(skip_list)
+    assert skip_list[-1] == 30
+
+    assert skip_list.remove(10) == True
+    check_widths(skip_list)
+    assert skip_list[0] == 20
+    assert skip_list.index(30) == 1
+
+    with pytest.raises(ValueError):
+        SkipList[int]()[0]
+
+    with pytest.raises(ValueError):
+        SkipList[int]().bisect_left(0)
+
+def test_case_12() -> None:
+    rng: random.Random = random.Random(12)
+    expected: list[int] = sorted(rng.sample(range(1000), 300))
+    skip_list: SkipList[int] = SkipList[int].from_sorted(
+        expected, promotion_probability=0.25, indexed=True)
+
+    check_widths(skip_list)
+
+    for _ in range(600):
+        value: int = rng.randrange(1000)
+
+        if rng.random() < 0.5:
+            assert skip_list.insert(value) == (value not in expected)
+
+            if value not in expected:
+                expected.append(value)
+                expected.sort()
+        else:
+            assert skip_list.remove(value) == (value in expected)
+
+            if value in expected:
+                expected.remove(value)
+
+    check_widths(skip_list)
+
+    assert len(skip_list) == len(expected)
+    assert skip_list[:] == expected
+    assert skip_list[10:200:7] == expected[10:200:7]
+    assert skip_list[::-3] == expected[::-3]
+
+    for position, value in enumerate(expected):
+        assert skip_list[position] == value
+        assert skip_list.index(value) == position
+
+    assert skip_list.count_range(100, 700) == \
+        len([value for value in expected if 100 <= value < 700])
+
+def test_case_13() -> None:
+    rng: random.Random = random.Random(13)
+
+    for indexed in [False, True]:
+        skip_list: SkipList[int] = SkipList[int](indexed=indexed)
+        expected: set[int] = set()
+
+        batches: list[list[int]] = [
+            list(range(0, 200, 3)),
+            list(range(300, 100, -2)),
+            rng.sample(range(400), 150),
+            sorted(rng.sample(range(400), 150)),
+        ]
+
+        for batch in batches:
+            assert skip_list.insert_many(batch) == len(set(batch) - expected)
+            expected |= set(batch)
+
+            assert list(skip_list.iter_from(0)) == sorted(expected)
+
+            if indexed:
+                check_widths(skip_list)
+
+        queries: list[int] = sorted(rng.sample(range(-10, 410), 200))
+
+        assert skip_list.contains_many(queries) == \
+            [query in expected for query in queries]
+        assert skip_list.contains_many(reversed(queries)) == \
+            [query in expected for query in reversed(queries)]
+
+        for batch in batches:
+            removals: list[int] = batch[::2]
+
+            assert skip_list.remove_many(removals) == \
+                len(set(removals) & expected)
+            expected -= set(removals)
+
+            assert list(skip_list.iter_from(0)) == sorted(expected)
+            assert len(skip_list) == len(expected)
+
+            if indexed:
+                check_widths(skip_list)
+
+        assert skip_list.remove_many(sorted(expected)) == len(expected)
+        assert len(skip_list) == 0
+        assert skip_list.current_level == -1
+        assert skip_list.insert_many([5, 1, 5, 3]) == 3
+        assert list(skip_list.iter_from(0)) == [1, 3, 5]
+        assert skip_list.contains_many([]) == []
+
+def test_case_14() -> None:
+    for indexed in [False, True]:
+        skip_list: SkipList[int] = SkipList[int].from_sorted(
+            range(0, 100, 10), indexed=indexed)
+        cursor: SkipList.Cursor = skip_list.cursor()
+
+        assert cursor.value == 0
+        assert cursor.prev() is None
+        assert cursor.next() == 10
+        assert cursor.next() == 20
+        assert cursor.value == 20
+        assert cursor.prev() == 10
+        assert cursor.seek(50) == True
+        assert cursor.value == 50
+        assert cursor.seek(45) == False
+        assert cursor.value == 50
+        assert cursor.seek(5) == False
+        assert cursor.value == 10
+        assert cursor.seek(95) == False
+        assert cursor.value is None
+        assert cursor.next() is None
+        assert cursor.prev() == 90
+
+        assert cursor.insert_here(85) == True
+        assert cursor.value == 85
+        assert cursor.insert_here(85) == False
+        assert cursor.insert_here(15) == True
+        assert cursor.next() == 20
+        assert cursor.remove_current() == 20
+        assert cursor.value == 30
+        assert cursor.remove_current() == 30
+        assert cursor.prev() == 15
+        assert list(skip_list.iter_from(0)) == \
+            [0, 10, 15, 40, 50, 60, 70, 80, 85, 90]
+
+        if indexed:
+            check_widths(skip_list)
+
+        # modifications behind the cursor's back are picked up
+        assert cursor.seek(60) == True
+        assert skip_list.remove(60) == True
+        assert skip_list.remove(50) == True
+        assert cursor.value == 70
+        assert cursor.prev() == 40
+        assert skip_list.insert(45) == True
+        assert cursor.value == 40
+        assert cursor.next() == 45
+
+        assert cursor.seek(1000) == False
+        assert skip_list.insert(1000) == True
+        assert cursor.value == 1000
+        assert cursor.prev() == 90
+        assert cursor.next() == 1000
+        assert cursor.remove_current() == 1000
+        assert cursor.value is None
+
+        with pytest.raises(ValueError):
+            cursor.remove_current()
+
+        while cursor.prev() is not None:
+            pass
+
+        while cursor.value is not None:
+            cursor.remove_current()
+
+        assert len(skip_list) == 0
+        assert skip_list.current_level == -1
+        assert cursor.insert_here(7) == True
+        assert list(skip_list.iter_from(0)) == [7]
+
+        if indexed:
+            check_widths(skip_list)
+
+        # inserted towers taller than the SkipList grow its levels
+        for seed in range(50):
+            skip_list = SkipList[int](indexed=indexed, seed=seed)
+            cursor = skip_list.cursor()
+
+            for value in range(5):
+                assert cursor.insert_here(value) == True
+                assert cursor.next() is None
+
+            assert list(skip_list.iter_from(0)) == list(range(5))
+
+def test_case_15() -> None:
+    def heights(skip_list: SkipList[int]) -> list[int]:
+        result: list[int] = []
+        node: SkipList.Node | None = skip_list._head.forward[0]
+
+        while node is not None:
+            result.append(node.current_level)
+            node = node.forward[0]
+
+        return result
+
+    for promotion_probability in [0.5, 0.25, 0.125, 0.3]:
+        lists: list[SkipList[int]] = [
+            SkipList[int].from_sorted(
+                range(2000),
+                promotion_probability=promotion_probability,
+                max_level=12,
+                seed=seed)
+            for seed in [15, 15, 16]
+        ]
+
+        # a seed makes tower heights reproducible
+        assert heights(lists[0]) == heights(lists[1])
+        assert heights(lists[0]) != heights(lists[2])
+        assert max(heights(lists[0])) <= 12
+
+        # heights follow a geometric distribution
+        counts: list[int] = [0] * 13
+
+        for height in heights(lists[0]):
+            counts[height] += 1
+
+        at_least_one: int = sum(counts[1:])
+
+        assert abs(at_least_one / 2000 - promotion_probability) < 0.05
+        assert abs(sum(counts[2:]) / at_least_one -
+                   promotion_probability) < 0.1
+
+    # levels saturate at max_level for every probability
+    assert heights(SkipList[int].from_sorted(
+        range(10), promotion_probability=1.0, max_level=3)) == [3] * 10
+    assert heights(SkipList[int].from_sorted(
+        range(10), promotion_probability=0.5, max_level=0)) == [0] * 10
+    assert heights(SkipList[int].from_sorted(
+        range(10), promotion_probability=0.0, max_level=3)) == [0] * 10
+
+def test_case_16() -> None:
+    np = pytest.importorskip("numpy")
+    skip_list: SkipList[int] = SkipList[int]()
+
+    assert skip_list.contains_array(np.array([1, 2])).tolist() == [False, False]
+    assert skip_list.rank_array(np.array([1, 2])).tolist() == [0, 0]
+
+    skip_list = SkipList[int].from_sorted(range(0, 100, 10))
+    keys = np.array([-5, 0, 5, 10, 90, 95, 100])
+
+    assert skip_list.contains_array(keys).tolist() == \
+        [False, True, False, True, True, False, False]
+    assert skip_list.rank_array(keys).tolist() == [0, 0, 1, 1, 9, 10, 10]
+
+    # the snapshot is reused until the next modification
+    snapshot = skip_list._snapshot
+
+    assert skip_list.contains_array(keys) is not None
+    assert skip_list._snapshot is snapshot
+    assert skip_list.insert(5) == True
+    assert skip_list.contains_array(keys).tolist() == \
+        [False, True, True, True, True, False, False]
+    assert skip_list._snapshot is not snapshot
+    assert skip_list.remove(90) == True
+    assert skip_list.rank_array(keys).tolist() == [0, 0, 1, 2, 10, 10, 10]
+    assert skip_list.contains_array(keys).tolist() == \
+        [False, True, True, True, False, False, False]
+
+def test_case_17(monkeypatch: pytest.MonkeyPatch) -> None:
+    import importlib
+
+    def import_module(name: str) -> None:
+        raise ImportError(f"No module named {name!r}")
+
+    monkeypatch.setattr(importlib, "import_module", import_module)
+    skip_list: SkipList[int] = SkipList[int].from_sorted([1, 2, 3])
+
+    with pytest.raises(ImportError):
+        skip_list.contains_array([1, 4])
+
+    with pytest.raises(ImportError):
+        skip_list.rank_array([1, 4])
+
+def test_case_18() -> None:
+    a: SkipList[int] = SkipList[int].from_sorted(
+        [1, 3, 5, 7, 9], promotion_probability=0.25, indexed=True)
+    b: SkipList[int] = SkipList[int].from_sorted([3, 4, 5, 6])
+    empty: SkipList[int] = SkipList[int]()
+
+    assert list((a | b).iter_from(0)) == [1, 3, 4, 5, 6, 7, 9]
+    assert list((a & b).iter_from(0)) == [3, 5]
+    assert list((a - b).iter_from(0)) == [1, 7, 9]
+    assert list((b - a).iter_from(0)) == [4, 6]
+    assert list((a ^ b).iter_from(0)) == [1, 4, 6, 7, 9]
+    assert list(a.union(empty).iter_from(0)) == [1, 3, 5, 7, 9]
+    assert len(a.intersection(empty)) == 0
+    assert len(empty.difference(a)) == 0
+    assert list(a.symmetric_difference(empty).iter_from(0)) == [1, 3, 5, 7, 9]
+
+    # results take the parameters of the left operand
+    union: SkipList[int] = a | b
+
+    assert union.promotion_probability == 0.25
+    assert union.indexed == True
+    assert union[2] == 4
+    check_widths(union)
+    assert (b | a).indexed == False
+
+    # operands are left untouched
+    assert list(a.iter_from(0)) == [1, 3, 5, 7, 9]
+    assert list(b.iter_from(0)) == [3, 4, 5, 6]
+
+    rng: random.Random = random.Random(18)
+    sets: list[set[int]] = [set(rng.sample(range(500), size))
+                            for size in (5, 200, 300)]
+    skip_lists: list[SkipList[int]] = \
+        [SkipList[int].from_iterable(values) for values in sets]
+
+    for x, y in [(0, 1), (1, 0), (1, 2), (2, 2)]:
+        assert list((skip_lists[x] | skip_lists[y]).irange()) == \
+            sorted(sets[x] | sets[y])
+        assert list((skip_lists[x] & skip_lists[y]).irange()) == \
+            sorted(sets[x] & sets[y])
+        assert list((skip_lists[x] - skip_lists[y]).irange()) == \
+            sorted(sets[x] - sets[y])
+        assert list((skip_lists[x] ^ skip_lists[y]).irange()) == \
+            sorted(sets[x] ^ sets[y])
+
+    assert list(merge_many(*skip_lists).irange()) == \
+        sorted(sets[0] | sets[1] | sets[2])
+    assert merge_many(a, b, indexed=True).indexed == True
+    assert len(merge_many()) == 0
+
+def test_case_19() -> None:
+    for indexed in [False, True]:
+        for seed in range(20):
+            rng: random.Random = random.Random(seed)
+            values: list[int] = sorted(rng.sample(range(1000), 100))
+            key: int = rng.randrange(-10, 1010)
+            skip_list: SkipList[int] = SkipList[int].from_sorted(
+                values, indexed=indexed, seed=seed)
+            version: int = skip_list._version
+            left, right = skip_list.split_at(key)
+
+            assert left is skip_list
+            assert left._version != version
+            assert list(left.irange()) == [v for v in values if v < key]
+            assert list(right.irange()) == [v for v in values if v >= key]
+            assert len(left) + len(right) == 100
+            assert len(right) == sum(v >= key for v in values)
+            assert right.indexed == indexed
+
+            for part in (left, right):
+                assert part.current_level == -1 if not part \
+                    else part._head.forward[part.current_level] is not None
+                assert all(part._head.forward[level] is None for level in
+                           range(part.current_level + 1, part.max_level + 1))
+
+                if indexed:
+                    check_widths(part)
+
+            # still usable after the cut
+            assert left.insert(key - 1000) == True
+            assert right.insert(2000) == True
+            assert left.remove(key - 1000) == True
+            assert right.remove(2000) == True
+
+            assert left.concat(right) is left
+            assert len(right) == 0
+            assert right.current_level == -1
+            assert list(left.irange()) == values
+            assert len(left) == 100
+
+            if indexed:
+                check_widths(left)
+                assert [left[i] for i in range(100)] == values
+
+            assert right.insert(5) == True
+
+    a: SkipList[int] = SkipList[int].from_sorted([1, 2, 3])
+
+    with pytest.raises(ValueError):
+        a.concat(SkipList[int].from_sorted([3, 4]))
+
+    with pytest.raises(ValueError):
+        a.concat(SkipList[int].from_sorted([4], indexed=True))
+
+    with pytest.raises(ValueError):
+        a.concat(SkipList[int].from_sorted(range(10, 100), max_level=64,
+                                           promotion_probability=1.0))
+
+    assert list(a.concat(SkipList[int]()).irange()) == [1, 2, 3]
+    empty: SkipList[int] = SkipList[int](indexed=True)
+
+    assert list(empty.concat(SkipList[int].from_sorted(
+        [4, 5], indexed=True)).irange()) == [4, 5]
+    check_widths(empty)
+    assert [len(part) for part in SkipList[int]().split_at(1)] == [0, 0]
+
+def test_case_20() -> None:
+    bounds: list[tuple[int | None, int | None]] = \
+        [(None, None), (None, 50), (30, None), (30, 70), (31, 69),
+         (50, 50), (70, 30), (-10, 5), (95, 200), (200, 300)]
+
+    for indexed in [False, True]:
+        for lo, hi in bounds:
+            for inclusive in [(True, False), (False, True),
+                              (True, True), (False, False)]:
+                skip_list: SkipList[int] = SkipList[int].from_sorted(
+                    range(0, 100, 2), indexed=indexed)
+                removed: list[int] = \
+                    list(skip_list.irange(lo, hi, inclusive))
+                version: int = skip_list._version
+
+                assert skip_list.remove_range(lo, hi, inclusive) == \
+                    len(removed)
+                assert list(skip_list.irange()) == \
+                    [v for v in range(0, 100, 2) if v not in removed]
+                assert len(skip_list) == 50 - len(removed)
+                assert (skip_list._version != version) == bool(removed)
+                assert skip_list.current_level == -1 if not skip_list \
+                    else skip_list._head.forward[
+                        skip_list.current_level] is not None
+
+                if indexed:
+                    check_widths(skip_list)
+
+        skip_list = SkipList[int].from_sorted(
+            range(1, 6), indexed=indexed)
+
+        assert skip_list.pop_min() == 1
+        assert skip_list.pop_max() == 5
+        assert skip_list.pop_min_n(2) == [2, 3]
+        assert skip_list.pop_min_n(0) == []
+        assert skip_list.pop_min_n(5) == [4]
+        assert len(skip_list) == 0
+        assert skip_list.current_level == -1
+        assert skip_list.remove_range() == 0
+
+        with pytest.raises(IndexError):
+            skip_list.pop_min()
+
+        with pytest.raises(IndexError):
+            skip_list.pop_max()
+
+        with pytest.raises(ValueError):
+            skip_list.pop_min_n(-1)
+
+        # as a priority queue
+        rng: random.Random = random.Random(20)
+        values: list[int] = rng.sample(range(10000), 500)
+        skip_list.insert_many(values)
+        popped: list[int] = []
+
+        while skip_list:
+            popped += skip_list.pop_min_n(rng.randrange(1, 40))
+
+            if indexed:
+                check_widths(skip_list)
+
+        assert popped == sorted(values)
+
+def test_case_21() -> None:
+    for indexed in [False, True]:
+        rng: random.Random = random.Random(21)
+        skip_list: SkipList[int] = SkipList[int].from_sorted(
+            range(0, 200, 2), indexed=indexed)
+        check_backward(skip_list)
+
+        assert skip_list.min() == 0
+        assert skip_list.max() == 198
+        assert list(reversed(skip_list)) == list(range(198, -1, -2))
+        assert list(skip_list.irange(10, 20, reverse=True)) == \
+            [18, 16, 14, 12, 10]
+        assert list(skip_list.irange(9, 21, (False, True), reverse=True)) == \
+            [20, 18, 16, 14, 12, 10]
+        assert list(skip_list.irange(10, 20, (False, True), reverse=True)) == \
+            [20, 18, 16, 14, 12]
+        assert list(skip_list.irange(hi=5, reverse=True)) == [4, 2, 0]
+        assert list(skip_list.irange(lo=194, reverse=True)) == [198, 196, 194]
+        assert list(skip_list.irange(hi=0, reverse=True)) == []
+        assert list(skip_list.irange(50, 40, reverse=True)) == []
+
+        # the latest values are reached without a scan
+        latest: Iterator[int] = reversed(skip_list)
+
+        assert [next(latest) for _ in range(3)] == [198, 196, 194]
+
+        for _ in range(300):
+            value: int = rng.randrange(-10, 210)
+
+            if rng.random() < 0.5:
+                skip_list.insert(value)
+            else:
+                skip_list.remove(value)
+
+            check_backward(skip_list)
+
+        assert list(reversed(skip_list)) == \
+            list(reversed(list(skip_list.irange())))
+        assert skip_list.max() == max(skip_list.irange())
+        assert skip_list.min() == min(skip_list.irange())
+
+        skip_list.remove_range(50, 100)
+        check_backward(skip_list)
+        skip_list.remove_range(150)
+        check_backward(skip_list)
+        skip_list.pop_min_n(5)
+        check_backward(skip_list)
+        skip_list.pop_max()
+        check_backward(skip_list)
+
+        left, right = skip_list.split_at(120)
+        check_backward(left)
+        check_backward(right)
+
+        assert right.min() >= 120 > left.max()
+
+        left.concat(right)
+        check_backward(left)
+        check_backward(right)
+
+        cursor: SkipList.Cursor = left.cursor()
+        cursor.seek(100)
+        cursor.insert_here(101)
+        cursor.remove_current()
+        check_backward(left)
+
+        while left:
+            left.pop_max()
+            check_backward(left)
+
+        with pytest.raises(ValueError):
+            left.min()
+
+        with pytest.raises(ValueError):
+            left.max()
+
+        assert list(reversed(left)) == []
+
+def test_case_22() -> None:
+    for indexed in (False, True):
+        rng: random.Random = random.Random(22)
+        skip_list: SkipList[int] = \
+            SkipList[int](indexed=indexed, seed=22, adaptive=True)
+
+        # the head starts with a single slot
+        assert skip_list.adaptive
+        assert skip_list.level_cap == 0
+        assert len(skip_list._head.forward) == 1
+
+        values: list[int] = rng.sample(range(100_000), 5000)
+
+        for value in values:
+            skip_list.insert(value)
+
+        # floor(log2(5000)) + 1
+        assert skip_list.level_cap == 13
+        assert len(skip_list._head.forward) == 14
+        assert skip_list.current_level <= 13
+        assert list(skip_list.irange()) == sorted(values)
+
+        if indexed:
+            check_widths(skip_list)
+
+        for value in values[:4900]:
+            skip_list.remove(value)
+
+        # the cap only grows until rebalanced
+        assert skip_list.level_cap == 13
+
+        skip_list.rebalance()
+
+        assert skip_list.level_cap == 7
+        assert len(skip_list._head.forward) == 8
+        assert skip_list.current_level <= 7
+        assert list(skip_list.irange()) == sorted(values[4900:])
+        check_backward(skip_list)
+
+        if indexed:
+            check_widths(skip_list)
+            assert [skip_list[index] for index in range(100)] == \
+                sorted(values[4900:])
+
+        # towers of another SkipList make the head grow
+        other: SkipList[int] = SkipList[int].from_sorted(
+            range(200_000, 201_000), indexed=indexed, max_level=12)
+        other_level: int = other.current_level
+        skip_list.concat(other)
+
+        assert len(skip_list._head.forward) >= other_level + 1
+        assert skip_list.level_cap == 11
+        check_backward(skip_list)
+
+        if indexed:
+            check_widths(skip_list)
+
+        left, right = skip_list.split_at(100_000)
+
+        assert right.adaptive and len(right) == 1000
+        assert right.level_cap == 10
+        assert list(right.irange()) == list(range(200_000, 201_000))
+
+        if indexed:
+            check_widths(left)
+            check_widths(right)
+
+    # built in bulk, then capped by max_level
+    built: SkipList[int] = \
+        SkipList[int].from_sorted(range(1000), adaptive=True, max_level=4)
+
+    assert built.level_cap == 4
+    assert len(built._head.forward) == 5
+
+    built = SkipList[int].from_sorted(range(1000), adaptive=True)
+
+    assert built.level_cap == 10
+    assert built.current_level <= 10
+
+    # without adaptive, the head spans max_level
+    fixed: SkipList[int] = SkipList[int](max_level=8)
+    fixed.insert_many(range(100))
+    fixed.rebalance()
+
+    assert fixed.level_cap == 8 and not fixed.adaptive
+    assert len(fixed._head.forward) == 9
+    assert list(fixed.irange()) == list(range(100))
+    check_backward(fixed)
+
+    fixed.freeze()
+
+    with pytest.raises(ValueError):
+        fixed.rebalance()
+
+def test_case_23() -> None:
+    rng: random.Random = random.Random(23)
+    # (name, score) records ordered by score, names breaking no ties
+    records: list[tuple[str, int]] = [
+        (f"record {index}", score) for index, score in
+        enumerate(rng.sample(range(1000), 200))]
+
+    def score(record: tuple[str, int]) -> int:
+        return record[1]
+
+    for indexed in (False, True):
+        for reverse in (False, True):
+            expected: list[tuple[str, int]] = \
+                sorted(records, key=score, reverse=reverse)
+            skip_list: SkipList[tuple[str, int]] = SkipList[
+                tuple[str, int]](indexed=indexed, key=score, reverse=reverse)
+
+            for record in records:
+                assert skip_list.insert(record)
+
+            # keys are computed once, then cached in the nodes
+            assert skip_list._head.forward[0] is not None
+            assert skip_list._head.forward[0].value == expected[0]
+            assert list(skip_list.irange()) == expected
+            assert list(reversed(skip_list)) == expected[::-1]
+            assert skip_list.min() == expected[0]
+            assert skip_list.max() == expected[-1]
+            check_backward(cast(SkipList[int], skip_list))
+
+            if indexed:
+                check_widths(cast(SkipList[int], skip_list))
+
+            # equal keys are the same value, lookups take keys
+            first: tuple[str, int] = expected[0]
+
+            assert not skip_list.insert(("duplicate", first[1]))
+            assert skip_list.retrieve(cast(tuple[str, int], first[1]))
+            assert not skip_list.retrieve(cast(tuple[str, int], 1000))
+
+            lookup: SkipList[tuple[str, int]] = skip_list
+            scores: list[int] = [record[1] for record in expected]
+            middle: int = scores[100]
+
+            assert lookup.ceiling(cast(tuple[str, int], middle)) == \
+                expected[100]
+            assert lookup.higher(cast(tuple[str, int], middle)) == \
+                expected[101]
+            assert lookup.lower(cast(tuple[str, int], middle)) == \
+                expected[99]
+            assert list(lookup.irange(
+                cast(tuple[str, int], scores[10]),
+                cast(tuple[str, int], scores[20]))) == expected[10:20]
+
+            if indexed:
+                assert lookup.index(cast(tuple[str, int], middle)) == 100
+                assert lookup.bisect_left(
+                    cast(tuple[str, int], middle)) == 100
+                assert lookup.count_range(
+                    cast(tuple[str, int], scores[10]),
+                    cast(tuple[str, int], scores[20])) == 10
+
+            copy: SkipList[tuple[str, int]] = \
+                SkipList[tuple[str, int]].from_iterable(
+                    records, key=score, reverse=reverse)
+
+            assert list(copy.irange()) == expected
+            assert list((copy & skip_list).irange()) == expected
+            assert list((copy - skip_list).irange()) == []
+            assert list((copy ^ skip_list).irange()) == []
+            assert list(merge_many(
+                copy, skip_list, key=score, reverse=reverse).irange()) == \
+                expected
+
+            left, right = skip_list.split_at(cast(tuple[str, int], middle))
+
+            assert list(left.irange()) == expected[:100]
+            assert list(right.irange()) == expected[100:]
+
+            left.concat(right)
+
+            assert left.pop_max() == expected[-1]
+            assert left.pop_min() == expected[0]
+            assert left.remove(cast(tuple[str, int], middle))
+            assert left.remove_range(
+                cast(tuple[str, int], scores[10]),
+                cast(tuple[str, int], scores[20])) == 10
+            assert left.remove_many(
+                cast(list[tuple[str, int]], scores[30:40])) == 10
+            assert list(left.irange()) == \
+                expected[1:10] + expected[20:30] + expected[40:100] + \
+                expected[101:-1]
+
+            cursor: SkipList.Cursor = left.cursor()
+
+            assert cursor.seek(scores[50])
+            assert cursor.value == expected[50]
+            inserted: tuple[str, int] = \
+                ("inserted", 1000 if reverse else -1)
+
+            assert cursor.insert_here(inserted)
+            assert left.min() == inserted
+
+    numbers: SkipList[int] = SkipList[int].from_iterable(
+        range(10), reverse=True)
+
+    assert list(numbers.irange()) == list(range(9, -1, -1))
+    assert numbers.floor(4) == 4 and numbers.higher(4) == 3
+    assert list(numbers.irange(7, 3)) == [7, 6, 5, 4]
+
+    np = pytest.importorskip("numpy")
+
+    assert numbers.contains_array(np.array([3, 10])).tolist() == \
+        [True, False]
+    # the number of values before each key in the SkipList order
+    assert numbers.rank_array(np.array([9, 3, -1, 10])).tolist() == \
+        [0, 6, 10, 0]
+
+def test_case_24() -> None:
+    rng: random.Random = random.Random(24)
+    values: list[int] = rng.sample(range(10000), 1001)
+    skip_list: SkipList[int] = SkipList[int].from_iterable(
+        values, indexed=True, seed=24)
+    ordered: list[int] = sorted(values)
+    qs: list[float] = [0, 0.001, 0.25, 0.5, 0.9, 0.99, 0.999, 1]
+
+    # nearest rank: the lowest value with at least q * n values up to it
+    for q in qs:
+        assert skip_list.quantile(q) == \
+            ordered[max(math.ceil(Fraction(repr(q)) * len(ordered)) - 1, 0)]
+
+    # exact percentiles, which q * n would round one rank too high
+    hundred: SkipList[int] = SkipList[int].from_sorted(
+        range(1, 101), indexed=True)
+
+    assert hundred.quantile(0.07) == 7
+    assert [hundred.quantile(rank / 100) for rank in range(1, 101)] == \
+        list(range(1, 101))
+
+    assert skip_list.median() == ordered[500]
+    assert skip_list.quantiles(qs) == [skip_list.quantile(q) for q in qs]
+    assert skip_list.quantile(0.25, interpolate=True) == ordered[250]
+
+    # interpolated halfway between the two middle values
+    skip_list.remove(ordered[0])
+
+    assert skip_list.median() == ordered[500]
+    assert skip_list.median(interpolate=True) == \
+        (ordered[500] + ordered[501]) / 2
+    assert skip_list.quantile(1, interpolate=True) == ordered[-1]
+
+    single: SkipList[float] = SkipList[float](indexed=True)
+    single.insert(2.5)
+
+    assert single.quantiles([0, 0.5, 1], interpolate=True) == [2.5] * 3
+
+    with pytest.raises(ValueError):
+        skip_list.quantile(1.5)
+
+    with pytest.raises(ValueError):
+        SkipList[int](indexed=True).median()
+
+    with pytest.raises(ValueError):
+        SkipList[int]().quantile(0.5)
+
+    np = pytest.importorskip("numpy")
+
+    for q in qs:
+        assert skip_list.quantile(q, interpolate=True) == \
+            pytest.approx(np.quantile(ordered[1:], q))
+
+def test_case_25() -> None:
+    for indexed in (False, True):
+        skip_list: SkipList[int] = SkipList[int].from_iterable(
+            [5, 1, 9, 3], indexed=indexed)
+
+        # iteration and membership walk the links, not positions
+        assert list(skip_list) == [1, 3, 5, 9]
+        assert [value for value in skip_list] == [1, 3, 5, 9]
+        assert 3 in skip_list
+        assert 4 not in skip_list
+        assert 3 not in SkipList[int](indexed=indexed)
+
+    descending: SkipList[int] = SkipList[int].from_iterable(
+        [5, 1, 9], reverse=True)
+
+    assert list(descending) == [9, 5, 1]
+    assert 9 in descending
+
+def test_case_26() -> None:
+    skip_list: SkipList[int] = SkipList[int].from_sorted([1, 2, 3])
+    cursor: SkipList.Cursor = skip_list.cursor()
+
+    assert skip_list.frozen == False
+
+    skip_list.freeze()
+
+    assert skip_list.frozen == True
+    assert skip_list.retrieve(2) == True
+    assert list(skip_list.iter_from(0)) == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        skip_list.insert(4)
+
+    with pytest.raises(ValueError):
+        skip_list.insert(1)
+
+    with pytest.raises(ValueError):
+        skip_list.remove(1)
+
+    with pytest.raises(ValueError):
+        skip_list.insert_many([4])
+
+    with pytest.raises(ValueError):
+        skip_list.remove_many([1])
+
+    with pytest.raises(ValueError):
+        cursor.insert_here(4)
+
+    with pytest.raises(ValueError):
+        cursor.remove_current()
+
+    assert list(skip_list.iter_from(0)) == [1, 2, 3]
@@ -0,0 +1,224 @@
+from skip_map import SkipMap
+from skip_list import SkipList
+from typing import Any
+from pathlib import Path
+import pytest
+
+def test_case_1() -> None:
+    skip_map: SkipMap[int, str] = SkipMap[int, str]()
+
+    assert len(skip_map) == 0
+    assert list(skip_map) == []
+    assert skip_map.get(1) is None
+    assert skip_map.get(1, "none") == "none"
+    assert (1 in skip_map) == False
+
+    with pytest.raises(KeyError):
+        skip_map[1]
+
+    skip_map[30] = "thirty"
+    skip_map[10] = "ten"
+    skip_map[20] = "twenty"
+    skip_map[40] = "forty"
+
+    assert len(skip_map) == 4
+    assert list(skip_map) == [10, 20, 30, 40]
+    assert skip_map[20] == "twenty"
+    assert skip_map.get(30) == "thirty"
+    assert (40 in skip_map) == True
+    assert (25 in skip_map) == False
+
+    # updating a key keeps a single node
+    skip_map[20] = "TWENTY"
+
+    assert len(skip_map) == 4
+    assert skip_map[20] == "TWENTY"
+
+    assert skip_map.setdefault(20, "other") == "TWENTY"
+    assert skip_map.setdefault(25, "twenty-five") == "twenty-five"
+    assert skip_map[25] == "twenty-five"
+    assert len(skip_map) == 5
+
+    assert skip_map.pop(25) == "twenty-five"
+    assert skip_map.pop(25, "gone") == "gone"
+    assert len(skip_map) == 4
+
+    with pytest.raises(KeyError):
+        skip_map.pop(25)
+
+    del skip_map[40]
+
+    assert list(skip_map.items()) == \
+        [(10, "ten"), (20, "TWENTY"), (30, "thirty")]
+
+    with pytest.raises(KeyError):
+        del skip_map[40]
+
+    assert skip_map.floor(25) == 20
+    assert list(skip_map.irange(15, 35)) == [20, 30]
+
+def test_case_2() -> None:
+    skip_map: SkipMap[int, int] = SkipMap[int, int](indexed=True)
+
+    for key in range(0, 100, 10):
+        skip_map[key] = key * key
+
+    assert list(skip_map.keys()) == list(range(0, 100, 10))
+    assert list(skip_map.values()) == [key * key for key in range(0, 100, 10)]
+    assert list(reversed(skip_map.keys())) == list(range(90, -10, -10))
+    assert len(skip_map.items()) == 10
+
+    view = skip_map.items()[20:50]
+
+    assert list(view) == [(20, 400), (30, 900), (40, 1600)]
+    assert list(reversed(view)) == [(40, 1600), (30, 900), (20, 400)]
+    assert len(view) == 3
+
+    # slicing a view again narrows its range
+    assert list(view[35:]) == [(40, 1600)]
+    assert list(view[:30]) == [(20, 400)]
+    assert list(view[0:100]) == list(view)
+    assert list(skip_map.values()[75:]) == [6400, 8100]
+    assert list(skip_map.keys()[:0]) == []
+
+    # views are live
+    skip_map[25] = 625
+
+    assert list(view) == \
+        [(20, 400), (25, 625), (30, 900), (40, 1600)]
+    assert len(view) == 4
+
+    assert skip_map.index(25) == 3
+    assert skip_map.bisect_left(50) == 6
+
+    with pytest.raises(ValueError):
+        skip_map.keys()[1:5:2]
+
+def test_case_3() -> None:
+    skip_map: SkipMap[str, int] = SkipMap[str, int]()
+
+    for word in ["pear", "apple", "fig", "kiwi", "plum"]:
+        skip_map[word] = len(word)
+
+    view = skip_map.keys()["b":"p"]
+
+    assert list(view) == ["fig", "kiwi"]
+    assert len(view) == 2
+    assert skip_map.insert("banana") == True
+    assert skip_map.get("banana") is None
+    assert list(view) == ["banana", "fig", "kiwi"]
+
+def test_case_4() -> None:
+    for indexed in (False, True):
+        descending: SkipMap[int, str] = \
+            SkipMap[int, str](indexed=indexed, reverse=True)
+
+        for key in [20, 40, 10, 30]:
+            descending[key] = str(key)
+
+        assert list(descending) == [40, 30, 20, 10]
+        assert descending[30] == "30"
+        assert 10 in descending and 15 not in descending
+        assert descending.setdefault(10, "other") == "10"
+        assert descending.pop(20) == "20"
+        assert descending.get(20) is None
+        assert list(descending.items()) == \
+            [(40, "40"), (30, "30"), (10, "10")]
+        assert list(descending.keys()[40:10]) == [40, 30]
+        assert list(descending.keys()[35:][:5]) == [30, 10]
+        assert len(descending.keys()[35:]) == 2
+        assert descending.floor(35) == 40
+
+        # keys ordered by name, case insensitively
+        names: SkipMap[str, int] = \
+            SkipMap[str, int](indexed=indexed, key=str.lower)
+        names["bob"] = 1
+        names["Alice"] = 2
+        names["carol"] = 3
+        names["BOB"] = 4
+
+        assert list(names.items()) == \
+            [("Alice", 2), ("bob", 4), ("carol", 3)]
+        assert names["ALICE"] == 2
+        assert "Carol" in names
+        assert names.pop("CAROL") == 3
+        assert list(names.values()["b":]) == [4]
+        assert len(names.keys()["B":]) == 1
+        # SkipList lookups take key(k)
+        assert names.retrieve("alice") and not names.retrieve("Alice")
+
+def test_case_5() -> None:
+    for reverse in (False, True):
+        left: SkipMap[int, str] = SkipMap[int, str](reverse=reverse)
+        right: SkipMap[int, str] = SkipMap[int, str](reverse=reverse)
+
+        for key in [1, 2, 3]:
+            left[key] = f"left {key}"
+
+        for key in [2, 3, 4]:
+            right[key] = f"right {key}"
+
+        def entries(skip_map: SkipMap[int, str]) -> list[tuple[int, str]]:
+            return sorted(skip_map.items())
+
+        # like dict's | operator, the right side wins on shared keys
+        assert entries(left | right) == \
+            [(1, "left 1"), (2, "right 2"), (3, "right 3"), (4, "right 4")]
+        assert entries(left & right) == [(2, "left 2"), (3, "left 3")]
+        assert entries(left - right) == [(1, "left 1")]
+        assert entries(left ^ right) == [(1, "left 1"), (4, "right 4")]
+        assert list(left | right) == \
+            ([4, 3, 2, 1] if reverse else [1, 2, 3, 4])
+        assert isinstance(left | right, SkipMap)
+
+    # a SkipList of the same order maps its values to None
+    keys: SkipList[int] = SkipList[int].from_sorted([5, 3], reverse=True)
+
+    assert list((left | keys).items()) == \
+        [(5, None), (3, None), (2, "left 2"), (1, "left 1")]
+
+def test_case_6(tmp_path: Path) -> None:
+    path: Path = tmp_path / "skip_map.snapshot"
+    skip_map: SkipMap[str, Any] = SkipMap[str, Any](
+        key=str.lower, indexed=True, seed=1)
+
+    for index in range(200):
+        skip_map[f"Key {index:03}"] = {"index": index} if index % 3 else None
+
+    skip_map.save(path)
+
+    for mmap in (False, True):
+        loaded: SkipMap[str, Any] = SkipMap[str, Any].load(
+            path, mmap=mmap, key=str.lower)
+
+        assert list(loaded.items()) == list(skip_map.items())
+        assert loaded["KEY 004"] == {"index": 4}
+        assert loaded.index("key 150") == 150
+
+    # a SkipList loads the keys alone
+    assert list(SkipList[str].load(path, key=str.lower).irange()) == \
+        list(skip_map)
+
+    # keys of a SkipList snapshot map to None
+    SkipList[int].from_sorted([1, 2, 3]).save(path)
+
+    assert list(SkipMap[int, Any].load(path).items()) == \
+        [(1, None), (2, None), (3, None)]
+
+def test_case_7() -> None:
+    skip_map: SkipMap[str, int] = SkipMap[str, int]()
+    skip_map["a"] = 1
+    skip_map.freeze()
+
+    assert skip_map["a"] == 1
+
+    with pytest.raises(ValueError):
+        skip_map["a"] = 2
+
+    with pytest.raises(ValueError):
+        del skip_map["a"]
+
+    with pytest.raises(ValueError):
+        skip_map.setdefault("b", 2)
+
+    assert dict(skip_map.items()) == {"a": 1}
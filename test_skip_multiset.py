@@ -0,0 +1,192 @@
+from skip_list import SkipList
+from skip_map import SkipMap
+from skip_multiset import SkipMultiset
+from collections import Counter
+from pathlib import Path
+from typing import cast
+import pytest
+import random
+
+def check_counts(multiset: SkipMultiset[int], counter: Counter[int]) -> None:
+    """
+    Check a multiset against a Counter, its link widths counting the
+    occurrences they skip when indexed, and its backward links.
+    """
+
+    expected: list[int] = sorted(counter.elements())
+
+    assert len(multiset) == len(expected)
+    assert list(multiset) == expected
+    assert list(reversed(multiset)) == expected[::-1]
+    assert list(multiset.counts()) == sorted(counter.items())
+
+    positions: dict[int, int] = {
+        id(multiset._head): 0,
+        id(None): len(expected) + 1,
+    }
+    node: SkipList.Node | None = multiset._head.forward[0]
+    position: int = 0
+    prev: SkipList.Node | None = None
+
+    while node is not None:
+        assert node.backward is prev
+        position += cast(SkipMultiset.Node, node).count
+        positions[id(node)] = position
+        prev = node
+        node = node.forward[0]
+
+    assert multiset._tail is prev
+
+    if not multiset.indexed:
+        return
+
+    for level in range(multiset.current_level + 1):
+        node = multiset._head
+
+        while node is not None:
+            assert cast(list[int], node.width)[level] == \
+                positions[id(node.forward[level])] - positions[id(node)]
+            node = node.forward[level]
+
+def test_case_1() -> None:
+    for indexed in (False, True):
+        rng: random.Random = random.Random(1)
+        multiset: SkipMultiset[int] = \
+            SkipMultiset[int](indexed=indexed, seed=1)
+        counter: Counter[int] = Counter()
+
+        for _ in range(2000):
+            value: int = rng.randrange(50)
+            n: int = rng.randrange(4)
+
+            if rng.random() < 0.6:
+                multiset.add(value, n)
+                counter[value] += n
+            else:
+                removed: int = multiset.discard(value, n)
+
+                assert removed == min(n, counter[value])
+
+                counter[value] -= removed
+
+            assert multiset.count(value) == counter[value]
+            assert (value in multiset) == (counter[value] > 0)
+
+        counter = +counter
+        check_counts(multiset, counter)
+        expected: list[int] = sorted(counter.elements())
+
+        if indexed:
+            # order statistics over every occurrence
+            assert [multiset[index] for index in range(len(expected))] == \
+                expected
+            assert multiset[-1] == expected[-1]
+            assert multiset[10:200:7] == expected[10:200:7]
+            assert multiset[200:10:-3] == expected[200:10:-3]
+            assert multiset.bisect_left(25) == expected.index(25)
+            assert multiset.bisect_right(25) == \
+                len(expected) - expected[::-1].index(25)
+            assert multiset.count_range(10, 20) == \
+                sum(1 for value in expected if 10 <= value < 20)
+            assert multiset.quantiles([0, 0.5, 0.99, 1]) == [
+                expected[0],
+                expected[(len(expected) + 1) // 2 - 1],
+                expected[-(len(expected) // 100) - 1],
+                expected[-1],
+            ]
+
+        multiset.insert_many([5, 5, 60, 7])
+        counter.update([5, 5, 60, 7])
+        multiset.remove_many([5, 7, 61])
+        counter.subtract([5, 7])
+        check_counts(multiset, +counter)
+
+        assert multiset.pop_max() == 60
+        assert multiset.pop_min_n(5) == sorted(counter.elements())[:5]
+
+        counter = Counter(sorted(counter.elements())[5:-1])
+        check_counts(multiset, counter)
+
+        removed_values: int = sum(
+            count for value, count in counter.items() if 10 <= value < 20)
+
+        assert multiset.remove_range(10, 20) == removed_values
+
+        for value in range(10, 20):
+            del counter[value]
+
+        check_counts(multiset, counter)
+        left, right = multiset.split_at(30)
+        right_counter: Counter[int] = \
+            Counter({value: count for value, count in counter.items()
+                     if value >= 30})
+        check_counts(left, counter - right_counter)
+        check_counts(right, right_counter)
+        left.concat(right)
+        check_counts(left, counter)
+        left.rebalance()
+        check_counts(left, counter)
+
+        # empty runs are not inserted
+        left.add(1000, 0)
+
+        assert 1000 not in left
+
+        with pytest.raises(ValueError):
+            left.add(1, -1)
+
+        with pytest.raises(ValueError):
+            left.discard(1, -1)
+
+def test_case_2(tmp_path: Path) -> None:
+    samples: list[int] = [3, 1, 3, 3, 2, 1, 3]
+    multiset: SkipMultiset[int] = \
+        SkipMultiset[int].from_iterable(samples, indexed=True)
+
+    # a node per distinct value
+    assert len(multiset) == 7
+    assert list(multiset.counts()) == [(1, 2), (2, 1), (3, 4)]
+    assert multiset.current_level >= 0
+    check_counts(multiset, Counter(samples))
+
+    other: SkipMultiset[int] = SkipMultiset[int].from_sorted(
+        [1, 2, 2, 4], indexed=True)
+
+    assert list(multiset | other) == [1, 1, 2, 2, 3, 3, 3, 3, 4]
+    assert list(multiset & other) == [1, 2]
+    assert list(multiset - other) == [1, 3, 3, 3, 3]
+    assert list(multiset ^ other) == [1, 2, 3, 3, 3, 3, 4]
+    check_counts(multiset | other, Counter(samples) | Counter([1, 2, 2, 4]))
+
+    # snapshots keep the counts
+    path: Path = tmp_path / "skip_multiset.snapshot"
+    multiset.save(path)
+
+    for mmap in (False, True):
+        check_counts(SkipMultiset[int].load(path, mmap=mmap), Counter(samples))
+
+    assert list(SkipList[int].load(path).irange()) == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        SkipMap[int, int].load(path)
+
+    SkipMap[int, int]().save(path)
+
+    with pytest.raises(ValueError):
+        SkipMultiset[int].load(path)
+
+    # with a key, values of equal keys count as occurrences of the first
+    words: SkipMultiset[str] = SkipMultiset[str](key=len, reverse=True)
+
+    for word in ["a", "bb", "cc", "ddd", "e"]:
+        words.add(word)
+
+    assert list(words) == ["ddd", "bb", "bb", "a", "a"]
+    assert words.count(2) == 2
+
+    np = pytest.importorskip("numpy")
+
+    assert multiset.rank_array(np.array([1, 2, 3, 4])).tolist() == \
+        [0, 2, 3, 7]
+    assert multiset.contains_array(np.array([2, 5])).tolist() == \
+        [True, False]
@@ -0,0 +1,54 @@
+from sliding_window import SlidingWindow
+import pytest
+import random
+
+def test_case_1() -> None:
+    now: list[float] = [0.0]
+    window: SlidingWindow[int] = SlidingWindow[int](
+        horizon=10, clock=lambda: now[0], seed=1)
+    rng: random.Random = random.Random(1)
+    samples: list[tuple[float, int]] = []
+
+    for second in range(100):
+        now[0] = second
+
+        for _ in range(rng.randrange(5)):
+            latency: int = rng.randrange(200)
+            window.add(latency)
+            samples.append((second, latency))
+
+        # samples older than 10 seconds are evicted
+        expected: list[int] = sorted(
+            latency for timestamp, latency in samples
+            if timestamp > second - 10)
+
+        assert len(window) == len(expected)
+        assert list(window) == expected
+
+        if expected:
+            assert window.median() == expected[(len(expected) - 1) // 2]
+            assert window.quantiles([0, 1]) == [expected[0], expected[-1]]
+
+    # explicit timestamps, several samples at once
+    window.add_many([9, 7, 7], timestamp=100)
+    now[0] = 109
+
+    assert list(window) == [7, 7, 9]
+    assert window.median(interpolate=True) == 7
+    assert window.quantile(0.75, interpolate=True) == 8
+    assert window.evict(110) == 3
+    assert len(window) == 0
+
+    window.add(1, timestamp=110)
+
+    with pytest.raises(ValueError):
+        window.add(1, timestamp=105)
+
+    with pytest.raises(ValueError):
+        SlidingWindow[int](horizon=0)
+
+    # exact percentiles
+    window.add_many(range(2, 101), timestamp=110)
+
+    assert window.quantile(0.07) == 7
+    assert window.quantile(0.99) == 99
@@ -0,0 +1,119 @@
+from skip_list import SkipList
+from snapshot import Snapshot, MAGIC
+from typing import Any
+from pathlib import Path
+import pytest
+
+def test_case_1(tmp_path: Path) -> None:
+    path: Path = tmp_path / "skip_list.snapshot"
+    skip_list: SkipList[int] = SkipList[int].from_sorted(
+        range(0, 1000, 3), promotion_probability=0.25, max_level=12,
+        indexed=True, seed=1)
+    skip_list.save(path)
+
+    for mmap in (False, True):
+        loaded: SkipList[int] = SkipList[int].load(path, mmap=mmap)
+
+        assert len(loaded) == len(skip_list)
+        assert loaded.promotion_probability == 0.25
+        assert loaded.max_level == 12
+        assert loaded.indexed == True
+        assert loaded.current_level == skip_list.current_level
+
+        # towers are rebuilt with the same heights and widths
+        for level in range(skip_list.current_level + 1):
+            assert list(loaded.iter_from(level)) == \
+                list(skip_list.iter_from(level))
+
+        assert loaded[100] == 300
+        assert loaded.index(999) == 333
+        assert loaded.insert(1) == True
+
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 334
+        assert bool(snapshot) == True
+        assert snapshot.max_level == 12
+        assert list(snapshot) == list(range(0, 1000, 3))
+        assert snapshot[-1] == 999
+        assert snapshot.retrieve(300) == True
+        assert snapshot.retrieve(301) == False
+        assert snapshot.retrieve(1000) == False
+        assert snapshot.bisect_left(300) == 100
+        assert snapshot.bisect_right(300) == 101
+
+    # an empty SkipList, and values of other types
+    SkipList[int]().save(path)
+
+    assert len(SkipList[int].load(path)) == 0
+
+    values: list[Any]
+
+    for values in ([0.5, 1.5, 2.5], ["a", "bc", "d"], [(1, 2), (3,)]):
+        SkipList[Any].from_sorted(values).save(path)
+
+        assert list(SkipList[Any].load(path).iter_from(0)) == values
+
+        with Snapshot(path, mmap=False) as snapshot:
+            assert list(snapshot) == values
+            assert snapshot.retrieve(values[1]) == True
+
+def test_case_2(tmp_path: Path) -> None:
+    path: Path = tmp_path / "skip_list.snapshot"
+    SkipList[int].from_sorted(range(100)).save(path)
+    data: bytes = path.read_bytes()
+
+    assert data.startswith(MAGIC)
+
+    # a flipped bit anywhere is caught by the checksum
+    for offset in (10, len(data) // 2, len(data) - 1):
+        corrupted: bytearray = bytearray(data)
+        corrupted[offset] ^= 1
+        path.write_bytes(corrupted)
+
+        for mmap in (False, True):
+            with pytest.raises(ValueError):
+                SkipList[int].load(path, mmap=mmap)
+
+    for truncated in (b"", data[:20], b"NOTASKIP" + data[8:], data[:-8]):
+        path.write_bytes(truncated)
+
+        with pytest.raises(ValueError):
+            Snapshot(path, mmap=False)
+
+def test_case_3(tmp_path: Path) -> None:
+    path: Path = tmp_path / "skip_list.snapshot"
+    SkipList[int].from_iterable(
+        [5, 1, 9, 3, 7], indexed=True, reverse=True).save(path)
+
+    # the order is recorded, not the key function
+    loaded: SkipList[int] = SkipList[int].load(path)
+
+    assert loaded.reverse == True
+    assert list(loaded.irange()) == [9, 7, 5, 3, 1]
+    assert loaded.index(3) == 3
+
+    with pytest.raises(ValueError):
+        SkipList[int].load(path, reverse=False)
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.reverse == True
+        assert snapshot.retrieve(7) == True
+        assert snapshot.retrieve(6) == False
+        assert snapshot.bisect_left(7) == 1
+        assert snapshot.bisect_right(7) == 2
+        assert snapshot.bisect_left(6) == 2
+        assert snapshot.bisect_left(0) == 5
+
+    SkipList[str].from_iterable(["bb", "a", "ccc"], key=len).save(path)
+
+    with pytest.raises(ValueError):
+        SkipList[str].load(path)
+
+    assert list(SkipList[str].load(path, key=len).irange()) == \
+        ["a", "bb", "ccc"]
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.keyed == True
+
+        with pytest.raises(ValueError):
+            snapshot.retrieve("a")